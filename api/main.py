@@ -17,7 +17,7 @@ from fastapi.openapi.utils import get_openapi
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import API routers
-from api.routers import agents, analysis, portfolio, backtest
+from api.routers import agents, analysis, portfolio, backtest, metrics
 
 # Create FastAPI app
 app = FastAPI(
@@ -74,6 +74,7 @@ app.include_router(agents.router, prefix="/api/v1/agents", tags=["Agents"])
 app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["Analysis"])
 app.include_router(portfolio.router, prefix="/api/v1/portfolio", tags=["Portfolio"])
 app.include_router(backtest.router, prefix="/api/v1/backtest", tags=["Backtest"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["Metrics"])
 
 
 # Root endpoint
@@ -0,0 +1,44 @@
+"""
+Metrics router for the AI Hedge Fund API.
+"""
+
+import os
+import sys
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from api.models.base import SuccessResponse
+
+# The data tools import each other as top-level modules (tools.api, data.cache), so src must be on the path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src"))
+
+from tools.metrics import get_metrics, get_metrics_snapshot, to_prometheus
+
+router = APIRouter()
+
+
+@router.get("", response_model=SuccessResponse, summary="Get data fetch metrics")
+async def get_data_metrics():
+    """
+    Get cache hits, partial hits and misses, rows returned, upstream latency and errors per data fetcher,
+    the cache's memory use per data type, and the rate limiter's queue depth and wait times.
+    """
+    return {"status": "success", "data": get_metrics_snapshot()}
+
+
+@router.get("/prometheus", response_class=PlainTextResponse, summary="Export data fetch metrics for Prometheus")
+async def get_prometheus_metrics():
+    """
+    Get the same metrics in the Prometheus text exposition format.
+    """
+    return to_prometheus(get_metrics_snapshot())
+
+
+@router.post("/reset", response_model=SuccessResponse, summary="Reset data fetch metrics")
+async def reset_data_metrics():
+    """
+    Reset the per-fetcher counters and histograms. Cache contents are unaffected.
+    """
+    get_metrics().reset()
+    return {"status": "success", "data": None}
@@ -10,6 +10,20 @@ from utils.progress import progress
 from utils.llm import call_llm
 
 
+BILL_ACKMAN_LINE_ITEMS = [
+    "revenue",
+    "operating_margin",
+    "debt_to_equity",
+    "free_cash_flow",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+    # Optional: intangible_assets if available
+    # "intangible_assets"
+]
+
+
 class BillAckmanSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -37,18 +51,7 @@ def bill_ackman_agent(state: AgentState):
         # Request multiple periods of data (annual or TTM) for a more robust long-term view.
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                # Optional: intangible_assets if available
-                # "intangible_assets"
-            ],
+            BILL_ACKMAN_LINE_ITEMS,
             end_date,
             period="annual",
             limit=5
@@ -8,6 +8,23 @@ from typing_extensions import Literal
 from utils.progress import progress
 from utils.llm import call_llm
 
+
+CATHIE_WOOD_LINE_ITEMS = [
+    "revenue",
+    "gross_margin",
+    "operating_margin",
+    "debt_to_equity",
+    "free_cash_flow",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+    "research_and_development",
+    "capital_expenditure",
+    "operating_expense",
+]
+
+
 class CathieWoodSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -37,21 +54,7 @@ def cathie_wood_agent(state: AgentState):
         # Request multiple periods of data (annual or TTM) for a more robust view.
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "gross_margin",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                "research_and_development",
-                "capital_expenditure",
-                "operating_expense",
-
-            ],
+            CATHIE_WOOD_LINE_ITEMS,
             end_date,
             period="annual",
             limit=5
@@ -8,6 +8,25 @@ from typing_extensions import Literal
 from utils.progress import progress
 from utils.llm import call_llm
 
+
+CHARLIE_MUNGER_LINE_ITEMS = [
+    "revenue",
+    "net_income",
+    "operating_income",
+    "return_on_invested_capital",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+    "research_and_development",
+    "goodwill_and_intangible_assets",
+]
+
+
 class CharlieMungerSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -33,22 +52,7 @@ def charlie_munger_agent(state: AgentState):
         progress.update_status("charlie_munger_agent", ticker, "Gathering financial line items")
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "net_income",
-                "operating_income",
-                "return_on_invested_capital",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "research_and_development",
-                "goodwill_and_intangible_assets",
-            ],
+            CHARLIE_MUNGER_LINE_ITEMS,
             end_date,
             period="annual",
             limit=10  # Munger examines long-term trends
@@ -24,6 +24,17 @@ __all__ = [
     "michael_burry_agent",
 ]
 
+MICHAEL_BURRY_LINE_ITEMS = [
+    "free_cash_flow",
+    "net_income",
+    "total_debt",
+    "cash_and_equivalents",
+    "total_assets",
+    "total_liabilities",
+    "outstanding_shares",
+    "issuance_or_purchase_of_equity_shares",
+]
+
 ###############################################################################
 # Pydantic output model
 ###############################################################################
@@ -65,16 +76,7 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
         progress.update_status("michael_burry_agent", ticker, "Fetching line items")
         line_items = search_line_items(
             ticker,
-            [
-                "free_cash_flow",
-                "net_income",
-                "total_debt",
-                "cash_and_equivalents",
-                "total_assets",
-                "total_liabilities",
-                "outstanding_shares",
-                "issuance_or_purchase_of_equity_shares",
-            ],
+            MICHAEL_BURRY_LINE_ITEMS,
             end_date,
         )
 
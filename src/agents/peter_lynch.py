@@ -16,6 +16,22 @@ from utils.progress import progress
 from utils.llm import call_llm
 
 
+PETER_LYNCH_LINE_ITEMS = [
+    "revenue",
+    "earnings_per_share",
+    "net_income",
+    "operating_income",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+]
+
+
 class PeterLynchSignal(BaseModel):
     """
     Container for the Peter Lynch-style output signal.
@@ -56,20 +72,7 @@ def peter_lynch_agent(state: AgentState):
         # Relevant line items for Peter Lynch's approach
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-            ],
+            PETER_LYNCH_LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
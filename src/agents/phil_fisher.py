@@ -16,6 +16,23 @@ from utils.llm import call_llm
 import statistics
 
 
+PHIL_FISHER_LINE_ITEMS = [
+    "revenue",
+    "net_income",
+    "earnings_per_share",
+    "free_cash_flow",
+    "research_and_development",
+    "operating_income",
+    "operating_margin",
+    "gross_margin",
+    "total_debt",
+    "shareholders_equity",
+    "cash_and_equivalents",
+    "ebit",
+    "ebitda",
+]
+
+
 class PhilFisherSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -54,21 +71,7 @@ def phil_fisher_agent(state: AgentState):
         #   - Valuation: net_income, free_cash_flow (for P/E, P/FCF), ebit, ebitda
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "net_income",
-                "earnings_per_share",
-                "free_cash_flow",
-                "research_and_development",
-                "operating_income",
-                "operating_margin",
-                "gross_margin",
-                "total_debt",
-                "shareholders_equity",
-                "cash_and_equivalents",
-                "ebit",
-                "ebitda",
-            ],
+            PHIL_FISHER_LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
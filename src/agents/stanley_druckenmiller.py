@@ -17,6 +17,24 @@ from utils.llm import call_llm
 import statistics
 
 
+STANLEY_DRUCKENMILLER_LINE_ITEMS = [
+    "revenue",
+    "earnings_per_share",
+    "net_income",
+    "operating_income",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+    "ebit",
+    "ebitda",
+]
+
+
 class StanleyDruckenmillerSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -53,22 +71,7 @@ def stanley_druckenmiller_agent(state: AgentState):
         #   - Liquidity: cash_and_equivalents
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "ebit",
-                "ebitda",
-            ],
+            STANLEY_DRUCKENMILLER_LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
@@ -18,6 +18,16 @@ from tools.api import (
     search_line_items,
 )
 
+
+VALUATION_LINE_ITEMS = [
+    "free_cash_flow",
+    "net_income",
+    "depreciation_and_amortization",
+    "capital_expenditure",
+    "working_capital",
+]
+
+
 def valuation_agent(state: AgentState):
     """Run valuation across tickers and write signals back to `state`."""
 
@@ -46,13 +56,7 @@ def valuation_agent(state: AgentState):
         progress.update_status("valuation_agent", ticker, "Gathering line items")
         line_items = search_line_items(
             ticker=ticker,
-            line_items=[
-                "free_cash_flow",
-                "net_income",
-                "depreciation_and_amortization",
-                "capital_expenditure",
-                "working_capital",
-            ],
+            line_items=VALUATION_LINE_ITEMS,
             end_date=end_date,
             period="ttm",
             limit=2,
@@ -9,6 +9,18 @@ from utils.llm import call_llm
 from utils.progress import progress
 
 
+WARREN_BUFFETT_LINE_ITEMS = [
+    "capital_expenditure",
+    "depreciation_and_amortization",
+    "net_income",
+    "outstanding_shares",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "issuance_or_purchase_of_equity_shares",
+]
+
+
 class WarrenBuffettSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -33,16 +45,7 @@ def warren_buffett_agent(state: AgentState):
         progress.update_status("warren_buffett_agent", ticker, "Gathering financial line items")
         financial_line_items = search_line_items(
             ticker,
-            [
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "net_income",
-                "outstanding_shares",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares",
-            ],
+            WARREN_BUFFETT_LINE_ITEMS,
             end_date,
         )
 
@@ -11,16 +11,13 @@ import numpy as np
 import itertools
 
 from llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
-from utils.analysts import ANALYST_ORDER
+from utils.analysts import ANALYST_ORDER, get_data_requirements
 from main import run_hedge_fund
-from tools.api import (
-    get_company_news,
-    get_price_data,
-    get_prices,
-    get_financial_metrics,
-    get_insider_trades,
-)
-from utils.display import print_backtest_results, format_backtest_row
+from tools.api import get_price_data
+from tools.cassette import configure_cassette
+from tools.metrics import dump_metrics
+from tools.prefetch import backtest_price_start, plan_prefetch, prefetch
+from utils.display import print_backtest_results, print_data_metrics, format_backtest_row
 from typing_extensions import Callable
 from utils.ollama import ensure_ollama_and_model
 
@@ -271,26 +268,14 @@ class Backtester:
         return total_value
 
     def prefetch_data(self):
-        """Pre-fetch all data needed for the backtest period."""
+        """Pre-fetch all data the selected analysts need for the backtest period."""
         print("\nPre-fetching data for the entire backtest period...")
 
-        # Convert end_date string to datetime, fetch up to 1 year before
-        end_date_dt = datetime.strptime(self.end_date, "%Y-%m-%d")
-        start_date_dt = end_date_dt - relativedelta(years=1)
-        start_date_str = start_date_dt.strftime("%Y-%m-%d")
-
-        for ticker in self.tickers:
-            # Fetch price data for the entire period, plus 1 year
-            get_prices(ticker, start_date_str, self.end_date)
-
-            # Fetch financial metrics
-            get_financial_metrics(ticker, self.end_date, limit=10)
-
-            # Fetch insider trades
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000)
-
-            # Fetch company news
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000)
+        # Prices up to 1 year before the end date, and the 30 day lookback window each trading day runs the agents over
+        calls = plan_prefetch(get_data_requirements(self.selected_analysts), backtest_price_start(self.start_date, self.end_date), self.end_date, first_end_date=self.start_date)
+        errors = prefetch(self.tickers, calls)
+        for error in errors:
+            print(f"Warning: pre-fetch failed, data will be fetched on demand: {error}")
 
         print("Data pre-fetch complete.")
 
@@ -503,6 +488,8 @@ class Backtester:
 
         # Store the final performance metrics for reference in analyze_performance
         self.performance_metrics = performance_metrics
+        # Write the data fetch metrics for the whole backtest to FINANCIAL_DATA_METRICS_PATH, if set
+        dump_metrics()
         return performance_metrics
 
     def _update_performance_metrics(self, performance_metrics):
@@ -688,9 +675,17 @@ if __name__ == "__main__":
     parser.add_argument(
         "--ollama", action="store_true", help="Use Ollama for local LLM inference"
     )
+    parser.add_argument("--show-metrics", action="store_true", help="Show cache hit rates and API latency per data fetcher")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", type=str, metavar="CASSETTE", help="Record API and LLM calls to a cassette file")
+    cassette_group.add_argument("--replay", type=str, metavar="CASSETTE", help="Replay API and LLM calls from a cassette file, without network access")
 
     args = parser.parse_args()
 
+    # Record or replay API and LLM calls (overrides CASSETTE_MODE / CASSETTE_PATH)
+    if args.record or args.replay:
+        configure_cassette("replay" if args.replay else "record", args.replay or args.record)
+
     # Parse tickers from comma-separated string
     tickers = [ticker.strip() for ticker in args.tickers.split(",")] if args.tickers else []
 
@@ -791,3 +786,5 @@ if __name__ == "__main__":
 
     performance_metrics = backtester.run_backtest()
     performance_df = backtester.analyze_performance()
+    if args.show_metrics:
+        print_data_metrics(dump_metrics())
@@ -0,0 +1,128 @@
+"""
+Benchmark the per-hit cost of serving cached data through tools.api.
+
+"before" replays the previous hit path: the cache held plain dicts that were re-validated into
+Pydantic models (Price(**row), FinancialMetrics(**row), ...) on every hit. "after" calls the
+tools.api fetchers against a warm cache that holds validated, immutable model instances.
+
+Usage:
+    poetry run python src/benchmarks/cache_hits.py
+"""
+
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.cache import Cache
+from data.models import CompanyNews, FinancialMetrics, InsiderTrade, Price
+import tools.api as api
+
+TICKER = "BENCH"
+END_DATE = "2024-12-31"
+START_DATE = "2015-01-01"
+
+
+def _dates(count: int) -> list[str]:
+    end = datetime.date.fromisoformat(END_DATE)
+    return [(end - datetime.timedelta(days=i)).isoformat() for i in range(count)]
+
+
+def make_data() -> dict[str, list]:
+    """Synthetic, schema-valid rows: ~10 years of prices, 10 metric snapshots, 1000 news and insider trades."""
+    metric_fields = {name: 1.0 for name, field in FinancialMetrics.model_fields.items() if name not in ("ticker", "report_period", "period", "currency")}
+    return {
+        "prices": [Price(open=1.0, close=2.0, high=3.0, low=0.5, volume=1000, time=f"{date}T05:00:00Z") for date in _dates(3650)],
+        "financial_metrics": [FinancialMetrics(ticker=TICKER, report_period=f"{2024 - i}-12-31", period="ttm", currency="USD", **metric_fields) for i in range(10)],
+        "company_news": [CompanyNews(ticker=TICKER, title=f"Title {i}", author="author", source="source", date=f"{date}T12:00:00Z", url=f"https://example.com/{i}", sentiment="positive") for i, date in enumerate(_dates(1000))],
+        "insider_trades": [
+            InsiderTrade(
+                ticker=TICKER,
+                issuer="Issuer",
+                name=f"Insider {i}",
+                title="CEO",
+                is_board_director=False,
+                transaction_date=date,
+                transaction_shares=100.0,
+                transaction_price_per_share=10.0,
+                transaction_value=1000.0,
+                shares_owned_before_transaction=1000.0,
+                shares_owned_after_transaction=1100.0,
+                security_title="Common",
+                filing_date=date,
+            )
+            for i, date in enumerate(_dates(1000))
+        ],
+    }
+
+
+def before_hits(data: dict[str, list]) -> dict[str, callable]:
+    """The previous cache-hit code paths, operating on cached dicts."""
+    prices = [p.model_dump() for p in data["prices"]]
+    metrics = [m.model_dump() for m in data["financial_metrics"]]
+    news = [n.model_dump() for n in data["company_news"]]
+    trades = [t.model_dump() for t in data["insider_trades"]]
+
+    def get_prices():
+        return [Price(**price) for price in prices if START_DATE <= price["time"] <= END_DATE]
+
+    def get_financial_metrics():
+        filtered = [FinancialMetrics(**metric) for metric in metrics if metric["report_period"] <= END_DATE]
+        filtered.sort(key=lambda x: x.report_period, reverse=True)
+        return filtered[:10]
+
+    def get_company_news():
+        filtered = [CompanyNews(**item) for item in news if START_DATE <= item["date"] <= END_DATE]
+        filtered.sort(key=lambda x: x.date, reverse=True)
+        return filtered
+
+    def get_insider_trades():
+        filtered = [InsiderTrade(**trade) for trade in trades if START_DATE <= (trade.get("transaction_date") or trade["filing_date"]) <= END_DATE]
+        filtered.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
+        return filtered
+
+    return {"get_prices": get_prices, "get_financial_metrics": get_financial_metrics, "get_company_news": get_company_news, "get_insider_trades": get_insider_trades}
+
+
+def after_hits(data: dict[str, list]) -> dict[str, callable]:
+    """The current tools.api fetchers against a warm, in-memory cache."""
+    cache = Cache(store=None)
+    cache.set_prices(TICKER, data["prices"])
+    cache.add_coverage("prices", TICKER, START_DATE, END_DATE)
+    cache.set_financial_metrics(TICKER, "ttm", data["financial_metrics"], END_DATE, exhausted=True)
+    cache.set_company_news(TICKER, data["company_news"])
+    cache.add_coverage("company_news", TICKER, START_DATE, END_DATE)
+    cache.set_insider_trades(TICKER, data["insider_trades"])
+    cache.add_coverage("insider_trades", TICKER, START_DATE, END_DATE)
+    api._cache = cache
+
+    return {
+        "get_prices": lambda: api.get_prices(TICKER, START_DATE, END_DATE),
+        "get_financial_metrics": lambda: api.get_financial_metrics(TICKER, END_DATE, period="ttm", limit=10),
+        "get_company_news": lambda: api.get_company_news(TICKER, END_DATE, start_date=START_DATE),
+        "get_insider_trades": lambda: api.get_insider_trades(TICKER, END_DATE, start_date=START_DATE),
+    }
+
+
+def per_call_us(func: callable, repeat: int = 5) -> float:
+    number = max(1, int(0.2 / max(timeit.timeit(func, number=1), 1e-6)))
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    data = make_data()
+    before = before_hits(data)
+    after = after_hits(data)
+
+    print(f"{'fetcher':<24}{'rows':>8}{'before (us/hit)':>18}{'after (us/hit)':>18}{'speedup':>10}")
+    for name in before:
+        rows = len(after[name]())
+        before_us = per_call_us(before[name])
+        after_us = per_call_us(after[name])
+        print(f"{name:<24}{rows:>8}{before_us:>18.1f}{after_us:>18.1f}{before_us / after_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark decoding 1000-row API pages into the response models.
+
+"response.json()" is the previous path: requests decodes the body into dicts, then the response
+model validates them field by field (CompanyNewsResponse(**data)). "model_validate_json" is what
+tools.api does now: pydantic validates straight from the raw bytes. "orjson" (shown only when
+installed) decodes with orjson and validates the dicts, for comparison.
+
+Usage:
+    poetry run python src/benchmarks/json_decoding.py
+"""
+
+import datetime
+import json
+import os
+import sys
+import timeit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.models import CompanyNewsResponse, InsiderTradeResponse, PriceResponse
+from tools.api import _parse_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ROWS = 1000
+
+
+def _dates(count: int) -> list[str]:
+    end = datetime.date(2024, 12, 31)
+    return [(end - datetime.timedelta(days=i)).isoformat() for i in range(count)]
+
+
+def make_pages() -> dict[str, tuple[type, bytes]]:
+    """Synthetic, schema-valid 1000-row pages as the API would send them."""
+    news = [
+        {"ticker": "BENCH", "title": f"Quarterly results beat expectations, headline {i}", "author": "Staff Writer", "source": "Newswire", "date": f"{date}T12:00:00Z", "url": f"https://example.com/news/{i}", "sentiment": "positive"}
+        for i, date in enumerate(_dates(ROWS))
+    ]
+    trades = [
+        {
+            "ticker": "BENCH",
+            "issuer": "Bench Corp",
+            "name": f"Insider {i}",
+            "title": "Director",
+            "is_board_director": i % 2 == 0,
+            "transaction_date": date,
+            "transaction_shares": 100.0 + i,
+            "transaction_price_per_share": 10.25,
+            "transaction_value": 1025.0 + i,
+            "shares_owned_before_transaction": 5000.0,
+            "shares_owned_after_transaction": 5100.0 + i,
+            "security_title": "Common Stock",
+            "filing_date": date,
+        }
+        for i, date in enumerate(_dates(ROWS))
+    ]
+    prices = [{"open": 100.0 + i, "close": 101.0 + i, "high": 102.0 + i, "low": 99.0 + i, "volume": 1_000_000 + i, "time": f"{date}T05:00:00Z"} for i, date in enumerate(_dates(ROWS))]
+    return {
+        "company_news": (CompanyNewsResponse, json.dumps({"news": news}).encode()),
+        "insider_trades": (InsiderTradeResponse, json.dumps({"insider_trades": trades}).encode()),
+        "prices": (PriceResponse, json.dumps({"ticker": "BENCH", "prices": prices}).encode()),
+    }
+
+
+def make_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = body
+    return response
+
+
+def per_call_ms(func: callable, repeat: int = 5) -> float:
+    number = max(1, int(0.2 / max(timeit.timeit(func, number=1), 1e-6)))
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e3
+
+
+def main():
+    header = f"{'page':<16}{'KB':>6}{'response.json() (ms)':>22}{'model_validate_json (ms)':>26}{'speedup':>10}"
+    print(header + (f"{'orjson (ms)':>14}" if orjson else ""))
+    for name, (model, body) in make_pages().items():
+        response = make_response(body)
+        assert model(**response.json()) == _parse_response(response, model)
+
+        before = per_call_ms(lambda: model(**response.json()))
+        after = per_call_ms(lambda: _parse_response(response, model))
+        line = f"{name:<16}{len(body) // 1024:>6}{before:>22.2f}{after:>26.2f}{before / after:>9.1f}x"
+        if orjson:
+            line += f"{per_call_ms(lambda: model.model_validate(orjson.loads(response.content))):>14.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure throughput of the real data client (tools.api, pooled HTTP client, retries, rate limiter) against a server.
+
+Start the stand-in first, then point the client at it:
+    poetry run python src/benchmarks/standin_server.py --port 8000 --latency-ms 50 --rate-limit-rate 0.02
+    poetry run python src/benchmarks/load_test.py --base-url http://127.0.0.1:8000 --tickers 200 --concurrency 32
+
+Every run starts from an empty in-memory cache, so each fetch goes over the wire.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Financial Datasets client")
+    parser.add_argument("--base-url", type=str, default="http://127.0.0.1:8000", help="Server to load (default: the local stand-in)")
+    parser.add_argument("--tickers", type=int, default=100, help="Number of synthetic tickers to fetch")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum requests in flight")
+    parser.add_argument("--start-date", type=str, default="2023-01-01", help="Start of the price and news window")
+    parser.add_argument("--end-date", type=str, default="2024-12-31", help="End of the window")
+    parser.add_argument("--rate-limit", type=float, help="Client-side requests/sec (default: FINANCIAL_DATASETS_RATE_LIMIT, 0 disables)")
+    args = parser.parse_args()
+
+    # Configure the shared client before anything creates it; no persistent cache, so every fetch is a request
+    os.environ["FINANCIAL_DATASETS_BASE_URL"] = args.base_url
+    os.environ["FINANCIAL_DATASETS_POOL_SIZE"] = str(args.concurrency)
+    os.environ.pop("FINANCIAL_DATA_CACHE_PATH", None)
+    if args.rate_limit is not None:
+        os.environ["FINANCIAL_DATASETS_RATE_LIMIT"] = str(args.rate_limit)
+
+    from tools import api
+    from tools.http_client import get_client, get_rate_limit_stats
+    from tools.prefetch import plan_prefetch, prefetch
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    requirements = [
+        {"endpoint": "prices"},
+        {"endpoint": "financial_metrics", "period": "ttm", "limit": 10},
+        {"endpoint": "line_items", "line_items": ["revenue", "net_income", "free_cash_flow"], "period": "annual", "limit": 5},
+        {"endpoint": "insider_trades", "lookback_days": 365},
+        {"endpoint": "company_news", "lookback_days": 365},
+    ]
+    calls = plan_prefetch(requirements, args.start_date, args.end_date)
+
+    # Count requests at the client, including retries; next() on a count is atomic, so threads cannot lose increments
+    session = get_client().session
+    counter = itertools.count()
+    send = session.request
+
+    def counting_request(*request_args, **request_kwargs):
+        next(counter)
+        return send(*request_args, **request_kwargs)
+
+    session.request = counting_request
+
+    start = time.perf_counter()
+    errors = prefetch(tickers, calls, concurrency=args.concurrency)
+    elapsed = time.perf_counter() - start
+    sent = next(counter)
+
+    print(f"Tickers:          {len(tickers)}")
+    print(f"Planned fetches:  {len(calls)} per ticker")
+    print(f"HTTP requests:    {sent}")
+    print(f"Elapsed:          {elapsed:.2f}s")
+    print(f"Throughput:       {sent / elapsed:.1f} requests/s, {len(tickers) / elapsed:.1f} tickers/s")
+    print(f"Failed fetches:   {len(errors)}")
+    for error in errors[:5]:
+        print(f"  {error}")
+    if stats := get_rate_limit_stats():
+        print(f"Rate limiter:     {stats}")
+    print(f"Cache:            {api._cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
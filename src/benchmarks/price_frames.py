@@ -0,0 +1,84 @@
+"""
+Benchmark get_price_data calls per second on a warm cache holding 10 years of daily prices.
+
+"prices_to_df" rebuilds the DataFrame from Price models on every call, as agents did before prices
+were cached as columns. "columns" builds a new DataFrame from views of the cached columns on every
+call. "cached frame" slices the ticker's one cached DataFrame, which is what get_price_data does now.
+Windows match the callers: the backtester asks for 2 days per step, the risk manager and technicals
+for a few months, and a full history scan for all 10 years.
+
+Usage:
+    poetry run python src/benchmarks/price_frames.py
+"""
+
+import datetime
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.cache import Cache
+from data.models import Price
+import tools.api as api
+
+TICKER = "BENCH"
+END_DATE = "2024-12-31"
+START_DATE = "2015-01-01"
+
+WINDOWS = {"2 days": 2, "3 months": 91, "1 year": 365, "10 years": 3653}
+
+
+def make_prices() -> list[Price]:
+    """Synthetic trading days (weekdays) from START_DATE to END_DATE."""
+    day = datetime.date.fromisoformat(START_DATE)
+    end = datetime.date.fromisoformat(END_DATE)
+    prices = []
+    while day <= end:
+        if day.weekday() < 5:
+            close = 100.0 + len(prices) * 0.01
+            prices.append(Price(open=close - 0.5, close=close, high=close + 1.0, low=close - 1.0, volume=1_000_000 + len(prices), time=f"{day.isoformat()}T05:00:00Z"))
+        day += datetime.timedelta(days=1)
+    return prices
+
+
+def columns_frame(start_date: str, end_date: str) -> pd.DataFrame:
+    """The previous get_price_data: a new DataFrame from views of the cached columns on every call."""
+    columns = api._ensure_prices(TICKER, start_date, end_date)
+    i, j = columns.bounds(start_date, end_date)
+    return pd.DataFrame(
+        {"open": columns.open[i:j], "close": columns.close[i:j], "high": columns.high[i:j], "low": columns.low[i:j], "volume": columns.volume[i:j], "time": columns.time[i:j]},
+        index=columns.index[i:j],
+    )
+
+
+def calls_per_second(func: callable, repeat: int = 5) -> float:
+    number = max(1, int(0.2 / max(timeit.timeit(func, number=1), 1e-6)))
+    return number / min(timeit.repeat(func, number=number, repeat=repeat))
+
+
+def main():
+    prices = make_prices()
+    cache = Cache(store=None, archive=None)
+    cache.set_prices(TICKER, prices)
+    cache.add_coverage("prices", TICKER, START_DATE, END_DATE)
+    api._cache = cache
+
+    print(f"{len(prices)} daily prices for {TICKER}, {START_DATE} to {END_DATE}\n")
+    print(f"{'window':<12}{'rows':>8}{'prices_to_df (/s)':>20}{'columns (/s)':>16}{'cached frame (/s)':>20}{'speedup':>10}")
+    for name, days in WINDOWS.items():
+        start_date = (datetime.date.fromisoformat(END_DATE) - datetime.timedelta(days=days - 1)).isoformat()
+        expected = api.prices_to_df(api.get_prices(TICKER, start_date, END_DATE))
+        frame = api.get_price_data(TICKER, start_date, END_DATE)
+        pd.testing.assert_frame_equal(frame, expected, check_freq=False, check_index_type=False, check_dtype=False)
+
+        before = calls_per_second(lambda: api.prices_to_df(api.get_prices(TICKER, start_date, END_DATE)))
+        columns = calls_per_second(lambda: columns_frame(start_date, END_DATE))
+        after = calls_per_second(lambda: api.get_price_data(TICKER, start_date, END_DATE))
+        print(f"{name:<12}{len(frame):>8}{before:>20,.0f}{columns:>16,.0f}{after:>20,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
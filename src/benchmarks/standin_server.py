@@ -0,0 +1,243 @@
+"""
+Local stand-in for the Financial Datasets API, for load testing the real client code without the internet.
+
+Serves the endpoints tools.api consumes with synthetic but schema-valid data (responses are validated
+against data/models.py) for any ticker and date range. The data is deterministic: the same request
+always returns the same rows. Latency, server errors and 429 rate limiting can be injected.
+
+Usage:
+    poetry run python src/benchmarks/standin_server.py --port 8000 --latency-ms 50 --error-rate 0.01 --rate-limit-rate 0.02
+    FINANCIAL_DATASETS_BASE_URL=http://127.0.0.1:8000 poetry run python src/main.py --tickers AAPL,MSFT
+"""
+
+import argparse
+import asyncio
+import datetime
+import hashlib
+import math
+import os
+import random
+import sys
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.models import (
+    CompanyFacts,
+    CompanyFactsResponse,
+    CompanyNews,
+    CompanyNewsResponse,
+    FinancialMetrics,
+    FinancialMetricsResponse,
+    InsiderTrade,
+    InsiderTradeResponse,
+    LineItem,
+    LineItemResponse,
+    Price,
+    PriceResponse,
+)
+
+# Synthetic history starts here; earlier requests return no rows
+HISTORY_START = datetime.date(2000, 1, 1)
+
+# Fault injection, overridable from the command line
+CONFIG = {
+    "latency_ms": float(os.environ.get("STANDIN_LATENCY_MS", 0)),
+    "latency_jitter_ms": float(os.environ.get("STANDIN_LATENCY_JITTER_MS", 0)),
+    "error_rate": float(os.environ.get("STANDIN_ERROR_RATE", 0)),
+    "rate_limit_rate": float(os.environ.get("STANDIN_RATE_LIMIT_RATE", 0)),
+    "retry_after": float(os.environ.get("STANDIN_RETRY_AFTER", 1)),
+}
+
+app = FastAPI(title="Financial Datasets stand-in")
+
+
+def _unit(*parts: any) -> float:
+    """A deterministic pseudo-random number in [0, 1) derived from the parts."""
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+def _days(start_date: str, end_date: str) -> list[datetime.date]:
+    """Days between start_date and end_date (inclusive) that fall inside the synthetic history, newest first."""
+    start = max(datetime.date.fromisoformat(start_date[:10]), HISTORY_START)
+    end = min(datetime.date.fromisoformat(end_date[:10]), datetime.date.today())
+    return [end - datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _report_periods(end_date: str, period: str, limit: int) -> list[str]:
+    """The newest `limit` report periods on or before end_date: year ends for annual, quarter ends otherwise."""
+    end = datetime.date.fromisoformat(end_date[:10])
+    periods = []
+    year, month = end.year, (12 if period == "annual" else ((end.month - 1) // 3) * 3 + 3)
+    while len(periods) < limit:
+        last_day = (datetime.date(year + (month == 12), month % 12 + 1, 1) - datetime.timedelta(days=1))
+        if last_day <= end:
+            if last_day < HISTORY_START:
+                break
+            periods.append(last_day.isoformat())
+        month -= 12 if period == "annual" else 3
+        if month <= 0:
+            month += 12
+            year -= 1
+    return periods
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    """Add latency and randomly answer with 500s and 429s, as configured."""
+    if CONFIG["latency_ms"] or CONFIG["latency_jitter_ms"]:
+        await asyncio.sleep((CONFIG["latency_ms"] + random.uniform(0, CONFIG["latency_jitter_ms"])) / 1000)
+    roll = random.random()
+    if roll < CONFIG["rate_limit_rate"]:
+        return JSONResponse({"error": "Too many requests"}, status_code=429, headers={"Retry-After": str(CONFIG["retry_after"])})
+    if roll < CONFIG["rate_limit_rate"] + CONFIG["error_rate"]:
+        return JSONResponse({"error": "Internal server error"}, status_code=500)
+    return await call_next(request)
+
+
+@app.get("/prices/", response_model=PriceResponse)
+def prices(ticker: str, start_date: str, end_date: str, interval: str = "day", interval_multiplier: int = 1):
+    base = 20 + 480 * _unit(ticker)
+    rows = []
+    for day in reversed(_days(start_date, end_date)):
+        if day.weekday() >= 5:
+            continue
+        ordinal = day.toordinal()
+        close = base * (1 + 0.3 * math.sin(ordinal / 90 + base)) * (1 + 0.02 * (_unit(ticker, day) - 0.5))
+        spread = close * 0.02 * _unit(ticker, day, "spread")
+        open_ = close * (1 + 0.01 * (_unit(ticker, day, "open") - 0.5))
+        rows.append(
+            Price(
+                open=round(open_, 2),
+                close=round(close, 2),
+                high=round(max(open_, close) + spread, 2),
+                low=round(min(open_, close) - spread, 2),
+                volume=int(1_000_000 + 9_000_000 * _unit(ticker, day, "volume")),
+                time=f"{day.isoformat()}T05:00:00Z",
+            )
+        )
+    return PriceResponse(ticker=ticker, prices=rows)
+
+
+def _metrics(ticker: str, report_period: str, period: str) -> FinancialMetrics:
+    fields = {name: round(2 * _unit(ticker, report_period, name) - 0.5, 4) for name in FinancialMetrics.model_fields if name not in ("ticker", "report_period", "period", "currency")}
+    fields["market_cap"] = round(1e9 + 1e12 * _unit(ticker, "market_cap") * (1 + 0.1 * _unit(ticker, report_period)), 2)
+    fields["enterprise_value"] = round(fields["market_cap"] * (1 + 0.2 * _unit(ticker, report_period, "ev")), 2)
+    return FinancialMetrics(ticker=ticker, report_period=report_period, period=period, currency="USD", **fields)
+
+
+@app.get("/financial-metrics/", response_model=FinancialMetricsResponse)
+def financial_metrics(ticker: str, report_period_lte: str, limit: int = 10, period: str = "ttm"):
+    return FinancialMetricsResponse(financial_metrics=[_metrics(ticker, report_period, period) for report_period in _report_periods(report_period_lte, period, limit)])
+
+
+class LineItemSearch(BaseModel):
+    tickers: list[str]
+    line_items: list[str]
+    end_date: str
+    period: str = "ttm"
+    limit: int = 10
+
+
+@app.post("/financials/search/line-items", response_model=LineItemResponse)
+def search_line_items(search: LineItemSearch):
+    results = []
+    for ticker in search.tickers:
+        scale = 1e8 + 1e11 * _unit(ticker, "scale")
+        for report_period in _report_periods(search.end_date, search.period, search.limit):
+            values = {item: round(scale * (2 * _unit(ticker, report_period, item) - 0.3), 2) for item in search.line_items}
+            results.append(LineItem(ticker=ticker, report_period=report_period, period=search.period, currency="USD", **values))
+    return LineItemResponse(search_results=results)
+
+
+@app.get("/insider-trades/", response_model=InsiderTradeResponse)
+def insider_trades(ticker: str, filing_date_lte: str, filing_date_gte: str | None = None, limit: int = 1000):
+    trades = []
+    for day in _days(filing_date_gte or HISTORY_START.isoformat(), filing_date_lte):
+        # Roughly one filing a week
+        if _unit(ticker, day, "insider") >= 1 / 7:
+            continue
+        shares = round(20_000 * (_unit(ticker, day, "shares") - 0.6))
+        price = round(20 + 480 * _unit(ticker), 2)
+        before = 100_000 + round(900_000 * _unit(ticker, day, "owned"))
+        trades.append(
+            InsiderTrade(
+                ticker=ticker,
+                issuer=f"{ticker} Inc.",
+                name=f"Insider {int(_unit(ticker, day, 'name') * 10)}",
+                title="Director",
+                is_board_director=True,
+                transaction_date=(day - datetime.timedelta(days=2)).isoformat(),
+                transaction_shares=shares,
+                transaction_price_per_share=price,
+                transaction_value=round(shares * price, 2),
+                shares_owned_before_transaction=before,
+                shares_owned_after_transaction=before + shares,
+                security_title="Common Stock",
+                filing_date=day.isoformat(),
+            )
+        )
+        if len(trades) >= limit:
+            break
+    return InsiderTradeResponse(insider_trades=trades)
+
+
+@app.get("/news/", response_model=CompanyNewsResponse)
+def news(ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000):
+    articles = []
+    for day in _days(start_date or HISTORY_START.isoformat(), end_date):
+        for i in range(int(3 * _unit(ticker, day, "news"))):
+            sentiment = ("positive", "negative", "neutral")[int(3 * _unit(ticker, day, i, "sentiment"))]
+            articles.append(
+                CompanyNews(
+                    ticker=ticker,
+                    title=f"{ticker} headline {day.isoformat()} #{i}",
+                    author="Stand-in Reporter",
+                    source="Stand-in News",
+                    date=f"{day.isoformat()}T{12 + i:02d}:00:00Z",
+                    url=f"https://news.example.com/{ticker}/{day.isoformat()}/{i}",
+                    sentiment=sentiment,
+                )
+            )
+        if len(articles) >= limit:
+            break
+    return CompanyNewsResponse(news=articles[:limit])
+
+
+@app.get("/company/facts/", response_model=CompanyFactsResponse)
+def company_facts(ticker: str):
+    return CompanyFactsResponse(
+        company_facts=CompanyFacts(
+            ticker=ticker,
+            name=f"{ticker} Inc.",
+            is_active=True,
+            market_cap=round(1e9 + 1e12 * _unit(ticker, "market_cap"), 2),
+            weighted_average_shares=int(1e8 + 1e10 * _unit(ticker, "shares")),
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Financial Datasets API")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind (default: 8000)")
+    parser.add_argument("--latency-ms", type=float, default=CONFIG["latency_ms"], help="Added latency per request in milliseconds")
+    parser.add_argument("--latency-jitter-ms", type=float, default=CONFIG["latency_jitter_ms"], help="Extra random latency of up to this many milliseconds")
+    parser.add_argument("--error-rate", type=float, default=CONFIG["error_rate"], help="Fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=CONFIG["rate_limit_rate"], help="Fraction of requests answered with a 429")
+    parser.add_argument("--retry-after", type=float, default=CONFIG["retry_after"], help="Retry-After seconds sent with 429s")
+    args = parser.parse_args()
+
+    CONFIG.update(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
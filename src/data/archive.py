@@ -0,0 +1,140 @@
+"""Memory-mapped on-disk price archive that many processes can share.
+
+Each ticker's price history is stored as fixed-width binary columns (one .npy file per column) plus a
+small JSON index recording the version on disk, its row count and the date windows it covers:
+
+    <root>/<TICKER>/index.json
+    <root>/<TICKER>/<version>/days.npy, open.npy, close.npy, high.npy, low.npy, volume.npy, time.npy, timestamps.npy
+
+Readers open the columns with numpy.memmap, so every process on the machine shares one page-cached copy
+and date range slices are views into it, with nothing parsed or copied per process. A writer saves a
+new version next to the old one and then atomically replaces index.json, so readers always see a
+complete version. Writers for the same ticker take turns on an exclusive lock file, and each removes only
+the version it replaced. Archived prices never expire; delete the directory to rebuild it.
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from data.prices import PRICE_COLUMNS, PriceColumns
+
+ARCHIVE_COLUMNS = ["days", *PRICE_COLUMNS, "time", "timestamps"]
+
+
+class PriceArchive:
+    """Per-ticker price columns under one directory, read through numpy.memmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.path, quote(ticker, safe=""))
+
+    def _read_index(self, ticker: str) -> dict[str, any] | None:
+        try:
+            with open(os.path.join(self._ticker_dir(ticker), "index.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def load(self, ticker: str) -> tuple[PriceColumns, list[list[str]]] | None:
+        """Memory-map a ticker's archived columns. Returns the columns and the date windows they cover, or None."""
+        # A writer may remove the version named by the index just read, in which case the next read sees the new one
+        for _ in range(3):
+            if (index := self._read_index(ticker)) is None:
+                return None
+            directory = os.path.join(self._ticker_dir(ticker), index["version"])
+            try:
+                columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in ARCHIVE_COLUMNS}
+            except FileNotFoundError:
+                continue
+            timestamps = pd.DatetimeIndex(columns.pop("timestamps"), name="Date")
+            if index["tz"]:
+                timestamps = timestamps.tz_localize("UTC").tz_convert(index["tz"])
+            return PriceColumns(**columns, index=timestamps), index["coverage"]
+        return None
+
+    @contextmanager
+    def _write_lock(self, ticker: str):
+        """Hold an exclusive lock on a ticker's directory, so writers in different processes take turns."""
+        ticker_dir = self._ticker_dir(ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+        with open(os.path.join(ticker_dir, ".lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def write(self, ticker: str, columns: PriceColumns, coverage: list[list[str]]):
+        """Save a ticker's columns and the date windows they cover as the ticker's current version."""
+        if not len(columns):
+            # Zero-length files cannot be memory-mapped, and an empty history is not worth sharing
+            return
+        ticker_dir = self._ticker_dir(ticker)
+        with self._write_lock(ticker):
+            previous = self._read_index(ticker)
+            if previous is not None and previous["rows"] == len(columns) and self._same_days(ticker_dir, previous["version"], columns):
+                # No new rows (e.g. a window that came back empty), so only the coverage in the index changes
+                self._write_index(ticker, {**previous, "coverage": coverage, "written_at": time.time()})
+                return
+
+            version = f"{time.time_ns():x}-{os.getpid()}"
+            directory = os.path.join(ticker_dir, version)
+            os.makedirs(directory)
+
+            # Timestamps are stored as UTC datetimes so readers rebuild the DataFrame index without parsing strings
+            tz = columns.index.tz
+            values = {
+                "days": columns.days,
+                **{column: getattr(columns, column) for column in PRICE_COLUMNS},
+                "time": np.asarray(columns.time.tolist(), dtype=str),
+                "timestamps": (columns.index.tz_convert(None) if tz else columns.index).to_numpy(),
+            }
+            for name, array in values.items():
+                np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+            self._write_index(ticker, {"ticker": ticker, "version": version, "rows": len(columns), "coverage": coverage, "tz": str(tz) if tz else None, "written_at": time.time()})
+
+            # Processes that already mapped the old version keep reading it; the files go away once they unmap them
+            if previous is not None and previous["version"] != version:
+                shutil.rmtree(os.path.join(ticker_dir, previous["version"]), ignore_errors=True)
+
+    def _same_days(self, ticker_dir: str, version: str, columns: PriceColumns) -> bool:
+        try:
+            return np.array_equal(np.load(os.path.join(ticker_dir, version, "days.npy"), mmap_mode="r"), columns.days)
+        except FileNotFoundError:
+            return False
+
+    def _write_index(self, ticker: str, index: dict[str, any]):
+        index_path = os.path.join(self._ticker_dir(ticker), "index.json")
+        with open(f"{index_path}.tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(f"{index_path}.tmp", index_path)
+
+    def tickers(self) -> list[str]:
+        """Tickers with an archived version."""
+        tickers = []
+        for entry in os.listdir(self.path):
+            try:
+                with open(os.path.join(self.path, entry, "index.json")) as f:
+                    tickers.append(json.load(f)["ticker"])
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return sorted(tickers)
+
+
+def open_archive_from_env() -> PriceArchive | None:
+    """Open the price archive configured by FINANCIAL_DATA_PRICE_ARCHIVE, if any."""
+    path = os.environ.get("FINANCIAL_DATA_PRICE_ARCHIVE")
+    if not path:
+        return None
+    return PriceArchive(os.path.expanduser(path))
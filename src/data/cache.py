@@ -1,65 +1,419 @@
+import datetime
+import os
+import threading
+import time
+from collections import Counter
+from typing import NamedTuple
+
+from pydantic import BaseModel, TypeAdapter
+
+from data.archive import PriceArchive, open_archive_from_env
+from data.coverage import DateIntervalSet, ReportPeriodSeries, shift_date
+from data.insider import InsiderRollup
+from data.memory import LRUTracker, estimate_size
+from data.models import CompanyNews, FinancialMetrics, InsiderTrade, LineItem, Price
+from data.prices import PriceColumns
+from data.store import SQLiteStore, open_store_from_env
+
+_STORE_FROM_ENV = object()
+_ARCHIVE_FROM_ENV = object()
+
+# Several insider trades can share a filing date and several articles a timestamp, so dedupe on more fields
+INSIDER_TRADE_KEY = ("filing_date", "name", "transaction_date", "transaction_shares", "security_title")
+COMPANY_NEWS_KEY = ("date", "url")
+
+
+# How long (seconds) a failed lookup is remembered before asking upstream again
+DEFAULT_FAILURE_TTL = 60
+
+# How long (seconds) a fetched window reaching into the current day counts as covered; rows for the day can still arrive
+DEFAULT_CURRENT_DAY_TTL = 15 * 60
+
+# Most failed lookups remembered per (namespace, key); the oldest are dropped first
+MAX_NEGATIVE_ENTRIES = 32
+
+# Rough size of one remembered lookup in bytes, counted against its namespace's memory budget
+_NEGATIVE_ENTRY_BYTES = 200
+
+
+class NegativeEntry(NamedTuple):
+    """A query window that failed upstream, remembered with its error until expires_at."""
+
+    start_date: str
+    end_date: str
+    expires_at: float
+    error: str
+
+
+def _row_key(item: BaseModel, key_field: str | tuple[str, ...]) -> any:
+    if isinstance(key_field, tuple):
+        return tuple(getattr(item, field) for field in key_field)
+    return getattr(item, key_field)
+
+
 class Cache:
-    """In-memory cache for API responses."""
+    """
+    In-memory cache for API responses, optionally backed by a persistent store.
+
+    Safe to share between threads. Each entry (one ticker's prices, news or insider trades, or one
+    ticker's series for a period) has its own lock, so threads working on different tickers never wait
+    on each other. Fetchers hold an entry's lock() across checking the cache, fetching what is missing
+    and storing it, so concurrent requests for the same ticker neither fetch twice nor interleave writes.
+    """
+
+    def __init__(self, store: SQLiteStore | None = _STORE_FROM_ENV, archive: PriceArchive | None = _ARCHIVE_FROM_ENV):
+        self._prices_cache: dict[str, PriceColumns] = {}
+        self._financial_metrics_cache: dict[str, ReportPeriodSeries] = {}
+        self._line_items_cache: dict[str, ReportPeriodSeries] = {}
+        # Validated, immutable model instances, so cache hits need no Pydantic round-trip
+        self._insider_trades_cache: dict[str, list[InsiderTrade]] = {}
+        self._company_news_cache: dict[str, list[CompanyNews]] = {}
+        # Daily insider activity per ticker, with the trades list it was built from
+        self._insider_rollups: dict[str, tuple[list[InsiderTrade], InsiderRollup]] = {}
+
+        # Date windows already fetched, per (namespace, ticker), for the date-ranged endpoints
+        self._coverage: dict[tuple[str, str], DateIntervalSet] = {}
+        # The part of a fetched window from the current day on, per (namespace, ticker), as (start, end, expires_at).
+        # It is kept in memory only and counts as covered until it expires, so the current day is not refetched on every call.
+        self._current_day: dict[tuple[str, str], tuple[str, str, float]] = {}
+
+        # Failed lookups per (namespace, key), remembered for a limited time so repeated calls fail fast
+        self._negative: dict[tuple[str, str], list[NegativeEntry]] = {}
+        self._stats: Counter = Counter()
+
+        # Estimated memory per namespace and ticker, evicting least recently used tickers over budget
+        self._lru = LRUTracker()
+
+        # The store is opened lazily so that .env files loaded after import are honored
+        self._store = store
+        self._store_lock = threading.Lock()
+        # When set, the price archive replaces the store as the persistent tier for prices
+        self._archive = archive
+        self._loaded: set[tuple[str, str]] = set()
+
+        # One reentrant lock per (namespace, key), created on first use
+        self._locks: dict[tuple[str, str], threading.RLock] = {}
+        self._locks_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
 
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
-        self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
-        self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
-        self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+    @property
+    def store(self) -> SQLiteStore | None:
+        """The persistent tier, or None when only the in-memory cache is used."""
+        if self._store is _STORE_FROM_ENV:
+            with self._store_lock:
+                if self._store is _STORE_FROM_ENV:
+                    self._store = open_store_from_env()
+        return self._store
 
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
-        """Merge existing and new data, avoiding duplicates based on a key field."""
-        if not existing:
-            return new_data
+    @property
+    def archive(self) -> PriceArchive | None:
+        """The memory-mapped price archive, or None when prices are kept in the store (if any)."""
+        if self._archive is _ARCHIVE_FROM_ENV:
+            with self._store_lock:
+                if self._archive is _ARCHIVE_FROM_ENV:
+                    self._archive = open_archive_from_env()
+        return self._archive
 
+    def lock(self, namespace: str, key: str) -> threading.RLock:
+        """The lock guarding one entry: a ticker for prices, insider trades and news, or "ticker:period" for series."""
+        if (lock := self._locks.get((namespace, key))) is None:
+            with self._locks_lock:
+                lock = self._locks.setdefault((namespace, key), threading.RLock())
+        return lock
+
+    def _read_through(self, namespace: str, memory: dict[str, list[BaseModel]], ticker: str, key_field: str | tuple[str, ...], model: type[BaseModel]) -> list[BaseModel] | None:
+        """Return in-memory data, loading it from the persistent store on first access."""
+        with self.lock(namespace, ticker):
+            if (namespace, ticker) not in self._loaded:
+                self._loaded.add((namespace, ticker))
+                if self.store and (rows := self.store.load_rows(namespace, ticker)):
+                    # Validate the whole batch once at ingest rather than per cache hit
+                    memory[ticker] = self._merge_data(memory.get(ticker), TypeAdapter(list[model]).validate_python(rows), key_field)
+                    self._account(namespace, ticker, memory[ticker])
+            self._lru.touch(namespace, ticker)
+            return memory.get(ticker)
+
+    def _write_through(self, namespace: str, memory: dict[str, list[BaseModel]], ticker: str, data: list[BaseModel], key_field: str | tuple[str, ...]):
+        """Merge new data into memory and persist it to the store."""
+        with self.lock(namespace, ticker):
+            # The merged list replaces the old one, so readers holding the old list are unaffected
+            memory[ticker] = self._merge_data(self._read_through(namespace, memory, ticker, key_field, type(data[0])), data, key_field)
+            if self.store:
+                self.store.save_rows(namespace, ticker, [item.model_dump() for item in data], key_field)
+            self._account(namespace, ticker, memory[ticker])
+
+    def _merge_data(self, existing: list[BaseModel] | None, new_data: list[BaseModel], key_field: str | tuple[str, ...]) -> list[BaseModel]:
+        """Merge existing and new data, avoiding duplicates based on a key field (or tuple of fields)."""
         # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
+        existing_keys = {_row_key(item, key_field) for item in existing or []}
 
-        # Only add items that don't exist yet
-        merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
+        # Only add items that don't exist yet (paginated fetches can repeat rows across pages)
+        merged = list(existing or [])
+        for item in new_data:
+            if (key := _row_key(item, key_field)) not in existing_keys:
+                existing_keys.add(key)
+                merged.append(item)
         return merged
 
-    def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+    def _account(self, namespace: str, key: str, value: PriceColumns | ReportPeriodSeries | list[BaseModel] | None):
+        """Update an entry's estimated size and evict least recently used entries if the namespace is over budget."""
+        size, rows = estimate_size(value) if value is not None else (0, 0)
+        size += _NEGATIVE_ENTRY_BYTES * len(self._negative.get((namespace, key), ()))
+        if namespace == "insider_trades" and (rollup := self._insider_rollups.get(key)) is not None:
+            size += rollup[1].nbytes
+        self._lru.update(namespace, key, size, rows)
+        for candidate in self._lru.eviction_candidates(namespace, keep=key):
+            if not self._lru.over_budget(namespace):
+                break
+            # Never wait for another entry's lock while holding this one; an entry in use is skipped instead
+            lock = self.lock(namespace, candidate)
+            if lock.acquire(blocking=False):
+                try:
+                    self._evict(namespace, candidate)
+                finally:
+                    lock.release()
+
+    def _memory(self, namespace: str) -> dict[str, any]:
+        return {
+            "prices": self._prices_cache,
+            "financial_metrics": self._financial_metrics_cache,
+            "line_items": self._line_items_cache,
+            "insider_trades": self._insider_trades_cache,
+            "company_news": self._company_news_cache,
+        }[namespace]
+
+    def _evict(self, namespace: str, key: str):
+        """
+        Drop an entry from memory together with the coverage that vouches for it.
+
+        Coverage says every row in a window is cached, so it must never outlive the rows: the next access
+        reloads both from the persistent store, or finds the window uncovered and refetches it.
+        """
+        self._memory(namespace).pop(key, None)
+        self._negative.pop((namespace, key), None)
+        if namespace == "insider_trades":
+            self._insider_rollups.pop(key, None)
+        # Report period series carry their own coverage; date-ranged namespaces keep it per (namespace, ticker)
+        self._coverage.pop((namespace, key), None)
+        self._current_day.pop((namespace, key), None)
+        self._loaded.discard((namespace, key))
+        self._lru.discard(namespace, key, evicted=True)
+
+    def get_coverage(self, namespace: str, ticker: str) -> DateIntervalSet:
+        """Get the date windows already fetched for a ticker, including the current day while it has not expired."""
+        with self.lock(namespace, ticker):
+            coverage = self._stored_coverage(namespace, ticker)
+            if (current_day := self._current_day.get((namespace, ticker))) is None or current_day[2] <= time.time():
+                return coverage
+            return DateIntervalSet([*coverage.intervals, list(current_day[:2])])
+
+    def _stored_coverage(self, namespace: str, ticker: str) -> DateIntervalSet:
+        """The date windows covered up to yesterday, loading them from the store on first access."""
+        if namespace == "prices" and self.archive:
+            # Archived coverage is loaded together with the columns it describes
+            self.get_prices(ticker)
+        if (coverage := self._coverage.get((namespace, ticker))) is None:
+            intervals = self.store.load_intervals(namespace, ticker) if self.store and not (namespace == "prices" and self.archive) else None
+            coverage = self._coverage[(namespace, ticker)] = DateIntervalSet(intervals)
+        return coverage
+
+    def add_coverage(self, namespace: str, ticker: str, start_date: str, end_date: str):
+        """
+        Record that every row of a ticker between start_date and end_date (inclusive) is cached.
+
+        Days up to yesterday are covered for good. Rows for the current day can still arrive, so the part of
+        the window from today on is covered in memory for FINANCIAL_DATA_CURRENT_DAY_TTL seconds only.
+        """
+        self.add_coverage_windows(namespace, ticker, [(start_date, end_date)])
+
+    def add_coverage_windows(self, namespace: str, ticker: str, windows: list[tuple[str, str]]):
+        """Record several fetched windows at once, like add_coverage, writing archived prices only once for all of them."""
+        today = datetime.date.today().isoformat()
+        archive = False
+        with self.lock(namespace, ticker):
+            for start_date, end_date in windows:
+                start_date, end_date = start_date[:10], end_date[:10]
+                if start_date > end_date:
+                    continue
+                if start_date <= (covered_end := min(end_date, shift_date(today, -1))):
+                    self._stored_coverage(namespace, ticker).add(start_date, covered_end)
+                    if namespace == "prices" and self.archive:
+                        archive = True
+                    elif self.store:
+                        self.store.save_interval(namespace, ticker, start_date, covered_end)
+                if end_date >= today:
+                    self._cover_current_day(namespace, ticker, max(start_date, today), end_date)
 
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+            # Rows are only shared once their coverage is known, so the archive is written here rather than in set_prices
+            if archive and (columns := self._prices_cache.get(ticker)) is not None:
+                try:
+                    self.archive.write(ticker, columns, self._coverage[(namespace, ticker)].intervals)
+                except Exception:
+                    # Counted in get_stats() rather than printed, as this runs on fetch worker threads.
+                    # The rows stay cached in memory, and the next covered window tries to archive them again.
+                    with self._stats_lock:
+                        self._stats["archive_errors"] += 1
 
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
-        """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+    def _cover_current_day(self, namespace: str, ticker: str, start_date: str, end_date: str):
+        # A fresh window that this one joins is widened, keeping its expiry, rather than replaced
+        now = time.time()
+        current_day = self._current_day.get((namespace, ticker))
+        if current_day is not None and current_day[2] > now and current_day[0] <= shift_date(end_date, 1) and start_date <= shift_date(current_day[1], 1):
+            self._current_day[(namespace, ticker)] = (min(start_date, current_day[0]), max(end_date, current_day[1]), current_day[2])
+        else:
+            ttl = float(os.environ.get("FINANCIAL_DATA_CURRENT_DAY_TTL", DEFAULT_CURRENT_DAY_TTL))
+            self._current_day[(namespace, ticker)] = (start_date, end_date, now + ttl)
 
-    def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
-        """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+    def get_negative(self, namespace: str, key: str, start_date: str, end_date: str) -> NegativeEntry | None:
+        """Get an unexpired failed lookup whose window contains [start_date, end_date], if any."""
+        with self.lock(namespace, key):
+            if not (entries := self._negative.get((namespace, key))):
+                return None
+            now = time.time()
+            entries[:] = [entry for entry in entries if entry.expires_at > now]
+            for entry in entries:
+                if entry.start_date <= start_date[:10] and end_date[:10] <= entry.end_date:
+                    with self._stats_lock:
+                        self._stats["failure_hits"] += 1
+                    return entry
+            return None
 
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+    def set_negative(self, namespace: str, key: str, start_date: str, end_date: str, error: str):
+        """
+        Remember that a query window failed with error, for FINANCIAL_DATA_FAILURE_TTL seconds.
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+        Windows that came back empty are not remembered here: they are recorded as coverage like any other
+        fetched window, and expire with it.
+        """
+        # Read at call time, like the store, so that .env files loaded after import are honored
+        ttl = float(os.environ.get("FINANCIAL_DATA_FAILURE_TTL", DEFAULT_FAILURE_TTL))
+        now = time.time()
+        entry = NegativeEntry(start_date[:10], end_date[:10], now + ttl, error)
+        with self.lock(namespace, key):
+            # Expired entries and those the new window replaces are dropped, so the list stays short
+            entries = [old for old in self._negative.get((namespace, key), ()) if old.expires_at > now and not (entry.start_date <= old.start_date and old.end_date <= entry.end_date)]
+            self._negative[(namespace, key)] = [*entries, entry][-MAX_NEGATIVE_ENTRIES:]
+            self._account(namespace, key, self._memory(namespace).get(key))
 
-    def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
+    def get_stats(self) -> dict[str, any]:
+        """Cache statistics, including hits on remembered failed lookups (failure_hits), failed price archive writes, and memory use per namespace."""
+        return {
+            "failure_hits": self._stats["failure_hits"],
+            "archive_errors": self._stats["archive_errors"],
+            "negative_entries": sum(len(entries) for entries in list(self._negative.values())),
+            "memory": self._lru.stats(),
+        }
+
+    def get_prices(self, ticker: str) -> PriceColumns | None:
+        """Get cached price columns if available."""
+        with self.lock("prices", ticker):
+            if ("prices", ticker) not in self._loaded:
+                self._loaded.add(("prices", ticker))
+                if self.archive:
+                    if archived := self.archive.load(ticker):
+                        self._prices_cache[ticker], intervals = archived
+                        self._coverage[("prices", ticker)] = DateIntervalSet(intervals)
+                        self._account("prices", ticker, self._prices_cache[ticker])
+                elif self.store and (rows := self.store.load_rows("prices", ticker)):
+                    existing = self._prices_cache.get(ticker)
+                    self._prices_cache[ticker] = existing.merge(rows) if existing else PriceColumns.from_rows(rows)
+                    self._account("prices", ticker, self._prices_cache[ticker])
+            self._lru.touch("prices", ticker)
+            return self._prices_cache.get(ticker)
+
+    def set_prices(self, ticker: str, data: list[Price]):
+        """Merge new price data into the ticker's columns."""
+        rows = [dict(price) for price in data]
+        with self.lock("prices", ticker):
+            # Merging builds new columns, so readers holding the old ones are unaffected
+            existing = self.get_prices(ticker)
+            self._prices_cache[ticker] = existing.merge(rows) if existing else PriceColumns.from_rows(rows)
+            if self.store and not self.archive:
+                self.store.save_rows("prices", ticker, rows, key_field="time")
+            self._account("prices", ticker, self._prices_cache[ticker])
+
+    def build_prices(self, ticker: str, columns: PriceColumns, frame: bool = False, models: bool = False):
+        """Build a ticker's price DataFrame or Price models on first use, and count them against the prices budget."""
+        if (frame and columns._frame is None) or (models and columns._prices is None):
+            if frame:
+                columns.frame
+            if models:
+                columns.to_prices()
+            with self.lock("prices", ticker):
+                # Columns replaced by a merge or evicted meanwhile are no longer this ticker's entry
+                if self._prices_cache.get(ticker) is columns:
+                    self._account("prices", ticker, columns)
+
+    def _get_series(self, namespace: str, memory: dict[str, ReportPeriodSeries], ticker: str, period: str) -> ReportPeriodSeries:
+        """Get a report period series from memory, loading it and its coverage from the store on first access."""
+        key = f"{ticker}:{period}"
+        with self.lock(namespace, key):
+            if (series := memory.get(key)) is None:
+                series = ReportPeriodSeries(period)
+                if self.store:
+                    series.merge_rows(self.store.load_rows(namespace, key))
+                    if coverage := self.store.load_meta(namespace, key):
+                        series.restore_coverage(coverage)
+                memory[key] = series
+                self._account(namespace, key, series)
+            self._lru.touch(namespace, key)
+            return series
+
+    def _set_series(self, namespace: str, memory: dict[str, ReportPeriodSeries], ticker: str, period: str, data: list[dict[str, any]], end_date: str, exhausted: bool, requested_fields: list[str] | None = None):
+        """Merge fetched rows into a series, record the window they cover and persist both."""
+        key = f"{ticker}:{period}"
+        with self.lock(namespace, key):
+            series = self._get_series(namespace, memory, ticker, period)
+            series.merge_rows(data, requested_fields=requested_fields)
+            series.record_fetch(end_date, [row["report_period"] for row in data], exhausted)
+            if self.store:
+                self.store.save_rows(namespace, key, [series.rows[row["report_period"]] for row in data], key_field="report_period")
+                # The complete window is stamped with its oldest fetch, so it expires no later than the rows it vouches for
+                self.store.save_meta(namespace, key, series.coverage(), fetched_at=series.covered_since)
+            self._account(namespace, key, series)
+
+    def get_financial_metrics(self, ticker: str, period: str) -> ReportPeriodSeries:
+        """Get the cached financial metrics series for a ticker and period."""
+        return self._get_series("financial_metrics", self._financial_metrics_cache, ticker, period)
+
+    def set_financial_metrics(self, ticker: str, period: str, data: list[FinancialMetrics], end_date: str, exhausted: bool):
+        """Merge fetched financial metrics into the series and record the report period window they cover."""
+        self._set_series("financial_metrics", self._financial_metrics_cache, ticker, period, [dict(metric) for metric in data], end_date, exhausted)
+
+    def get_line_items(self, ticker: str, period: str) -> ReportPeriodSeries:
+        """Get the cached line item series for a ticker and period."""
+        return self._get_series("line_items", self._line_items_cache, ticker, period)
+
+    def set_line_items(self, ticker: str, period: str, data: list[LineItem], line_items: list[str], end_date: str, exhausted: bool):
+        """Merge fetched line items into the series and record the report period window they cover."""
+        self._set_series("line_items", self._line_items_cache, ticker, period, [dict(item) for item in data], end_date, exhausted, requested_fields=line_items)
+
+    def get_insider_trades(self, ticker: str) -> list[InsiderTrade] | None:
         """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        return self._read_through("insider_trades", self._insider_trades_cache, ticker, INSIDER_TRADE_KEY, InsiderTrade)
 
-    def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
+    def set_insider_trades(self, ticker: str, data: list[InsiderTrade]):
         """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+        self._write_through("insider_trades", self._insider_trades_cache, ticker, data, key_field=INSIDER_TRADE_KEY)
+
+    def get_insider_rollup(self, ticker: str) -> InsiderRollup | None:
+        """Get daily insider activity for the cached trades, rebuilt only after new trades are merged in."""
+        with self.lock("insider_trades", ticker):
+            if (trades := self.get_insider_trades(ticker)) is None:
+                return None
+            # Merging replaces the cached list, so the list the rollup was built from tells whether it is current
+            if (rollup := self._insider_rollups.get(ticker)) is None or rollup[0] is not trades:
+                rollup = self._insider_rollups[ticker] = (trades, InsiderRollup(trades))
+                self._account("insider_trades", ticker, trades)
+            return rollup[1]
 
-    def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
+    def get_company_news(self, ticker: str) -> list[CompanyNews] | None:
         """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        return self._read_through("company_news", self._company_news_cache, ticker, COMPANY_NEWS_KEY, CompanyNews)
 
-    def set_company_news(self, ticker: str, data: list[dict[str, any]]):
+    def set_company_news(self, ticker: str, data: list[CompanyNews]):
         """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+        self._write_through("company_news", self._company_news_cache, ticker, data, key_field=COMPANY_NEWS_KEY)
 
 
 # Global cache instance
@@ -0,0 +1,208 @@
+import bisect
+import datetime
+import time
+from typing import Callable
+
+# Shortest plausible spacing between consecutive report periods. If the newest cached report is
+# more recent than this, no newer report can have closed yet and later end dates are still covered.
+MIN_PERIOD_SPACING_DAYS = {"annual": 360, "quarterly": 84, "ttm": 84}
+
+# Sentinel start of a complete window that extends back to the beginning of the reported history
+HISTORY_START = ""
+
+# Start of a covered date window that reaches back to the beginning of a ticker's history
+EARLIEST_DATE = "1900-01-01"
+
+# Reserved row field listing requested fields the API did not return for that report period
+ABSENT_FIELDS_KEY = "_absent"
+
+
+def shift_date(date: str, days: int) -> str:
+    """Shift a YYYY-MM-DD (or ISO timestamp) date string by a number of days."""
+    return (datetime.date.fromisoformat(date[:10]) + datetime.timedelta(days=days)).isoformat()
+
+
+class ReportPeriodSeries:
+    """
+    Rows of one (ticker, period) series indexed by report_period, with as-of semantics.
+
+    Besides the rows, the series tracks the window [complete_from, complete_to] in which the list of
+    report periods is known to be complete. A fetch for (end_date, limit) proves completeness from its
+    oldest returned report period up to end_date, or back to the start of history when it came back short.
+    """
+
+    def __init__(self, period: str):
+        self.period = period
+        self.rows: dict[str, dict[str, any]] = {}
+        self.report_periods: list[str] = []  # sorted ascending
+        self.complete_from: str | None = None
+        self.complete_to: str | None = None
+        # Time of the oldest fetch the complete window relies on, so it never outlives its rows
+        self.covered_since: float | None = None
+        # Objects built from rows (e.g. model instances), memoized per report period until the row changes
+        self._instances: dict[str, dict[any, any]] = {}
+
+    def merge_rows(self, rows: list[dict[str, any]], requested_fields: list[str] | None = None):
+        """Merge rows into the series, combining the fields of rows that share a report period."""
+        for row in rows:
+            report_period = row["report_period"]
+            self._instances.pop(report_period, None)
+            if (existing := self.rows.get(report_period)) is None:
+                existing = self.rows[report_period] = {}
+                bisect.insort(self.report_periods, report_period)
+            absent = set(existing.get(ABSENT_FIELDS_KEY, ()))
+            existing.update(row)
+            if requested_fields is not None:
+                absent |= {field for field in requested_fields if field not in row}
+            absent -= row.keys()
+            if absent:
+                existing[ABSENT_FIELDS_KEY] = sorted(absent)
+            else:
+                existing.pop(ABSENT_FIELDS_KEY, None)
+
+    def record_fetch(self, end_date: str, report_periods: list[str], exhausted: bool):
+        """Record that every report period in the returned window up to end_date is now cached."""
+        if not report_periods and not exhausted:
+            return
+        start = HISTORY_START if exhausted else min(report_periods)
+        now = time.time()
+        if self.complete_to is None or start > shift_date(self.complete_to, 1) or (self.complete_from and self.complete_from > shift_date(end_date, 1)):
+            # Disjoint windows cannot be combined; keep the more recent one
+            if self.complete_to is None or end_date >= self.complete_to:
+                self.complete_from, self.complete_to, self.covered_since = start, end_date, now
+            return
+        self.complete_from = min(self.complete_from, start)
+        self.complete_to = max(self.complete_to, end_date)
+        self.covered_since = min(self.covered_since or now, now)
+
+    def periods_as_of(self, end_date: str, limit: int) -> list[str]:
+        """The newest `limit` cached report periods on or before end_date, newest first."""
+        i = bisect.bisect_right(self.report_periods, end_date)
+        return self.report_periods[max(0, i - limit) : i][::-1]
+
+    def _covers_end(self, end_date: str) -> bool:
+        if self.complete_to is None or end_date < self.complete_from:
+            return False
+        if end_date <= self.complete_to:
+            return True
+        i = bisect.bisect_right(self.report_periods, self.complete_to)
+        spacing = MIN_PERIOD_SPACING_DAYS.get(self.period)
+        return i > 0 and spacing is not None and shift_date(self.report_periods[i - 1], spacing) > end_date
+
+    def plan(self, end_date: str, limit: int) -> tuple[str, int] | None:
+        """Return None if (end_date, limit) can be answered from the cache, else the (end_date, limit) to fetch."""
+        if not self._covers_end(end_date):
+            return self._plan_delta(end_date, limit)
+        periods = [p for p in self.periods_as_of(end_date, limit) if p >= self.complete_from]
+        if len(periods) >= limit or self.complete_from == HISTORY_START:
+            return None
+        # The newest periods are cached; only the older ones are missing
+        return shift_date(periods[-1], -1), limit - len(periods)
+
+    def _plan_delta(self, end_date: str, limit: int) -> tuple[str, int]:
+        """
+        Fetch only the report periods that can have closed after the complete window, when end_date is past it.
+
+        One extra period is requested so the response overlaps the newest cached period, which proves
+        the two windows are contiguous and lets record_fetch extend the complete window to end_date.
+        """
+        spacing = MIN_PERIOD_SPACING_DAYS.get(self.period)
+        if self.complete_to is None or end_date <= self.complete_to or spacing is None:
+            return end_date, limit
+        i = bisect.bisect_right(self.report_periods, self.complete_to)
+        if i == 0 and self.complete_from == HISTORY_START:
+            # Nothing was reported up to complete_to, so only periods closed after it can be returned
+            days = (datetime.date.fromisoformat(end_date[:10]) - datetime.date.fromisoformat(self.complete_to[:10])).days
+            return end_date, min(limit, days // spacing + 1)
+        if i == 0 or self.report_periods[i - 1] < self.complete_from:
+            return end_date, limit
+        days = (datetime.date.fromisoformat(end_date[:10]) - datetime.date.fromisoformat(self.report_periods[i - 1])).days
+        return end_date, min(limit, days // spacing + 1)
+
+    def missing_fields(self, report_periods: list[str], fields: list[str]) -> list[str]:
+        """Requested fields that have never been asked for on at least one of the report periods."""
+        missing = set()
+        for report_period in report_periods:
+            row = self.rows[report_period]
+            absent = row.get(ABSENT_FIELDS_KEY, ())
+            missing.update(field for field in fields if field not in row and field not in absent)
+        return [field for field in fields if field in missing]
+
+    def instance(self, report_period: str, key: any, build: Callable[[dict[str, any]], any]) -> any:
+        """The object build(row) for a report period, built once and reused until the row changes."""
+        instances = self._instances.setdefault(report_period, {})
+        if (instance := instances.get(key)) is None:
+            instance = instances[key] = build(self.rows[report_period])
+        return instance
+
+    def coverage(self) -> dict[str, any]:
+        return {"complete_from": self.complete_from, "complete_to": self.complete_to, "covered_since": self.covered_since}
+
+    def restore_coverage(self, coverage: dict[str, any]):
+        self.complete_from = coverage.get("complete_from")
+        self.complete_to = coverage.get("complete_to")
+        self.covered_since = coverage.get("covered_since")
+
+
+class DateIntervalSet:
+    """Sorted, non-overlapping set of inclusive [start, end] date windows that have been fetched."""
+
+    def __init__(self, intervals: list[list[str]] | None = None):
+        self.intervals: list[list[str]] = []
+        for start, end in intervals or []:
+            self.add(start, end)
+
+    def add(self, start: str, end: str):
+        """Add a window, merging it with any overlapping or adjacent windows."""
+        start, end = start[:10], end[:10]
+        if start > end:
+            return
+        merged = []
+        for interval in self.intervals:
+            if interval[1] < shift_date(start, -1) or interval[0] > shift_date(end, 1):
+                merged.append(interval)
+            else:
+                start, end = min(start, interval[0]), max(end, interval[1])
+        merged.append([start, end])
+        self.intervals = sorted(merged)
+
+    def gaps(self, start: str, end: str) -> list[tuple[str, str]]:
+        """The sub-windows of [start, end] that are not covered yet."""
+        start, end = start[:10], end[:10]
+        gaps = []
+        cursor = start
+        for interval_start, interval_end in self.intervals:
+            if interval_end < cursor:
+                continue
+            if interval_start > end:
+                break
+            if interval_start > cursor:
+                gaps.append((cursor, shift_date(interval_start, -1)))
+            cursor = shift_date(interval_end, 1)
+            if cursor > end:
+                return gaps
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def covers(self, start: str, end: str) -> bool:
+        return not self.gaps(start, end)
+
+    def preceding(self, date: str) -> tuple[str, str] | None:
+        """The newest covered window that ends before date, if any."""
+        date = date[:10]
+        i = bisect.bisect_left(self.intervals, [date, ""])
+        if i > 0 and self.intervals[i - 1][1] >= date:
+            i -= 1
+        return tuple(self.intervals[i - 1]) if i > 0 else None
+
+    def containing(self, date: str) -> tuple[str, str] | None:
+        """The covered window containing date, if any."""
+        date = date[:10]
+        i = bisect.bisect_right(self.intervals, [date, "9999-12-31"])
+        if i > 0 and self.intervals[i - 1][1] >= date:
+            return tuple(self.intervals[i - 1])
+        return None
+
+    def to_list(self) -> list[list[str]]:
+        return [list(interval) for interval in self.intervals]
@@ -0,0 +1,48 @@
+import numpy as np
+
+from data.models import InsiderTrade
+from data.prices import to_day
+
+# Daily totals kept as cumulative sums; counts are integers, shares and values floats
+ROLLUP_FIELDS = {"trades": np.int64, "buys": np.int64, "sells": np.int64, "net_shares": np.float64, "net_value": np.float64}
+
+
+class InsiderRollup:
+    """
+    Daily insider activity for one ticker, stored as cumulative sums over sorted filing days.
+
+    A trade is a buy when transaction_shares is positive and a sell when it is negative, as the agents
+    count them. Net value adds buys' transaction values and subtracts sells'. The totals for any
+    [start_date, end_date] window are the difference of two entries found by binary search, however
+    many trades the window holds.
+    """
+
+    def __init__(self, trades: list[InsiderTrade]):
+        days = np.array([to_day(trade.filing_date) for trade in trades], dtype=np.int64)
+        shares = np.array([trade.transaction_shares or 0.0 for trade in trades], dtype=np.float64)
+        values = np.abs(np.array([trade.transaction_value or 0.0 for trade in trades], dtype=np.float64))
+        order = np.argsort(days, kind="stable")
+        days, shares, values = days[order], shares[order], values[order]
+        per_trade = {
+            "trades": np.ones(len(days), dtype=np.int64),
+            "buys": (shares > 0).astype(np.int64),
+            "sells": (shares < 0).astype(np.int64),
+            "net_shares": shares,
+            "net_value": np.sign(shares) * values,
+        }
+
+        # One entry per filing day, with a leading zero so a window starting before the first day needs no special case
+        self.days, starts = np.unique(days, return_index=True)
+        self.cumulative = {
+            field: np.concatenate([np.zeros(1, dtype=dtype), np.cumsum(np.add.reduceat(per_trade[field], starts) if len(days) else per_trade[field])]) for field, dtype in ROLLUP_FIELDS.items()
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return self.days.nbytes + sum(values.nbytes for values in self.cumulative.values())
+
+    def window(self, start_date: str, end_date: str) -> dict[str, int | float]:
+        """Totals for trades filed between start_date and end_date (inclusive)."""
+        i = int(np.searchsorted(self.days, to_day(start_date), side="left"))
+        j = max(i, int(np.searchsorted(self.days, to_day(end_date), side="right")))
+        return {field: (values[j] - values[i]).item() for field, values in self.cumulative.items()}
@@ -0,0 +1,141 @@
+"""Memory accounting and per-namespace LRU eviction for the in-memory cache tier.
+
+Each namespace (prices, financial_metrics, line_items, insider_trades, company_news) can be given a
+budget in bytes and/or rows with FINANCIAL_DATA_MEMORY_BYTES_<NAMESPACE> (e.g. 256MB) and
+FINANCIAL_DATA_MEMORY_ROWS_<NAMESPACE>. When a namespace goes over budget, its least recently used
+tickers are evicted whole. Sizes are estimates: they track growth, not exact interpreter overhead.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from pydantic import BaseModel
+
+from data.coverage import ReportPeriodSeries
+from data.prices import PriceColumns
+
+NAMESPACES = ("prices", "financial_metrics", "line_items", "insider_trades", "company_news")
+
+_SIZE_UNITS = {"KB": 1024, "MB": 1024**2, "GB": 1024**3, "K": 1024, "M": 1024**2, "G": 1024**3, "B": 1}
+
+# Rough per-object overheads in bytes (CPython object headers, dict slots, pointers)
+_ROW_OVERHEAD = 200
+_VALUE_OVERHEAD = 32
+_STR_OVERHEAD = 49
+
+
+class Budget(NamedTuple):
+    """Upper bounds for one namespace; None means unbounded."""
+
+    max_bytes: int | None = None
+    max_rows: int | None = None
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count such as 1048576, 512MB or 2G."""
+    value = value.strip().upper()
+    for suffix, multiplier in _SIZE_UNITS.items():
+        if value.endswith(suffix):
+            return int(float(value[: -len(suffix)]) * multiplier)
+    return int(value)
+
+
+def budgets_from_env() -> dict[str, Budget]:
+    budgets = {}
+    for namespace in NAMESPACES:
+        max_bytes = os.environ.get(f"FINANCIAL_DATA_MEMORY_BYTES_{namespace.upper()}")
+        max_rows = os.environ.get(f"FINANCIAL_DATA_MEMORY_ROWS_{namespace.upper()}")
+        budgets[namespace] = Budget(parse_size(max_bytes) if max_bytes else None, int(max_rows) if max_rows else None)
+    return budgets
+
+
+def _row_bytes(values) -> int:
+    size = _ROW_OVERHEAD
+    for value in values:
+        if isinstance(value, str):
+            size += _STR_OVERHEAD + len(value)
+        elif isinstance(value, list):
+            size += _VALUE_OVERHEAD + sum(_STR_OVERHEAD + len(item) if isinstance(item, str) else _VALUE_OVERHEAD for item in value)
+        elif value is not None:
+            size += _VALUE_OVERHEAD
+    return size
+
+
+def estimate_size(value: PriceColumns | ReportPeriodSeries | list[BaseModel]) -> tuple[int, int]:
+    """Estimated (bytes, rows) held by one cache entry."""
+    if isinstance(value, PriceColumns):
+        rows = len(value)
+        size = sum(getattr(value, column).nbytes for column in ("days", "open", "close", "high", "low", "volume")) + value.index.nbytes
+        size += sum(_STR_OVERHEAD + len(time) for time in value.time) + rows * 8
+        # The DataFrame and Price models are built on first use. The frame shares the numeric columns, but holds its own
+        # time strings when the columns keep them fixed-width (as the archive does); each Price model is a row of its own.
+        if value._frame is not None:
+            size += rows * 8 + (sum(_STR_OVERHEAD + len(time) for time in value.time) if value.time.dtype != object else 0)
+        if value._prices is not None:
+            size += sum(_row_bytes(price.__dict__.values()) for price in value._prices)
+        return size, rows
+    if isinstance(value, ReportPeriodSeries):
+        return sum(_row_bytes(row.values()) + _row_bytes(row.keys()) for row in value.rows.values()), len(value.rows)
+    return sum(_row_bytes(row.__dict__.values()) for row in value), len(value)
+
+
+class LRUTracker:
+    """Sizes of cache entries per namespace, in least to most recently used order. Safe to share between threads."""
+
+    def __init__(self, budgets: dict[str, Budget] | None = None):
+        # Read lazily, like the store, so that .env files loaded after import are honored
+        self._budgets = budgets
+        self._lock = threading.Lock()
+        self._entries: dict[str, OrderedDict[str, tuple[int, int]]] = {namespace: OrderedDict() for namespace in NAMESPACES}
+        self._totals: dict[str, list[int]] = {namespace: [0, 0] for namespace in NAMESPACES}
+        self._evictions: dict[str, int] = {namespace: 0 for namespace in NAMESPACES}
+
+    @property
+    def budgets(self) -> dict[str, Budget]:
+        if self._budgets is None:
+            self._budgets = budgets_from_env()
+        return self._budgets
+
+    def touch(self, namespace: str, key: str):
+        """Mark an entry as most recently used."""
+        with self._lock:
+            if key in (entries := self._entries[namespace]):
+                entries.move_to_end(key)
+
+    def update(self, namespace: str, key: str, size: int, rows: int):
+        """Record an entry's new size and mark it as most recently used."""
+        with self._lock:
+            entries, totals = self._entries[namespace], self._totals[namespace]
+            old_size, old_rows = entries.pop(key, (0, 0))
+            entries[key] = (size, rows)
+            totals[0] += size - old_size
+            totals[1] += rows - old_rows
+
+    def over_budget(self, namespace: str) -> bool:
+        budget = self.budgets.get(namespace, Budget())
+        with self._lock:
+            size, rows = self._totals[namespace]
+        return (budget.max_bytes is not None and size > budget.max_bytes) or (budget.max_rows is not None and rows > budget.max_rows)
+
+    def eviction_candidates(self, namespace: str, keep: str) -> list[str]:
+        """Keys to evict, least recently used first, if the namespace is over budget. keep is never a candidate."""
+        if not self.over_budget(namespace):
+            return []
+        with self._lock:
+            return [key for key in self._entries[namespace] if key != keep]
+
+    def discard(self, namespace: str, key: str, evicted: bool = False):
+        with self._lock:
+            if (entry := self._entries[namespace].pop(key, None)) is not None:
+                self._totals[namespace][0] -= entry[0]
+                self._totals[namespace][1] -= entry[1]
+                self._evictions[namespace] += evicted
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                namespace: {"entries": len(self._entries[namespace]), "bytes": self._totals[namespace][0], "rows": self._totals[namespace][1], "evictions": self._evictions[namespace]}
+                for namespace in NAMESPACES
+            }
@@ -9,6 +9,9 @@ class Price(BaseModel):
     volume: int
     time: str
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class PriceResponse(BaseModel):
     ticker: str
@@ -60,6 +63,9 @@ class FinancialMetrics(BaseModel):
     book_value_per_share: float | None
     free_cash_flow_per_share: float | None
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class FinancialMetricsResponse(BaseModel):
     financial_metrics: list[FinancialMetrics]
@@ -72,7 +78,7 @@ class LineItem(BaseModel):
     currency: str
 
     # Allow additional fields dynamically
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "frozen": True}
 
 
 class LineItemResponse(BaseModel):
@@ -94,11 +100,29 @@ class InsiderTrade(BaseModel):
     security_title: str | None
     filing_date: str
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class InsiderTradeResponse(BaseModel):
     insider_trades: list[InsiderTrade]
 
 
+class InsiderActivity(BaseModel):
+    """Insider trades filed between start_date and end_date, aggregated."""
+
+    ticker: str
+    start_date: str
+    end_date: str
+    trades: int
+    buys: int
+    sells: int
+    net_shares: float
+    net_value: float
+
+    model_config = {"frozen": True}
+
+
 class CompanyNews(BaseModel):
     ticker: str
     title: str
@@ -108,6 +132,9 @@ class CompanyNews(BaseModel):
     url: str
     sentiment: str | None = None
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class CompanyNewsResponse(BaseModel):
     news: list[CompanyNews]
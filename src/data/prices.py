@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from data.models import Price
+
+PRICE_COLUMNS = ["open", "close", "high", "low", "volume"]
+
+
+def to_day(date: str) -> int:
+    """Days since the Unix epoch for a YYYY-MM-DD (or ISO timestamp) date string."""
+    return int(np.datetime64(date[:10], "D").astype(np.int64))
+
+
+def _last_per_day(days: np.ndarray) -> np.ndarray:
+    """Positions that sort days ascending, keeping only the last occurrence of each day."""
+    # np.unique keeps the first occurrence, so search the reversed array to keep the last one
+    _, reversed_positions = np.unique(days[::-1], return_index=True)
+    return len(days) - 1 - reversed_positions
+
+
+class PriceColumns:
+    """
+    Daily price history for one ticker, stored as sorted NumPy columns.
+
+    Rows are keyed by day (days since the epoch) so date range queries are two binary searches,
+    and slices of the columns are views rather than copies.
+    """
+
+    def __init__(
+        self,
+        days: np.ndarray,
+        open: np.ndarray,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        volume: np.ndarray,
+        time: np.ndarray,
+        index: pd.DatetimeIndex | None = None,
+    ):
+        self.days = days
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.time = time
+        # Parsed once at ingest, so DataFrame slices do not re-parse timestamps
+        if index is None:
+            index = pd.DatetimeIndex(pd.to_datetime(time), name="Date") if len(time) else pd.DatetimeIndex([], name="Date")
+        self.index = index
+        self._prices: list[Price] | None = None
+        self._frame: pd.DataFrame | None = None
+
+    @classmethod
+    def from_rows(cls, rows: list[dict[str, any]]) -> "PriceColumns":
+        """Build sorted columns from price dicts, keeping the last row seen for each day."""
+        days = np.array([to_day(row["time"]) for row in rows], dtype=np.int64)
+        order = _last_per_day(days)
+        return cls(
+            days=days[order],
+            open=np.array([rows[i]["open"] for i in order], dtype=np.float64),
+            close=np.array([rows[i]["close"] for i in order], dtype=np.float64),
+            high=np.array([rows[i]["high"] for i in order], dtype=np.float64),
+            low=np.array([rows[i]["low"] for i in order], dtype=np.float64),
+            volume=np.array([rows[i]["volume"] for i in order], dtype=np.int64),
+            time=np.array([rows[i]["time"] for i in order], dtype=object),
+        )
+
+    def merge(self, rows: list[dict[str, any]]) -> "PriceColumns":
+        """Return new columns holding the existing rows plus the given ones (new rows win on the same day)."""
+        new = PriceColumns.from_rows(rows)
+        if not len(self):
+            return new
+        if len(new) and new.days[0] > self.days[-1]:
+            # Incremental refreshes only add newer days, which can be appended without re-sorting
+            return PriceColumns(
+                days=np.concatenate([self.days, new.days]),
+                **{column: np.concatenate([getattr(self, column), getattr(new, column)]) for column in PRICE_COLUMNS + ["time"]},
+                index=self.index.append(new.index),
+            )
+        days = np.concatenate([self.days, new.days])
+        order = _last_per_day(days)
+        return PriceColumns(
+            days=days[order],
+            **{column: np.concatenate([getattr(self, column), getattr(new, column)])[order] for column in PRICE_COLUMNS + ["time"]},
+            index=self.index.append(new.index)[order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def bounds(self, start_date: str, end_date: str) -> tuple[int, int]:
+        """Positions [i, j) of the rows between start_date and end_date (inclusive)."""
+        i = int(np.searchsorted(self.days, to_day(start_date), side="left"))
+        j = int(np.searchsorted(self.days, to_day(end_date), side="right"))
+        return i, max(i, j)
+
+    def to_rows(self, start: int = 0, stop: int | None = None) -> list[dict[str, any]]:
+        """Price dicts for positions [start, stop)."""
+        stop = len(self) if stop is None else stop
+        return [
+            {"open": o, "close": c, "high": h, "low": l, "volume": v, "time": t}
+            for o, c, h, l, v, t in zip(
+                self.open[start:stop].tolist(),
+                self.close[start:stop].tolist(),
+                self.high[start:stop].tolist(),
+                self.low[start:stop].tolist(),
+                self.volume[start:stop].tolist(),
+                self.time[start:stop].tolist(),
+            )
+        ]
+
+    def to_prices(self, start: int = 0, stop: int | None = None) -> list[Price]:
+        """Price models for positions [start, stop). They are built once, without re-validation, and then shared."""
+        if self._prices is None:
+            # The columns only ever hold validated rows, so model_construct is safe
+            self._prices = [Price.model_construct(**row) for row in self.to_rows()]
+        return self._prices[start:stop]
+
+    def arrays(self, start_date: str, end_date: str) -> dict[str, np.ndarray]:
+        """Views of every column between start_date and end_date."""
+        i, j = self.bounds(start_date, end_date)
+        return {"days": self.days[i:j], **{column: getattr(self, column)[i:j] for column in PRICE_COLUMNS}, "time": self.time[i:j]}
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The whole history as one sorted, typed DataFrame shaped like prices_to_df, built once and then sliced."""
+        if self._frame is None:
+            # Without copy=False pandas copies every column into the frame; this way the numeric columns (memory-mapped
+            # ones included) are shared, and only the times are converted to a string column
+            self._frame = pd.DataFrame(
+                {"open": self.open, "close": self.close, "high": self.high, "low": self.low, "volume": self.volume, "time": self.time},
+                index=self.index,
+                copy=False,
+            )
+        return self._frame
+
+    def to_frame(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """The rows of frame between start_date and end_date, located by binary search rather than by parsing the dates."""
+        i, j = self.bounds(start_date, end_date)
+        # Callers may edit the frame in place (prices_to_df's did not share), which without copy-on-write would write
+        # through to the cached columns, or fail on read-only archive memmaps; copying just the slice keeps them apart
+        return self.frame.iloc[i:j].copy()
@@ -0,0 +1,169 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Default time-to-live (seconds) for each cached data type
+DEFAULT_TTLS = {
+    "prices": 7 * 24 * 3600,
+    "financial_metrics": 7 * 24 * 3600,
+    "line_items": 7 * 24 * 3600,
+    "insider_trades": 24 * 3600,
+    "company_news": 24 * 3600,
+}
+
+
+# Refresh modes: "ttl" expires stored rows after their TTL, "incremental" keeps history and only fetches newer rows
+REFRESH_MODES = ("ttl", "incremental")
+
+
+class SQLiteStore:
+    """Persistent on-disk tier for the data cache, backed by a single SQLite file."""
+
+    def __init__(self, path: str, ttls: dict[str, float] | None = None, refresh: str = "ttl"):
+        if refresh not in REFRESH_MODES:
+            raise ValueError(f"Unknown refresh mode: {refresh}")
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        # In incremental mode stored rows and coverage never expire. Coverage ends at the newest day that was
+        # complete when fetched, so later runs only ask upstream for what is newer than that.
+        self.refresh = refresh
+        self._lock = threading.Lock()
+
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+
+        # A single connection shared across threads, serialized by self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rows (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                row_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key, row_key)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS coverage (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key, start_date, end_date)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def _min_fetched_at(self, namespace: str) -> float:
+        """Oldest fetch time that is still fresh for a namespace."""
+        if self.refresh == "incremental":
+            return 0.0
+        return time.time() - self.ttls.get(namespace, 0)
+
+    def load_rows(self, namespace: str, key: str) -> list[dict[str, any]]:
+        """Load all unexpired rows stored for a namespace and key."""
+        min_fetched_at = self._min_fetched_at(namespace)
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT payload FROM rows WHERE namespace = ? AND key = ? AND fetched_at >= ?",
+                (namespace, key, min_fetched_at),
+            )
+            return [json.loads(payload) for (payload,) in cursor.fetchall()]
+
+    def save_rows(self, namespace: str, key: str, rows: list[dict[str, any]], key_field: str | tuple[str, ...]):
+        """Insert or replace rows for a namespace and key, deduplicated on key_field (or a tuple of fields)."""
+        if not rows:
+            return
+        now = time.time()
+        fields = key_field if isinstance(key_field, tuple) else (key_field,)
+        records = [(namespace, key, "|".join(str(row[field]) for field in fields), json.dumps(row), now) for row in rows]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?)", records)
+            self._conn.commit()
+
+    def load_meta(self, namespace: str, key: str) -> any:
+        """Load unexpired metadata (e.g. coverage bookkeeping) for a namespace and key."""
+        min_fetched_at = self._min_fetched_at(namespace)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM meta WHERE namespace = ? AND key = ? AND fetched_at >= ?",
+                (namespace, key, min_fetched_at),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_meta(self, namespace: str, key: str, payload: any, fetched_at: float | None = None):
+        """Insert or replace metadata for a namespace and key. fetched_at should be the age of the oldest data it describes."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?)", (namespace, key, json.dumps(payload), fetched_at or time.time()))
+            self._conn.commit()
+
+    def load_intervals(self, namespace: str, key: str) -> list[list[str]]:
+        """Load the unexpired fetched date windows for a namespace and key."""
+        min_fetched_at = self._min_fetched_at(namespace)
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT start_date, end_date FROM coverage WHERE namespace = ? AND key = ? AND fetched_at >= ?",
+                (namespace, key, min_fetched_at),
+            )
+            return [[start_date, end_date] for start_date, end_date in cursor.fetchall()]
+
+    def save_interval(self, namespace: str, key: str, start_date: str, end_date: str):
+        """Record a fetched date window. Windows expire with the same TTL as the rows fetched with them."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?)", (namespace, key, start_date, end_date, time.time()))
+            self._conn.commit()
+
+    def purge_expired(self):
+        """Delete rows whose TTL has elapsed. Nothing expires in incremental mode."""
+        if self.refresh == "incremental":
+            return
+        now = time.time()
+        with self._lock:
+            for namespace, ttl in self.ttls.items():
+                self._conn.execute("DELETE FROM rows WHERE namespace = ? AND fetched_at < ?", (namespace, now - ttl))
+                self._conn.execute("DELETE FROM meta WHERE namespace = ? AND fetched_at < ?", (namespace, now - ttl))
+                self._conn.execute("DELETE FROM coverage WHERE namespace = ? AND fetched_at < ?", (namespace, now - ttl))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _ttls_from_env() -> dict[str, float]:
+    """Read per data type TTL overrides, e.g. FINANCIAL_DATA_CACHE_TTL_PRICES=86400."""
+    ttls = {}
+    for namespace in DEFAULT_TTLS:
+        if value := os.environ.get(f"FINANCIAL_DATA_CACHE_TTL_{namespace.upper()}"):
+            ttls[namespace] = float(value)
+    return ttls
+
+
+def open_store_from_env() -> SQLiteStore | None:
+    """Open the persistent store configured by FINANCIAL_DATA_CACHE_PATH and FINANCIAL_DATA_REFRESH, if any."""
+    path = os.environ.get("FINANCIAL_DATA_CACHE_PATH")
+    if not path:
+        return None
+    refresh = os.environ.get("FINANCIAL_DATA_REFRESH", "ttl").strip().lower()
+    return SQLiteStore(os.path.expanduser(path), ttls=_ttls_from_env(), refresh=refresh)
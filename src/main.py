@@ -8,9 +8,12 @@ import questionary
 from agents.portfolio_manager import portfolio_management_agent
 from agents.risk_manager import risk_management_agent
 from graph.state import AgentState
-from utils.display import print_trading_output
-from utils.analysts import ANALYST_ORDER, get_analyst_nodes
+from utils.display import print_data_metrics, print_trading_output
+from utils.analysts import ANALYST_ORDER, get_analyst_nodes, get_data_requirements
 from utils.progress import progress
+from tools.cassette import configure_cassette
+from tools.metrics import dump_metrics
+from tools.prefetch import plan_prefetch, prefetch
 from llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
 from utils.ollama import ensure_ollama_and_model
 
@@ -93,6 +96,8 @@ def run_hedge_fund(
     finally:
         # Stop progress tracking
         progress.stop()
+        # Write the data fetch metrics to FINANCIAL_DATA_METRICS_PATH, if set
+        dump_metrics()
 
 
 def start(state: AgentState):
@@ -158,12 +163,20 @@ if __name__ == "__main__":
     parser.add_argument(
         "--show-agent-graph", action="store_true", help="Show the agent graph"
     )
+    parser.add_argument("--show-metrics", action="store_true", help="Show cache hit rates and API latency per data fetcher")
     parser.add_argument(
         "--ollama", action="store_true", help="Use Ollama for local LLM inference"
     )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", type=str, metavar="CASSETTE", help="Record API and LLM calls to a cassette file")
+    cassette_group.add_argument("--replay", type=str, metavar="CASSETTE", help="Replay API and LLM calls from a cassette file, without network access")
 
     args = parser.parse_args()
 
+    # Record or replay API and LLM calls (overrides CASSETTE_MODE / CASSETTE_PATH)
+    if args.record or args.replay:
+        configure_cassette("replay" if args.replay else "record", args.replay or args.record)
+
     # Parse tickers from comma-separated string
     tickers = [ticker.strip() for ticker in args.tickers.split(",")]
 
@@ -303,6 +316,11 @@ if __name__ == "__main__":
         }
     }
 
+    # Fetch everything the selected analysts need in one bulk pass, so the graph runs on cache hits
+    errors = prefetch(tickers, plan_prefetch(get_data_requirements(selected_analysts), start_date, end_date))
+    for error in errors:
+        print(f"Warning: pre-fetch failed, data will be fetched on demand: {error}")
+
     # Run the hedge fund
     result = run_hedge_fund(
         tickers=tickers,
@@ -315,3 +333,5 @@ if __name__ == "__main__":
         model_provider=model_provider,
     )
     print_trading_output(result)
+    if args.show_metrics:
+        print_data_metrics(dump_metrics())
@@ -1,9 +1,16 @@
 import datetime
-import os
+from contextlib import ExitStack, contextmanager
+from typing import Callable, TypeVar
+
+import numpy as np
 import pandas as pd
 import requests
+from pydantic import BaseModel
 
-from data.cache import get_cache
+from data.cache import COMPANY_NEWS_KEY, INSIDER_TRADE_KEY, get_cache
+from data.coverage import EARLIEST_DATE, shift_date
+from data.insider import InsiderRollup
+from data.prices import PriceColumns
 from data.models import (
     CompanyNews,
     CompanyNewsResponse,
@@ -13,46 +20,105 @@ from data.models import (
     PriceResponse,
     LineItem,
     LineItemResponse,
+    InsiderActivity,
     InsiderTrade,
     InsiderTradeResponse,
     CompanyFactsResponse,
 )
+from tools.http_client import get_client
+from tools.metrics import instrumented, mark_partial
+from tools.pagination import fetch_windows, window_days_from_env
+from tools.single_flight import single_flight
 
 # Global cache instance
 _cache = get_cache()
 
+# Public fetchers are wrapped in @single_flight: agents running in parallel often ask for the same
+# (endpoint, ticker, params) at once, and then only the first caller fetches while the others wait for its result.
+# They are also @instrumented, recording cache hits, misses and latency per fetcher (see tools/metrics.py).
+# Calls with different arguments can still overlap (e.g. two date ranges for one ticker), so each fetcher holds
+# the cache lock for its ticker from checking the cache to storing what it fetched: the second caller then finds
+# the first one's rows in the cache instead of fetching them again, while other tickers proceed in parallel.
+
 
+@instrumented
 def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
     """Fetch price data from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_prices(ticker):
-        # Filter cached data by date range and convert to Price objects
-        filtered_data = [Price(**price) for price in cached_data if start_date <= price["time"] <= end_date]
-        if filtered_data:
-            return filtered_data
-
-    # If not in cache or no data in range, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    url = f"https://api.financialdatasets.ai/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-
-    # Parse response with Pydantic model
-    price_response = PriceResponse(**response.json())
-    prices = price_response.prices
-
-    if not prices:
+    columns = _ensure_prices(ticker, start_date, end_date)
+    if columns is None:
         return []
-
-    # Cache the results as dicts
-    _cache.set_prices(ticker, [p.model_dump() for p in prices])
-    return prices
-
-
+    _cache.build_prices(ticker, columns, models=True)
+    return columns.to_prices(*columns.bounds(start_date, end_date))
+
+
+@instrumented
+def get_price_arrays(ticker: str, start_date: str, end_date: str) -> dict[str, np.ndarray]:
+    """Fetch prices as NumPy column views (days, open, close, high, low, volume, time), skipping Price objects."""
+    columns = _ensure_prices(ticker, start_date, end_date)
+    if columns is None:
+        columns = PriceColumns.from_rows([])
+    return columns.arrays(start_date, end_date)
+
+
+@single_flight
+def _ensure_prices(ticker: str, start_date: str, end_date: str) -> PriceColumns | None:
+    """Make sure every price between start_date and end_date is cached, and return the ticker's columns."""
+    with _cache.lock("prices", ticker):
+        # Fetch only the date windows that have not been fetched before
+        gaps = _cache.get_coverage("prices", ticker).gaps(start_date, end_date)
+        if gaps != [(start_date[:10], end_date[:10])]:
+            mark_partial()
+        # The fetched windows are covered together, so archived prices are rewritten once per call rather than per gap
+        fetched = []
+        try:
+            for gap_start, gap_end in gaps:
+                _raise_known_failure("prices", ticker, gap_start, gap_end)
+                params = {"ticker": ticker, "interval": "day", "interval_multiplier": 1, "start_date": gap_start, "end_date": gap_end}
+                with _remember_failure("prices", ticker, gap_start, gap_end):
+                    response = get_client().get("/prices/", params=params)
+                    if response.status_code != 200:
+                        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+                # Parse response with Pydantic model
+                price_response = _parse_response(response, PriceResponse)
+                prices = price_response.prices
+
+                # Cache the results
+                if prices:
+                    _cache.set_prices(ticker, prices)
+                fetched.append((gap_start, gap_end))
+        finally:
+            _cache.add_coverage_windows("prices", ticker, fetched)
+
+        return _cache.get_prices(ticker)
+
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+def _parse_response(response: requests.Response, model: type[ResponseModel]) -> ResponseModel:
+    """Validate a JSON response straight from its raw bytes, without building the intermediate dicts of response.json()."""
+    return model.model_validate_json(response.content)
+
+
+def _raise_known_failure(namespace: str, key: str, start_date: str, end_date: str):
+    """Re-raise the error of a recently failed lookup whose window contains the query window, without asking upstream."""
+    if (entry := _cache.get_negative(namespace, key, start_date, end_date)) is not None:
+        raise Exception(entry.error)
+
+
+@contextmanager
+def _remember_failure(namespace: str, key: str, start_date: str, end_date: str):
+    """Remember a failed lookup for a short while, so repeated calls for the same window fail fast."""
+    try:
+        yield
+    except Exception as e:
+        _cache.set_negative(namespace, key, start_date, end_date, error=str(e))
+        raise
+
+
+@instrumented
+@single_flight
 def get_financial_metrics(
     ticker: str,
     end_date: str,
@@ -60,37 +126,38 @@ def get_financial_metrics(
     limit: int = 10,
 ) -> list[FinancialMetrics]:
     """Fetch financial metrics from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_financial_metrics(ticker):
-        # Filter cached data by date and limit
-        filtered_data = [FinancialMetrics(**metric) for metric in cached_data if metric["report_period"] <= end_date]
-        filtered_data.sort(key=lambda x: x.report_period, reverse=True)
-        if filtered_data:
-            return filtered_data[:limit]
-
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+    with _cache.lock("financial_metrics", f"{ticker}:{period}"):
+        series = _cache.get_financial_metrics(ticker, period)
 
-    # Parse response with Pydantic model
-    metrics_response = FinancialMetricsResponse(**response.json())
-    # Return the FinancialMetrics objects directly instead of converting to dict
-    financial_metrics = metrics_response.financial_metrics
+        # Fetch only the report periods the cache cannot answer as of end_date
+        if fetch := series.plan(end_date, limit):
+            _raise_known_failure("financial_metrics", f"{ticker}:{period}", EARLIEST_DATE, fetch[0])
+            fetch_end_date, fetch_limit = fetch
+            if fetch != (end_date, limit):
+                mark_partial()
+            params = {"ticker": ticker, "report_period_lte": fetch_end_date, "limit": fetch_limit, "period": period}
+            with _remember_failure("financial_metrics", f"{ticker}:{period}", EARLIEST_DATE, fetch_end_date):
+                response = get_client().get("/financial-metrics/", params=params)
+                if response.status_code != 200:
+                    raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+            # Parse response with Pydantic model
+            metrics_response = _parse_response(response, FinancialMetricsResponse)
+            financial_metrics = metrics_response.financial_metrics
+
+            # Cache the results; an empty response proves there is no history up to fetch_end_date
+            _cache.set_financial_metrics(ticker, period, financial_metrics, fetch_end_date, exhausted=len(financial_metrics) < fetch_limit)
+
+        # Rows were validated at ingest, so each instance is built once without re-validation and then shared
+        return [series.instance(report_period, FinancialMetrics, _build_financial_metrics) for report_period in series.periods_as_of(end_date, limit)]
 
-    if not financial_metrics:
-        return []
 
-    # Cache the results as dicts
-    _cache.set_financial_metrics(ticker, [m.model_dump() for m in financial_metrics])
-    return financial_metrics
+def _build_financial_metrics(row: dict[str, any]) -> FinancialMetrics:
+    return FinancialMetrics.model_construct(**row)
 
 
+@instrumented
+@single_flight
 def search_line_items(
     ticker: str,
     line_items: list[str],
@@ -98,34 +165,116 @@ def search_line_items(
     period: str = "ttm",
     limit: int = 10,
 ) -> list[LineItem]:
-    """Fetch line items from API."""
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
-
+    """Fetch line items from cache or API."""
+    with _cache.lock("line_items", f"{ticker}:{period}"):
+        series = _cache.get_line_items(ticker, period)
+
+        # Fetch only the report periods the cache cannot answer as of end_date
+        if fetch := series.plan(end_date, limit):
+            _raise_known_failure("line_items", f"{ticker}:{period}", EARLIEST_DATE, fetch[0])
+            fetch_end_date, fetch_limit = fetch
+            if fetch != (end_date, limit):
+                mark_partial()
+            with _remember_failure("line_items", f"{ticker}:{period}", EARLIEST_DATE, fetch_end_date):
+                search_results = _fetch_line_items([ticker], line_items, fetch_end_date, period, fetch_limit)
+            _cache.set_line_items(ticker, period, search_results, line_items, fetch_end_date, exhausted=len(search_results) < fetch_limit)
+
+        report_periods = series.periods_as_of(end_date, limit)
+        if not report_periods:
+            return []
+
+        # Fetch only the line items that were never requested for these report periods
+        if missing := series.missing_fields(report_periods, line_items):
+            _raise_known_failure("line_items", f"{ticker}:{period}", EARLIEST_DATE, report_periods[0])
+            mark_partial()
+            with _remember_failure("line_items", f"{ticker}:{period}", EARLIEST_DATE, report_periods[0]):
+                search_results = _fetch_line_items([ticker], missing, report_periods[0], period, len(report_periods))
+            _cache.set_line_items(ticker, period, search_results, missing, report_periods[0], exhausted=len(search_results) < len(report_periods))
+
+        fields = tuple(line_items)
+        return [series.instance(report_period, fields, lambda row: _line_item_from_row(row, fields)) for report_period in report_periods]
+
+
+@instrumented
+@single_flight
+def search_line_items_batch(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+    batch_size: int = 25,
+) -> dict[str, list[LineItem]]:
+    """Fetch line items for many tickers with one request per batch_size tickers, split back per ticker."""
+    # Tickers the cache cannot fully answer are fetched together, then every ticker is served from the cache
+    with ExitStack() as stack:
+        # Lock every ticker, always in sorted order so two overlapping batches cannot deadlock
+        for ticker in sorted(set(tickers)):
+            stack.enter_context(_cache.lock("line_items", f"{ticker}:{period}"))
+        pending = []
+        for ticker in tickers:
+            series = _cache.get_line_items(ticker, period)
+            if _cache.get_negative("line_items", f"{ticker}:{period}", EARLIEST_DATE, end_date):
+                # A recent failure for one ticker is raised again by its own search_line_items below, not for the whole batch
+                continue
+            if series.plan(end_date, limit) or series.missing_fields(series.periods_as_of(end_date, limit), line_items):
+                pending.append(ticker)
+        if pending and len(pending) < len(tickers):
+            mark_partial()
+
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i : i + batch_size]
+            # The endpoint's limit is not guaranteed to apply per ticker, so size it for the whole batch
+            batch_limit = limit * len(batch)
+            try:
+                search_results = _fetch_line_items(batch, line_items, end_date, period, batch_limit)
+            except Exception as e:
+                # The remaining batches are still fetched; each ticker of this one raises the error from search_line_items below
+                for ticker in batch:
+                    _cache.set_negative("line_items", f"{ticker}:{period}", EARLIEST_DATE, end_date, error=str(e))
+                continue
+            items_by_ticker = {ticker: [] for ticker in batch}
+            for item in search_results:
+                if item.ticker in items_by_ticker:
+                    items_by_ticker[item.ticker].append(item)
+            # A ticker's history is exhausted only when it got fewer than its own limit in a response the batch limit did not cut short
+            truncated = len(search_results) >= batch_limit
+            for ticker, items in items_by_ticker.items():
+                _cache.set_line_items(ticker, period, items, line_items, end_date, exhausted=not truncated and len(items) < limit)
+
+    return {ticker: search_line_items(ticker, line_items, end_date, period=period, limit=limit) for ticker in tickers}
+
+
+def _line_item_from_row(row: dict[str, any], line_items: tuple[str, ...]) -> LineItem:
+    """Build a LineItem holding only the requested line items, as the API would return it."""
+    values = {field: row[field] for field in line_items if field in row}
+    return LineItem.model_construct(ticker=row["ticker"], report_period=row["report_period"], period=row["period"], currency=row["currency"], **values)
+
+
+def _fetch_line_items(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str,
+    limit: int,
+) -> list[LineItem]:
+    """POST a line item search for one or more tickers."""
     body = {
-        "tickers": [ticker],
+        "tickers": tickers,
         "line_items": line_items,
         "end_date": end_date,
         "period": period,
         "limit": limit,
     }
-    response = requests.post(url, headers=headers, json=body)
+    response = get_client().post("/financials/search/line-items", json=body)
     if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-    data = response.json()
-    response_model = LineItemResponse(**data)
-    search_results = response_model.search_results
-    if not search_results:
-        return []
-
-    # Cache the results
-    return search_results[:limit]
+        raise Exception(f"Error fetching data: {', '.join(tickers)} - {response.status_code} - {response.text}")
+    response_model = _parse_response(response, LineItemResponse)
+    return response_model.search_results
 
 
+@instrumented
+@single_flight
 def get_insider_trades(
     ticker: str,
     end_date: str,
@@ -133,62 +282,70 @@ def get_insider_trades(
     limit: int = 1000,
 ) -> list[InsiderTrade]:
     """Fetch insider trades from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_insider_trades(ticker):
-        # Filter cached data by date range
-        filtered_data = [InsiderTrade(**trade) for trade in cached_data 
-                        if (start_date is None or (trade.get("transaction_date") or trade["filing_date"]) >= start_date)
-                        and (trade.get("transaction_date") or trade["filing_date"]) <= end_date]
-        filtered_data.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
-        if filtered_data:
-            return filtered_data
-
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    trades = _get_dated_rows("insider_trades", ticker, "filing_date", end_date, start_date, limit, _fetch_insider_trades, _fetch_insider_trades_page)
+    filtered_data = list(trades)
+    filtered_data.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
+    return filtered_data
+
+
+@instrumented
+@single_flight
+def get_insider_activity(ticker: str, start_date: str, end_date: str) -> InsiderActivity:
+    """Count insider buys and sells, and sum net shares and net value, for trades filed between start_date and end_date."""
+    with _cache.lock("insider_trades", ticker):
+        _fill_dated_gaps("insider_trades", ticker, start_date, end_date, 1000, _fetch_insider_trades)
+        # Answered from the ticker's daily rollups in two lookups, without scanning the trades
+        rollup = _cache.get_insider_rollup(ticker) or InsiderRollup([])
+    return InsiderActivity(ticker=ticker, start_date=start_date, end_date=end_date, **rollup.window(start_date, end_date))
+
+
+def _fetch_insider_trades(ticker: str, start_date: str | None, end_date: str, limit: int) -> list[InsiderTrade]:
+    """Fetch insider trades filed between start_date and end_date, paginating backwards from end_date."""
+    if start_date and (window_days := window_days_from_env()):
+        return fetch_windows(lambda window_start, window_end: _fetch_insider_trades_page(ticker, window_start, window_end, limit), "filing_date", INSIDER_TRADE_KEY, start_date, end_date, limit, window_days)
 
     all_trades = []
     current_end_date = end_date
-    
+
     while True:
-        url = f"https://api.financialdatasets.ai/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
-        if start_date:
-            url += f"&filing_date_gte={start_date}"
-        url += f"&limit={limit}"
-        
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-        
-        data = response.json()
-        response_model = InsiderTradeResponse(**data)
-        insider_trades = response_model.insider_trades
-        
+        insider_trades = _fetch_insider_trades_page(ticker, start_date, current_end_date, limit)
+
         if not insider_trades:
             break
-            
+
         all_trades.extend(insider_trades)
-        
+
         # Only continue pagination if we have a start_date and got a full page
         if not start_date or len(insider_trades) < limit:
             break
-            
+
         # Update end_date to the oldest filing date from current batch for next iteration
-        current_end_date = min(trade.filing_date for trade in insider_trades).split('T')[0]
-        
+        current_end_date = min(trade.filing_date for trade in insider_trades).split("T")[0]
+
         # If we've reached or passed the start_date, we can stop
         if current_end_date <= start_date:
             break
 
-    if not all_trades:
-        return []
-
-    # Cache the results
-    _cache.set_insider_trades(ticker, [trade.model_dump() for trade in all_trades])
     return all_trades
 
 
+def _fetch_insider_trades_page(ticker: str, start_date: str | None, end_date: str, limit: int) -> list[InsiderTrade]:
+    """Fetch one page of insider trades: the newest `limit` filed between start_date and end_date."""
+    params = {"ticker": ticker, "filing_date_lte": end_date}
+    if start_date:
+        params["filing_date_gte"] = start_date
+    params["limit"] = limit
+
+    response = get_client().get("/insider-trades/", params=params)
+    if response.status_code != 200:
+        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+    response_model = _parse_response(response, InsiderTradeResponse)
+    return response_model.insider_trades
+
+
+@instrumented
+@single_flight
 def get_company_news(
     ticker: str,
     end_date: str,
@@ -196,62 +353,171 @@ def get_company_news(
     limit: int = 1000,
 ) -> list[CompanyNews]:
     """Fetch company news from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_company_news(ticker):
-        # Filter cached data by date range
-        filtered_data = [CompanyNews(**news) for news in cached_data 
-                        if (start_date is None or news["date"] >= start_date)
-                        and news["date"] <= end_date]
-        filtered_data.sort(key=lambda x: x.date, reverse=True)
-        if filtered_data:
-            return filtered_data
-
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    news_items = _get_dated_rows("company_news", ticker, "date", end_date, start_date, limit, _fetch_company_news, _fetch_company_news_page)
+    filtered_data = list(news_items)
+    filtered_data.sort(key=lambda x: x.date, reverse=True)
+    return filtered_data
+
+
+def _fetch_company_news(ticker: str, start_date: str | None, end_date: str, limit: int) -> list[CompanyNews]:
+    """Fetch company news published between start_date and end_date, paginating backwards from end_date."""
+    if start_date and (window_days := window_days_from_env()):
+        return fetch_windows(lambda window_start, window_end: _fetch_company_news_page(ticker, window_start, window_end, limit), "date", COMPANY_NEWS_KEY, start_date, end_date, limit, window_days)
 
     all_news = []
     current_end_date = end_date
-    
+
     while True:
-        url = f"https://api.financialdatasets.ai/news/?ticker={ticker}&end_date={current_end_date}"
-        if start_date:
-            url += f"&start_date={start_date}"
-        url += f"&limit={limit}"
-        
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-        
-        data = response.json()
-        response_model = CompanyNewsResponse(**data)
-        company_news = response_model.news
-        
+        company_news = _fetch_company_news_page(ticker, start_date, current_end_date, limit)
+
         if not company_news:
             break
-            
+
         all_news.extend(company_news)
-        
+
         # Only continue pagination if we have a start_date and got a full page
         if not start_date or len(company_news) < limit:
             break
-            
+
         # Update end_date to the oldest date from current batch for next iteration
-        current_end_date = min(news.date for news in company_news).split('T')[0]
-        
+        current_end_date = min(news.date for news in company_news).split("T")[0]
+
         # If we've reached or passed the start_date, we can stop
         if current_end_date <= start_date:
             break
 
-    if not all_news:
-        return []
-
-    # Cache the results
-    _cache.set_company_news(ticker, [news.model_dump() for news in all_news])
     return all_news
 
 
+def _fetch_company_news_page(ticker: str, start_date: str | None, end_date: str, limit: int) -> list[CompanyNews]:
+    """Fetch one page of company news: the newest `limit` articles published between start_date and end_date."""
+    params = {"ticker": ticker, "end_date": end_date}
+    if start_date:
+        params["start_date"] = start_date
+    params["limit"] = limit
+
+    response = get_client().get("/news/", params=params)
+    if response.status_code != 200:
+        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+    response_model = _parse_response(response, CompanyNewsResponse)
+    return response_model.news
+
+
+def _get_dated_rows(
+    namespace: str,
+    ticker: str,
+    date_field: str,
+    end_date: str,
+    start_date: str | None,
+    limit: int,
+    fetch: Callable[[str, str | None, str, int], list[BaseModel]],
+    fetch_page: Callable[[str, str | None, str, int], list[BaseModel]],
+) -> list[BaseModel]:
+    """
+    Serve a date-ranged endpoint (insider trades, company news) from the cache, fetching only uncovered windows.
+
+    With a start_date every row in [start_date, end_date] is returned. Without one, the API returns the
+    newest `limit` rows on or before end_date, so the cache answers when the covered window ending at
+    end_date, plus the rows cached on the day before it, already holds that many rows (or reaches back
+    to the start of history). When the newest covered window ends before end_date, only the rows newer
+    than it are fetched first.
+    """
+    with _cache.lock(namespace, ticker):
+        coverage = _cache.get_coverage(namespace, ticker)
+
+        if start_date:
+            _fill_dated_gaps(namespace, ticker, start_date, end_date, limit, fetch)
+            cached_data = _get_cached_dated_rows(namespace, ticker)
+            return [row for row in cached_data if start_date <= getattr(row, date_field)[:10] <= end_date]
+
+        window = coverage.containing(end_date)
+        if window is None and (previous := coverage.preceding(end_date)):
+            window = _fetch_newer_dated_rows(namespace, ticker, date_field, previous, end_date, limit, fetch_page)
+        cached_data = _get_cached_dated_rows(namespace, ticker)
+        in_window = [row for row in cached_data if window and window[0] <= getattr(row, date_field)[:10] <= end_date]
+        if window and window[0] != EARLIEST_DATE and len(in_window) < limit:
+            # A full page's oldest day is left out of its window, but the rows it returned on that day are still the newest
+            boundary = shift_date(window[0], -1)
+            in_window += [row for row in cached_data if getattr(row, date_field)[:10] == boundary]
+        if len(in_window) < limit and not (window and window[0] == EARLIEST_DATE):
+            _raise_known_failure(namespace, ticker, EARLIEST_DATE, end_date)
+            if in_window:
+                mark_partial()
+            with _remember_failure(namespace, ticker, EARLIEST_DATE, end_date):
+                rows = fetch(ticker, None, end_date, limit)
+            if rows:
+                _set_dated_rows(namespace, ticker, rows)
+            # A full page may stop part way through its oldest day, so that day is not marked as covered
+            covered_start = shift_date(min(getattr(row, date_field) for row in rows), 1) if len(rows) >= limit else EARLIEST_DATE
+            _cache.add_coverage(namespace, ticker, covered_start, end_date)
+            cached_data = _get_cached_dated_rows(namespace, ticker)
+            in_window = [row for row in cached_data if getattr(row, date_field)[:10] <= end_date]
+        in_window.sort(key=lambda row: getattr(row, date_field), reverse=True)
+        return in_window[:limit]
+
+
+def _fill_dated_gaps(
+    namespace: str,
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    limit: int,
+    fetch: Callable[[str, str | None, str, int], list[BaseModel]],
+):
+    """Fetch the parts of [start_date, end_date] that are not covered yet, so every row in it is cached."""
+    with _cache.lock(namespace, ticker):
+        gaps = _cache.get_coverage(namespace, ticker).gaps(start_date, end_date)
+        if gaps != [(start_date[:10], end_date[:10])]:
+            mark_partial()
+        for gap_start, gap_end in gaps:
+            _raise_known_failure(namespace, ticker, gap_start, gap_end)
+            with _remember_failure(namespace, ticker, gap_start, gap_end):
+                rows = fetch(ticker, gap_start, gap_end, limit)
+            if rows:
+                _set_dated_rows(namespace, ticker, rows)
+            _cache.add_coverage(namespace, ticker, gap_start, gap_end)
+
+
+def _fetch_newer_dated_rows(
+    namespace: str,
+    ticker: str,
+    date_field: str,
+    previous: tuple[str, str],
+    end_date: str,
+    limit: int,
+    fetch_page: Callable[[str, str | None, str, int], list[BaseModel]],
+) -> tuple[str, str]:
+    """Fetch one page of the rows between a covered window and end_date, and return the covered window that now ends at end_date."""
+    gap_start = shift_date(previous[1], 1)
+    _raise_known_failure(namespace, ticker, gap_start, end_date)
+    mark_partial()
+    with _remember_failure(namespace, ticker, gap_start, end_date):
+        rows = fetch_page(ticker, gap_start, end_date, limit)
+    if rows:
+        _set_dated_rows(namespace, ticker, rows)
+    # A full page already holds the newest `limit` rows, but its oldest day may be incomplete, so the window
+    # starts the day after it and stays apart from previous until the days in between are fetched
+    covered_start = shift_date(min(getattr(row, date_field) for row in rows), 1) if len(rows) >= limit else gap_start
+    _cache.add_coverage(namespace, ticker, covered_start, end_date)
+    return _cache.get_coverage(namespace, ticker).containing(end_date) or (covered_start, end_date)
+
+
+def _get_cached_dated_rows(namespace: str, ticker: str) -> list[BaseModel]:
+    if namespace == "insider_trades":
+        return _cache.get_insider_trades(ticker) or []
+    return _cache.get_company_news(ticker) or []
+
+
+def _set_dated_rows(namespace: str, ticker: str, rows: list[BaseModel]):
+    if namespace == "insider_trades":
+        _cache.set_insider_trades(ticker, rows)
+    else:
+        _cache.set_company_news(ticker, rows)
+
+
+@instrumented
+@single_flight
 def get_market_cap(
     ticker: str,
     end_date: str,
@@ -260,18 +526,12 @@ def get_market_cap(
     # Check if end_date is today
     if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
         # Get the market cap from company facts API
-        headers = {}
-        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-            headers["X-API-KEY"] = api_key
-            
-        url = f"https://api.financialdatasets.ai/company/facts/?ticker={ticker}"
-        response = requests.get(url, headers=headers)
+        response = get_client().get("/company/facts/", params={"ticker": ticker})
         if response.status_code != 200:
             print(f"Error fetching company facts: {ticker} - {response.status_code}")
             return None
             
-        data = response.json()
-        response_model = CompanyFactsResponse(**data)
+        response_model = _parse_response(response, CompanyFactsResponse)
         return response_model.company_facts.market_cap
 
     financial_metrics = get_financial_metrics(ticker, end_date)
@@ -298,7 +558,11 @@ def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     return df
 
 
-# Update the get_price_data function to use the new functions
+@instrumented
 def get_price_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    prices = get_prices(ticker, start_date, end_date)
-    return prices_to_df(prices)
+    """Fetch prices as a DataFrame (like prices_to_df), sliced from the ticker's cached DataFrame."""
+    columns = _ensure_prices(ticker, start_date, end_date)
+    if columns is None or not len(columns):
+        return pd.DataFrame()
+    _cache.build_prices(ticker, columns, frame=True)
+    return columns.to_frame(start_date, end_date)
@@ -0,0 +1,99 @@
+"""Asyncio variants of the tools.api fetchers, plus bulk helpers for fetching many tickers concurrently.
+
+The coroutines run the synchronous fetchers in worker threads, so they share the
+pooled HTTP client, retry policy and cache with the rest of the code base.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable
+
+from tools import api
+
+DEFAULT_CONCURRENCY = 8
+
+
+def _default_concurrency() -> int:
+    return int(os.environ.get("FINANCIAL_DATASETS_MAX_CONCURRENCY", DEFAULT_CONCURRENCY))
+
+
+async def _run(func: Callable, *args, semaphore: asyncio.Semaphore | None = None, **kwargs) -> Any:
+    """Run a blocking fetcher in a worker thread, optionally bounded by a semaphore."""
+    if semaphore is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    async with semaphore:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def get_prices_async(ticker: str, start_date: str, end_date: str, semaphore: asyncio.Semaphore | None = None):
+    return await _run(api.get_prices, ticker, start_date, end_date, semaphore=semaphore)
+
+
+async def get_financial_metrics_async(ticker: str, end_date: str, period: str = "ttm", limit: int = 10, semaphore: asyncio.Semaphore | None = None):
+    return await _run(api.get_financial_metrics, ticker, end_date, period=period, limit=limit, semaphore=semaphore)
+
+
+async def search_line_items_async(ticker: str, line_items: list[str], end_date: str, period: str = "ttm", limit: int = 10, semaphore: asyncio.Semaphore | None = None):
+    return await _run(api.search_line_items, ticker, line_items, end_date, period=period, limit=limit, semaphore=semaphore)
+
+
+async def get_insider_trades_async(ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000, semaphore: asyncio.Semaphore | None = None):
+    return await _run(api.get_insider_trades, ticker, end_date, start_date=start_date, limit=limit, semaphore=semaphore)
+
+
+async def get_company_news_async(ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000, semaphore: asyncio.Semaphore | None = None):
+    return await _run(api.get_company_news, ticker, end_date, start_date=start_date, limit=limit, semaphore=semaphore)
+
+
+async def get_market_cap_async(ticker: str, end_date: str, semaphore: asyncio.Semaphore | None = None):
+    return await _run(api.get_market_cap, ticker, end_date, semaphore=semaphore)
+
+
+async def gather_tickers(
+    fetcher: Callable[..., Awaitable[Any]],
+    tickers: list[str],
+    *args,
+    concurrency: int | None = None,
+    return_exceptions: bool = False,
+    **kwargs,
+) -> dict[str, Any]:
+    """
+    Run an async fetcher for every ticker concurrently, with at most `concurrency` requests in flight.
+
+    Example:
+        prices = await gather_tickers(get_prices_async, ["AAPL", "MSFT"], "2024-01-01", "2024-03-01")
+
+    Returns a ticker -> result mapping. With return_exceptions=True, failed tickers map to their exception
+    instead of aborting the whole batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency or _default_concurrency())
+    results = await asyncio.gather(
+        *(fetcher(ticker, *args, semaphore=semaphore, **kwargs) for ticker in tickers),
+        return_exceptions=return_exceptions,
+    )
+    return dict(zip(tickers, results))
+
+
+async def gather_calls(
+    calls: list[tuple[Callable, tuple, dict]],
+    concurrency: int | None = None,
+    return_exceptions: bool = False,
+) -> list[Any]:
+    """Run blocking fetcher calls, given as (func, args, kwargs), concurrently with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency or _default_concurrency())
+    return await asyncio.gather(
+        *(_run(func, *args, semaphore=semaphore, **kwargs) for func, args, kwargs in calls),
+        return_exceptions=return_exceptions,
+    )
+
+
+def fetch_many(
+    fetcher: Callable[..., Awaitable[Any]],
+    tickers: list[str],
+    *args,
+    concurrency: int | None = None,
+    return_exceptions: bool = False,
+    **kwargs,
+) -> dict[str, Any]:
+    """Synchronous entry point for gather_tickers. Must not be called from inside a running event loop."""
+    return asyncio.run(gather_tickers(fetcher, tickers, *args, concurrency=concurrency, return_exceptions=return_exceptions, **kwargs))
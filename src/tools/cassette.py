@@ -0,0 +1,277 @@
+"""Record and replay API and LLM calls, for deterministic offline runs.
+
+In record mode every Financial Datasets response and LLM result is written to a cassette (a SQLite
+file). In replay mode they are served from the cassette and nothing goes over the network; a call
+that was never recorded raises instead of falling through to the live service.
+
+Which data requests are made depends on what is cached at the time, so it varies with the order in
+which parallel agents run. A replayed request for prices, metrics, line items, insider trades or news
+that was not recorded as such is answered from the recorded responses for the same ticker, as long as
+their date windows cover it.
+
+Select a mode with CASSETTE_MODE=record|replay and CASSETTE_PATH, or with --record/--replay PATH.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from data.coverage import EARLIEST_DATE, DateIntervalSet, shift_date
+
+DEFAULT_CASSETTE_PATH = "cassettes/cassette.db"
+CASSETTE_MODES = ("record", "replay")
+
+# Date-ranged endpoints: response list field, row date field, and the params bounding the date window
+DATED_ENDPOINTS = {
+    "/prices/": ("prices", "time", "start_date", "end_date"),
+    "/financial-metrics/": ("financial_metrics", "report_period", None, "report_period_lte"),
+    "/financials/search/line-items": ("search_results", "report_period", None, "end_date"),
+    "/insider-trades/": ("insider_trades", "filing_date", "filing_date_gte", "filing_date_lte"),
+    "/news/": ("news", "date", "start_date", "end_date"),
+}
+
+# Params that select rows within a series rather than the series itself
+_ROW_PARAMS = ("ticker", "tickers", "line_items", "limit")
+
+# Fields every line item row carries besides the requested line items
+_LINE_ITEM_FIELDS = ("ticker", "report_period", "period", "currency")
+
+
+def _series_key(path: str, query: dict) -> tuple:
+    """The params of a date-ranged query that select its series, leaving out the date window and the rows."""
+    _, _, start_param, end_param = DATED_ENDPOINTS[path]
+    return tuple(sorted((name, json.dumps(value, sort_keys=True)) for name, value in query.items() if name not in (start_param, end_param, *_ROW_PARAMS)))
+
+
+class _RecordedSeries:
+    """One ticker's rows of one series, merged from every recording of it, with the date windows they cover."""
+
+    def __init__(self, date_field: str):
+        self.date_field = date_field
+        self.covered = DateIntervalSet()
+        self.rows: dict[str, dict] = {}
+        # Line items each row was requested with, as several searches may each have asked for some of them
+        self.requested: dict[str, set[str]] = {}
+        self.body: dict = {}
+        self.dates: list[str] = []
+        self.keys: list[str] = []
+
+    def add(self, start: str, end: str, rows: list[dict], line_items: list[str] | None, body: dict):
+        self.covered.add(start, end)
+        for row in rows:
+            key = row["report_period"] if line_items is not None else json.dumps(row, sort_keys=True)
+            self.rows.setdefault(key, {}).update(row)
+            self.requested.setdefault(key, set()).update(line_items or ())
+        self.body = body
+
+    def sort(self):
+        """Order the rows by date, so a window's rows are found by binary search."""
+        # Newest first endpoints read the keys backwards, so rows on the same date keep their recorded order either way
+        keys = self.rows if self.date_field == "time" else reversed(list(self.rows))
+        self.keys = sorted(keys, key=lambda key: self.rows[key][self.date_field])
+        self.dates = [self.rows[key][self.date_field][:10] for key in self.keys]
+
+    def between(self, start: str, end: str) -> list[str]:
+        """Keys of the rows dated from start to end (inclusive), oldest first."""
+        return self.keys[bisect.bisect_left(self.dates, start) : bisect.bisect_right(self.dates, end)]
+
+
+class Cassette:
+    """Recorded calls keyed by a hash of the request, so replay is one indexed lookup per call."""
+
+    def __init__(self, path: str, mode: str):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == "replay" and not os.path.exists(path):
+            raise FileNotFoundError(f"Cassette not found: {path}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS interactions (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                request TEXT NOT NULL,
+                response TEXT NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        # Successful recordings of the date-ranged endpoints per (path, ticker, series), indexed on the first replay that needs them
+        self._dated: dict[tuple[str, str, tuple], _RecordedSeries] | None = None
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def _key(kind: str, request: dict) -> tuple[str, str]:
+        canonical = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(f"{kind}\n{canonical}".encode()).hexdigest(), canonical
+
+    def record(self, kind: str, request: dict, response: str):
+        """Store the response to a request, replacing any earlier recording of the same request."""
+        key, canonical = self._key(kind, request)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?, ?)", (key, kind, canonical, response, time.time()))
+            self._conn.commit()
+
+    def _lookup(self, kind: str, request: dict) -> tuple[str | None, str]:
+        key, canonical = self._key(kind, request)
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM interactions WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None, canonical
+
+    def replay(self, kind: str, request: dict) -> str:
+        """Get the recorded response to a request. Raises if it was never recorded."""
+        response, canonical = self._lookup(kind, request)
+        if response is None:
+            raise Exception(f"No recorded {kind} response in cassette {self.path} for request: {canonical}")
+        return response
+
+    def record_response(self, request: dict, response: requests.Response):
+        """Record an HTTP response to a Financial Datasets request."""
+        payload = {"status_code": response.status_code, "headers": {"Content-Type": response.headers.get("Content-Type", "application/json")}, "body": response.text}
+        self.record("http", request, json.dumps(payload))
+
+    def replay_response(self, request: dict) -> requests.Response:
+        """Rebuild the recorded HTTP response to a Financial Datasets request, or answer it from other recordings."""
+        recorded, canonical = self._lookup("http", request)
+        if recorded is not None:
+            payload = json.loads(recorded)
+        elif (body := self._answer_from_recordings(request)) is not None:
+            payload = {"status_code": 200, "headers": {"Content-Type": "application/json"}, "body": json.dumps(body)}
+        else:
+            raise Exception(f"No recorded http response in cassette {self.path} for request: {canonical}")
+        response = requests.Response()
+        response.status_code = payload["status_code"]
+        response.headers = CaseInsensitiveDict(payload["headers"])
+        response._content = payload["body"].encode()
+        response.encoding = "utf-8"
+        return response
+
+    def _dated_series(self, path: str, ticker: str, query: dict) -> _RecordedSeries | None:
+        """The recorded rows and covered windows of a ticker's series, indexing every recording on first use."""
+        with self._lock:
+            if self._dated is None:
+                self._dated = {}
+                for request, response in self._conn.execute("SELECT request, response FROM interactions WHERE kind = 'http'"):
+                    request, payload = json.loads(request), json.loads(response)
+                    if request["path"] in DATED_ENDPOINTS and payload["status_code"] == 200:
+                        self._index_recording(request["path"], request["params"] or request["json"], json.loads(payload["body"]))
+                for series in self._dated.values():
+                    series.sort()
+        return self._dated.get((path, ticker, _series_key(path, query)))
+
+    def _index_recording(self, path: str, recorded: dict, recorded_body: dict):
+        field, date_field, start_param, end_param = DATED_ENDPOINTS[path]
+        tickers = recorded.get("tickers") or [recorded.get("ticker")]
+        body = {name: value for name, value in recorded_body.items() if name != field}
+        for ticker in tickers:
+            ticker_rows = [row for row in recorded_body[field] if row.get("ticker", ticker) == ticker]
+            # A full page proves nothing older than its oldest row is missing, except on that row's day
+            # (report periods are one row each); a full page for several tickers proves nothing per ticker
+            if recorded.get("limit") is not None and len(recorded_body[field]) >= recorded["limit"]:
+                if len(tickers) > 1 or not ticker_rows:
+                    continue
+                oldest = min(row[date_field] for row in ticker_rows)
+                start = oldest if date_field == "report_period" else shift_date(oldest, 1)
+            else:
+                start = (start_param and recorded.get(start_param)) or EARLIEST_DATE
+            key = (path, ticker, _series_key(path, recorded))
+            if (series := self._dated.get(key)) is None:
+                series = self._dated[key] = _RecordedSeries(date_field)
+            series.add(start, recorded[end_param], ticker_rows, recorded.get("line_items"), body)
+
+    def _answer_from_recordings(self, request: dict) -> dict | None:
+        """Build the response to a date-ranged request from recordings of other windows, or None if they do not cover it."""
+        if request["path"] not in DATED_ENDPOINTS:
+            return None
+        field = DATED_ENDPOINTS[request["path"]][0]
+        query = request["params"] or request["json"]
+        tickers = query.get("tickers") or [query.get("ticker")]
+        body, rows = {}, []
+        for ticker in tickers:
+            if (answer := self._answer_for_ticker(request["path"], ticker, query, len(tickers))) is None:
+                return None
+            body, ticker_rows = answer
+            rows += ticker_rows
+        return {**body, field: rows}
+
+    def _answer_for_ticker(self, path: str, ticker: str, query: dict, batch_size: int) -> tuple[dict, list[dict]] | None:
+        _, date_field, start_param, end_param = DATED_ENDPOINTS[path]
+        if (series := self._dated_series(path, ticker, query)) is None:
+            return None
+        end, limit = query[end_param][:10], query.get("limit")
+        if start_param and query.get(start_param):
+            if not series.covered.covers(query[start_param], end):
+                return None
+            start = query[start_param][:10]
+        elif (window := series.covered.containing(end)) is not None:
+            start = window[0]
+        else:
+            return None
+        # Prices come back oldest first, the other endpoints newest first
+        keys = series.between(start, end)
+        if date_field != "time":
+            keys = keys[::-1]
+        if limit is not None:
+            limit //= batch_size
+            if not (start_param and query.get(start_param)) and len(keys) < limit and start != EARLIEST_DATE:
+                return None
+            keys = keys[:limit]
+        if line_items := query.get("line_items"):
+            if any(not series.requested[key].issuperset(line_items) for key in keys):
+                return None
+            return series.body, [{name: value for name, value in series.rows[key].items() if name in line_items or name in _LINE_ITEM_FIELDS} for key in keys]
+        return series.body, [series.rows[key] for key in keys]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cassette: Cassette | None = None
+_configured = False
+_cassette_lock = threading.Lock()
+
+
+def configure_cassette(mode: str | None, path: str | None = None) -> Cassette | None:
+    """Select the record/replay mode for this process (None turns it off), overriding the environment."""
+    global _cassette, _configured
+    with _cassette_lock:
+        _cassette = Cassette(os.path.expanduser(path or DEFAULT_CASSETTE_PATH), mode) if mode else None
+        _configured = True
+    return _cassette
+
+
+def get_cassette() -> Cassette | None:
+    """Get the active cassette, configured from CASSETTE_MODE and CASSETTE_PATH unless configure_cassette was called."""
+    global _cassette, _configured
+    if not _configured:
+        with _cassette_lock:
+            if not _configured:
+                mode = os.environ.get("CASSETTE_MODE", "").strip().lower()
+                if mode and mode != "off":
+                    _cassette = Cassette(os.path.expanduser(os.environ.get("CASSETTE_PATH", DEFAULT_CASSETTE_PATH)), mode)
+                _configured = True
+    return _cassette
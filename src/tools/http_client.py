@@ -0,0 +1,162 @@
+import email.utils
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tools.cassette import get_cassette
+from tools.metrics import record_upstream
+from tools.rate_limiter import TokenBucketRateLimiter, priority_for
+
+BASE_URL = "https://api.financialdatasets.ai"
+
+# Status codes that are worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FinancialDatasetsClient:
+    """Pooled HTTP client for the Financial Datasets API with retry and backoff."""
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        pool_size: int = 10,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 30.0,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        # Shared by every request made through this client; None disables client-side rate limiting
+        self.rate_limiter = rate_limiter
+
+        # Keep-alive connections are reused across calls; pool_block bounds the number of open sockets
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _headers(self) -> dict[str, str]:
+        """Build request headers, reading the API key at call time so .env changes are honored."""
+        headers = {}
+        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
+            headers["X-API-KEY"] = api_key
+        return headers
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    def _retry_after(self, response: requests.Response) -> float | None:
+        """Parse a Retry-After header given either in seconds or as an HTTP date."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return min(self.backoff_max, max(0.0, float(value)))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+        return min(self.backoff_max, max(0.0, retry_at - time.time()))
+
+    def request(self, method: str, path: str, params: dict | None = None, json: dict | None = None) -> requests.Response:
+        """Send a request, or replay it from the active cassette. Recorded runs store the final response."""
+        cassette = get_cassette()
+        if cassette is None:
+            return self._send(method, path, params, json)
+        # The base URL is left out so recordings replay against any deployment
+        request = {"method": method, "path": path, "params": params, "json": json}
+        if cassette.replaying:
+            return cassette.replay_response(request)
+        response = self._send(method, path, params, json)
+        cassette.record_response(request, response)
+        return response
+
+    def _send(self, method: str, path: str, params: dict | None, json: dict | None) -> requests.Response:
+        """Send a request with retries, recording its latency and outcome against the fetcher that made it."""
+        start = time.perf_counter()
+        try:
+            response = self._send_with_retries(method, path, params, json)
+        except Exception:
+            record_upstream(time.perf_counter() - start, error=True)
+            raise
+        record_upstream(time.perf_counter() - start, error=response.status_code != 200)
+        return response
+
+    def _send_with_retries(self, method: str, path: str, params: dict | None, json: dict | None) -> requests.Response:
+        """Send a request, retrying connection errors, 429s and 5xx responses."""
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire(priority_for(path))
+            try:
+                response = self.session.request(method, url, params=params, json=json, headers=self._headers(), timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+
+            delay = self._retry_after(response)
+            delay = delay if delay is not None else self._backoff_delay(attempt)
+            if response.status_code == 429 and self.rate_limiter:
+                # Hold back every queued request, not just this one, until the API accepts requests again
+                self.rate_limiter.pause(delay)
+            else:
+                time.sleep(delay)
+
+        return response
+
+    def get(self, path: str, params: dict | None = None) -> requests.Response:
+        return self.request("GET", path, params=params)
+
+    def post(self, path: str, json: dict | None = None) -> requests.Response:
+        return self.request("POST", path, json=json)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _rate_limiter_from_env() -> TokenBucketRateLimiter | None:
+    """Build the rate limiter from FINANCIAL_DATASETS_RATE_LIMIT (requests/sec; unset or 0 disables it) and FINANCIAL_DATASETS_RATE_BURST."""
+    rate = float(os.environ.get("FINANCIAL_DATASETS_RATE_LIMIT", 0))
+    if rate <= 0:
+        return None
+    return TokenBucketRateLimiter(rate=rate, burst=int(os.environ.get("FINANCIAL_DATASETS_RATE_BURST", 20)))
+
+
+def get_client() -> FinancialDatasetsClient:
+    """Get the shared client, configured from FINANCIAL_DATASETS_BASE_URL, FINANCIAL_DATASETS_POOL_SIZE, FINANCIAL_DATASETS_MAX_RETRIES and the rate limit settings."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = FinancialDatasetsClient(
+                    base_url=os.environ.get("FINANCIAL_DATASETS_BASE_URL", BASE_URL),
+                    pool_size=int(os.environ.get("FINANCIAL_DATASETS_POOL_SIZE", 10)),
+                    max_retries=int(os.environ.get("FINANCIAL_DATASETS_MAX_RETRIES", 4)),
+                    rate_limiter=_rate_limiter_from_env(),
+                )
+    return _client
+
+
+def get_rate_limit_stats() -> dict[str, float]:
+    """Queue depth and wait times of the shared client's rate limiter (empty when rate limiting is disabled)."""
+    limiter = get_client().rate_limiter
+    return limiter.stats() if limiter else {}
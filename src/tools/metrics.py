@@ -0,0 +1,267 @@
+"""Counters and latency histograms for the tools.api fetchers, to see whether the cache is helping.
+
+Every call to a public fetcher records whether it was answered entirely from the cache (hit), partly
+from the cache and partly from the API (partial) or entirely from the API (miss), how many rows it
+returned and how long it took. The HTTP client records each upstream request's latency and errors
+against the fetcher that made it. Read the numbers with get_metrics_snapshot(), which also includes
+the cache's memory use per namespace and the rate limiter's queue depth and wait times.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable
+
+from data.cache import get_cache
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Call outcomes and the snapshot field counting each
+OUTCOMES = {"hit": "hits", "partial": "partial_hits", "miss": "misses", "error": "errors"}
+
+
+class Histogram:
+    """Counts of observations per latency bucket, plus their count, sum and maximum."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th quantile (the maximum for the unbounded bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def to_dict(self) -> dict[str, any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": {str(bound): count for bound, count in zip((*self.buckets, "+Inf"), self.counts)},
+        }
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.counters: Counter = Counter()
+        self.latency = Histogram()
+        self.upstream_latency = Histogram()
+
+    def to_dict(self) -> dict[str, any]:
+        calls = sum(self.counters[outcome] for outcome in OUTCOMES)
+        return {
+            "calls": calls,
+            **{field: self.counters[outcome] for outcome, field in OUTCOMES.items()},
+            "hit_rate": self.counters["hit"] / calls if calls else None,
+            "rows_returned": self.counters["rows"],
+            "upstream_requests": self.counters["upstream_requests"],
+            "upstream_errors": self.counters["upstream_errors"],
+            "latency": self.latency.to_dict(),
+            "upstream_latency": self.upstream_latency.to_dict(),
+        }
+
+
+class Metrics:
+    """Thread-safe metrics per fetcher (endpoint)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointMetrics] = {}
+
+    def _endpoint(self, endpoint: str) -> EndpointMetrics:
+        if (metrics := self._endpoints.get(endpoint)) is None:
+            metrics = self._endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record_call(self, endpoint: str, outcome: str, rows: int, seconds: float):
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.counters[outcome] += 1
+            metrics.counters["rows"] += rows
+            metrics.latency.observe(seconds)
+
+    def record_upstream(self, endpoint: str, seconds: float, error: bool):
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.counters["upstream_requests"] += 1
+            metrics.counters["upstream_errors"] += error
+            metrics.upstream_latency.observe(seconds)
+
+    def snapshot(self) -> dict[str, dict[str, any]]:
+        with self._lock:
+            return {endpoint: metrics.to_dict() for endpoint, metrics in sorted(self._endpoints.items())}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the global metrics instance."""
+    return _metrics
+
+
+class _Frame:
+    """One fetcher call in progress: the upstream requests it made and whether the cache answered part of it."""
+
+    __slots__ = ("endpoint", "upstream", "partial")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.upstream = 0
+        self.partial = False
+
+
+# Fetcher calls in progress in this context, outermost first (fetchers call each other, e.g. market cap -> metrics)
+_frames: contextvars.ContextVar[tuple[_Frame, ...]] = contextvars.ContextVar("fetcher_frames", default=())
+
+
+def instrumented(func: Callable) -> Callable:
+    """Record a hit, partial or miss, the rows returned and the latency of every call to a fetcher."""
+    endpoint = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        frame = _Frame(endpoint)
+        token = _frames.set(_frames.get() + (frame,))
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            _metrics.record_call(endpoint, "error", 0, time.perf_counter() - start)
+            raise
+        finally:
+            _frames.reset(token)
+        outcome = "hit" if not frame.upstream else "partial" if frame.partial else "miss"
+        _metrics.record_call(endpoint, outcome, _count_rows(result), time.perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def _count_rows(result: any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        # Price arrays are columns of one table; batch results map tickers to rows
+        return len(result["days"]) if "days" in result else sum(_count_rows(rows) for rows in result.values())
+    if hasattr(result, "__len__"):
+        return len(result)
+    return 1
+
+
+def mark_partial():
+    """Note that the cache answered part of the calls in progress, so any upstream fetch only filled a gap."""
+    for frame in _frames.get():
+        frame.partial = True
+
+
+def record_upstream(seconds: float, error: bool):
+    """Record an upstream request against the innermost fetcher call in progress, if any."""
+    frames = _frames.get()
+    for frame in frames:
+        frame.upstream += 1
+    _metrics.record_upstream(frames[-1].endpoint if frames else "other", seconds, error)
+
+
+def get_metrics_snapshot() -> dict[str, any]:
+    """Metrics per fetcher, plus the cache's statistics and memory use per namespace, and the rate limiter's queue (empty when it is off)."""
+    # Imported here because the HTTP client records its requests through this module
+    from tools.http_client import get_rate_limit_stats
+
+    return {"endpoints": _metrics.snapshot(), "cache": get_cache().get_stats(), "rate_limiter": get_rate_limit_stats()}
+
+
+def dump_metrics() -> dict[str, any]:
+    """Take a snapshot and, if FINANCIAL_DATA_METRICS_PATH is set, write it there as JSON."""
+    snapshot = get_metrics_snapshot()
+    if path := os.environ.get("FINANCIAL_DATA_METRICS_PATH"):
+        path = os.path.expanduser(path)
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(snapshot, f, indent=2)
+    return snapshot
+
+
+def to_prometheus(snapshot: dict[str, any]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name: str, kind: str, help: str):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    endpoints = snapshot["endpoints"]
+    metric("financial_data_calls_total", "counter", "Fetcher calls by cache outcome")
+    for endpoint, values in endpoints.items():
+        for outcome, field in OUTCOMES.items():
+            lines.append(f'financial_data_calls_total{{endpoint="{endpoint}",outcome="{outcome}"}} {values[field]}')
+    for name, key, help in (
+        ("financial_data_rows_returned_total", "rows_returned", "Rows returned by fetchers"),
+        ("financial_data_upstream_requests_total", "upstream_requests", "Requests sent to the Financial Datasets API"),
+        ("financial_data_upstream_errors_total", "upstream_errors", "Upstream requests that failed or returned a non-200 status"),
+    ):
+        metric(name, "counter", help)
+        lines.extend(f'{name}{{endpoint="{endpoint}"}} {values[key]}' for endpoint, values in endpoints.items())
+    for name, key, help in (
+        ("financial_data_call_seconds", "latency", "Fetcher call latency, cache hits included"),
+        ("financial_data_upstream_seconds", "upstream_latency", "Upstream request latency, retries included"),
+    ):
+        metric(name, "histogram", help)
+        for endpoint, values in endpoints.items():
+            histogram = values[key]
+            cumulative = 0
+            for bound, count in histogram["buckets"].items():
+                cumulative += count
+                lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{endpoint="{endpoint}"}} {histogram["count"]}')
+
+    memory = snapshot["cache"].get("memory", {})
+    for name, key, help in (("financial_data_cache_bytes", "bytes", "Estimated bytes held in memory by the cache"), ("financial_data_cache_rows", "rows", "Rows held in memory by the cache")):
+        metric(name, "gauge", help)
+        lines.extend(f'{name}{{namespace="{namespace}"}} {values[key]}' for namespace, values in memory.items())
+
+    if rate_limiter := snapshot.get("rate_limiter"):
+        for name, key, kind, help in (
+            ("financial_data_rate_limit_queue_depth", "queue_depth", "gauge", "Requests waiting for a rate limiter token"),
+            ("financial_data_rate_limit_max_queue_depth", "max_queue_depth", "gauge", "Most requests ever waiting for a rate limiter token"),
+            ("financial_data_rate_limit_acquired_total", "acquired", "counter", "Requests released by the rate limiter"),
+            ("financial_data_rate_limit_throttled_total", "throttled", "counter", "Pauses after the API answered 429 Too Many Requests"),
+            ("financial_data_rate_limit_wait_seconds_total", "total_wait_seconds", "counter", "Time requests spent waiting for the rate limiter"),
+            ("financial_data_rate_limit_max_wait_seconds", "max_wait_seconds", "gauge", "Longest time a request waited for the rate limiter"),
+        ):
+            metric(name, kind, help)
+            lines.append(f"{name} {rate_limiter[key]}")
+    return "\n".join(lines) + "\n"
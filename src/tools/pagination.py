@@ -0,0 +1,87 @@
+"""Fetch a date-ranged endpoint (insider trades, company news) as concurrent date windows.
+
+The API pages backwards from an end date, so plain pagination is a chain of dependent requests: each
+page's end date is the oldest date on the previous page. With FINANCIAL_DATASETS_WINDOW_DAYS set, a
+[start_date, end_date] range is instead split into windows of that many days which are fetched in
+parallel. A window whose page comes back full (len == limit) may hold more rows, so what remains of
+it is split in half and both halves are fetched as well, until every window fits in one page.
+"""
+
+import contextvars
+import datetime
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable
+
+from pydantic import BaseModel
+
+from data.coverage import shift_date
+
+DEFAULT_WINDOW_CONCURRENCY = 4
+
+
+def window_days_from_env() -> int:
+    """Width of the initial windows in days, or 0 to paginate sequentially (the default)."""
+    return int(os.environ.get("FINANCIAL_DATASETS_WINDOW_DAYS", 0))
+
+
+def _window_concurrency() -> int:
+    return int(os.environ.get("FINANCIAL_DATASETS_WINDOW_CONCURRENCY", DEFAULT_WINDOW_CONCURRENCY))
+
+
+def split_windows(start_date: str, end_date: str, days: int) -> list[tuple[str, str]]:
+    """Split [start_date, end_date] into consecutive windows of at most `days` days, newest first."""
+    windows = []
+    window_end = end_date
+    while window_end >= start_date:
+        window_start = max(shift_date(window_end, 1 - days), start_date)
+        windows.append((window_start, window_end))
+        window_end = shift_date(window_start, -1)
+    return windows
+
+
+def _halves(start_date: str, end_date: str) -> list[tuple[str, str]]:
+    days = (datetime.date.fromisoformat(end_date) - datetime.date.fromisoformat(start_date)).days + 1
+    return split_windows(start_date, end_date, (days + 1) // 2)
+
+
+def fetch_windows(
+    fetch_page: Callable[[str, str], list[BaseModel]],
+    date_field: str,
+    key_field: tuple[str, ...],
+    start_date: str,
+    end_date: str,
+    limit: int,
+    window_days: int,
+    concurrency: int | None = None,
+) -> list[BaseModel]:
+    """
+    Fetch every row dated between start_date and end_date with fetch_page(window_start, window_end), one page per window.
+
+    Rows seen in more than one page (the oldest day of a full page is fetched again) are returned once, keyed by key_field.
+    Pages run in the caller's context, so their requests are attributed to the calling fetcher.
+    """
+    rows: dict[any, BaseModel] = {}
+    pool = ThreadPoolExecutor(max_workers=concurrency or _window_concurrency())
+    try:
+        pending = {pool.submit(contextvars.copy_context().run, fetch_page, *window): window for window in split_windows(start_date[:10], end_date[:10], window_days)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                window_start, window_end = pending.pop(future)
+                page = future.result()
+                for row in page:
+                    rows.setdefault(tuple(getattr(row, field) for field in key_field), row)
+                if len(page) < limit:
+                    continue
+
+                # A full page covers its window from the oldest date it reached, which may itself be incomplete.
+                # A single day that holds more than a page cannot be narrowed further, as with sequential paging.
+                if window_start == window_end:
+                    continue
+                oldest = min(getattr(row, date_field) for row in page)[:10]
+                for window in _halves(window_start, max(oldest, window_start)):
+                    pending[pool.submit(contextvars.copy_context().run, fetch_page, *window)] = window
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return list(rows.values())
@@ -0,0 +1,127 @@
+"""Plan and run a single bulk prefetch of the data a set of agents will request, before the graph runs.
+
+Agents declare their needs as data requirements (see utils/analysts.py), one dict per kind of fetch:
+
+    {"endpoint": "prices"}                                    prices from the run's start_date to its end_date
+    {"endpoint": "financial_metrics", "period": "annual", "limit": 10}
+    {"endpoint": "line_items", "line_items": [...], "period": "ttm", "limit": 2}
+    {"endpoint": "market_cap"}
+    {"endpoint": "insider_trades", "limit": 50}               newest `limit` rows as of the end date
+    {"endpoint": "company_news", "lookback_days": 365}        every row in the year before the end date
+
+The planner merges them into the smallest set of fetches whose results let the cache answer every request.
+"""
+
+import asyncio
+import datetime
+
+from dateutil.relativedelta import relativedelta
+
+from data.coverage import MIN_PERIOD_SPACING_DAYS, shift_date
+from tools import api
+from tools.async_api import gather_calls
+
+# Page size for date-windowed insider trade and news fetches
+WINDOW_PAGE_SIZE = 1000
+
+
+def backtest_price_start(start_date: str, end_date: str) -> str:
+    """Earliest price a backtest reads: a year before end_date, or the 30 day lookback before start_date if that is earlier."""
+    year_before = (datetime.date.fromisoformat(end_date) - relativedelta(years=1)).isoformat()
+    return min(year_before, shift_date(start_date, -30))
+
+
+def _periods_between(first_end_date: str, end_date: str, period: str) -> int:
+    """Upper bound on the number of report periods that can close between two end dates."""
+    if first_end_date >= end_date:
+        return 0
+    days = (datetime.date.fromisoformat(end_date) - datetime.date.fromisoformat(first_end_date)).days
+    return days // MIN_PERIOD_SPACING_DAYS.get(period, 84) + 1
+
+
+def plan_prefetch(
+    requirements: list[dict],
+    start_date: str,
+    end_date: str,
+    first_end_date: str | None = None,
+) -> list[tuple]:
+    """
+    Merge data requirements into a list of (fetcher, args, kwargs) calls, each made once per ticker.
+
+    Agents run as of every date from first_end_date to end_date (just end_date unless backtesting),
+    and start_date is the earliest start of any run's price window.
+    """
+    first_end_date = first_end_date or end_date
+    prices = False
+    market_cap = False
+    metrics_limits: dict[str, int] = {}
+    line_items: dict[str, tuple[list[str], int]] = {}
+    dated: dict[str, dict[str, any]] = {"insider_trades": {}, "company_news": {}}
+
+    for requirement in requirements:
+        endpoint = requirement["endpoint"]
+        if endpoint == "prices":
+            prices = True
+        elif endpoint == "financial_metrics":
+            period = requirement.get("period", "ttm")
+            metrics_limits[period] = max(metrics_limits.get(period, 0), requirement.get("limit", 10))
+        elif endpoint == "line_items":
+            period = requirement.get("period", "ttm")
+            fields, limit = line_items.get(period, ([], 0))
+            fields = fields + [field for field in requirement["line_items"] if field not in fields]
+            line_items[period] = (fields, max(limit, requirement.get("limit", 10)))
+        elif endpoint == "market_cap":
+            # Historical market caps are read from the default TTM metrics
+            market_cap = True
+            metrics_limits["ttm"] = max(metrics_limits.get("ttm", 0), 10)
+        elif endpoint in dated:
+            if lookback_days := requirement.get("lookback_days"):
+                start = shift_date(first_end_date, -lookback_days)
+                dated[endpoint]["start"] = min(dated[endpoint].get("start", start), start)
+            else:
+                dated[endpoint]["limit"] = max(dated[endpoint].get("limit", 0), requirement.get("limit", 1000))
+        else:
+            raise ValueError(f"Unknown data requirement: {endpoint}")
+
+    calls = []
+    if prices:
+        calls.append((api.get_prices, (start_date, end_date), {}))
+
+    # One fetch as of the last date, deep enough to also answer every earlier date in the window
+    for period, limit in metrics_limits.items():
+        calls.append((api.get_financial_metrics, (end_date,), {"period": period, "limit": limit + _periods_between(first_end_date, end_date, period)}))
+    for period, (fields, limit) in line_items.items():
+        calls.append((api.search_line_items_batch, (fields, end_date), {"period": period, "limit": limit + _periods_between(first_end_date, end_date, period)}))
+
+    if market_cap and end_date == datetime.date.today().isoformat():
+        calls.append((api.get_market_cap, (end_date,), {}))
+
+    fetchers = {"insider_trades": api.get_insider_trades, "company_news": api.get_company_news}
+    for endpoint, needs in dated.items():
+        # The newest rows as of the first date, then every row after it, form one covered window
+        window_start = needs.get("start")
+        if "limit" in needs:
+            # A full page may end part way through its oldest day, which is then not counted, so ask for a few more rows
+            calls.append((fetchers[endpoint], (first_end_date,), {"limit": needs["limit"] + max(10, needs["limit"] // 10)}))
+            if first_end_date < end_date:
+                window_start = min(window_start or first_end_date, first_end_date)
+        if window_start:
+            calls.append((fetchers[endpoint], (end_date,), {"start_date": window_start, "limit": WINDOW_PAGE_SIZE}))
+
+    return calls
+
+
+def prefetch(tickers: list[str], calls: list[tuple], concurrency: int | None = None) -> list[BaseException]:
+    """
+    Run planned calls for every ticker concurrently, warming the cache. Line items are fetched for all tickers at once.
+
+    Failures do not abort the prefetch; they are returned, and the agents retry those fetches themselves.
+    """
+    ticker_calls = []
+    for fetcher, args, kwargs in calls:
+        if fetcher is api.search_line_items_batch:
+            ticker_calls.append((fetcher, (tickers, *args), kwargs))
+        else:
+            ticker_calls.extend((fetcher, (ticker, *args), kwargs) for ticker in tickers)
+    results = asyncio.run(gather_calls(ticker_calls, concurrency=concurrency, return_exceptions=True))
+    return [result for result in results if isinstance(result, BaseException)]
@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import threading
+import time
+
+# Lower values are served first when requests are queued. Prices drive every agent, news only a few.
+ENDPOINT_PRIORITIES = {
+    "/prices/": 0,
+    "/financial-metrics/": 1,
+    "/financials/search/line-items": 1,
+    "/company/facts/": 1,
+    "/insider-trades/": 2,
+    "/news/": 3,
+}
+DEFAULT_PRIORITY = 2
+
+
+def priority_for(path: str) -> int:
+    """Queue priority for an API path."""
+    return ENDPOINT_PRIORITIES.get(path, DEFAULT_PRIORITY)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket shared by every request to the API.
+
+    Tokens refill at `rate` per second up to `burst`. When the bucket is empty, callers queue and are
+    released one token at a time in priority order (FIFO within a priority) instead of failing.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._queue: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+
+        self._acquired = 0
+        self._throttled = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._max_queue_depth = 0
+
+    def _refill(self, now: float):
+        # Nothing accrues during a pause, so the API sees the configured rate rather than a full burst when it ends
+        since = max(self._updated, self._paused_until)
+        if now > since:
+            self._tokens = min(self.burst, self._tokens + (now - since) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = DEFAULT_PRIORITY) -> float:
+        """Block until a token is available for this caller, and return the seconds spent waiting."""
+        start = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._queue[0] != ticket:
+                        # Someone ahead of us is waiting; they notify when they are done
+                        self._cond.wait()
+                        continue
+                    if now < self._paused_until:
+                        self._cond.wait(self._paused_until - now)
+                    elif self._tokens < 1:
+                        self._cond.wait((1 - self._tokens) / self.rate)
+                    else:
+                        self._tokens -= 1
+                        break
+            finally:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._acquired += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        return waited
+
+    def pause(self, seconds: float):
+        """Stop releasing tokens for a while, e.g. after the API answered 429 Too Many Requests."""
+        with self._cond:
+            self._throttled += 1
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, float]:
+        """Queue depth and wait times, for monitoring."""
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "total_wait_seconds": self._total_wait,
+                "avg_wait_seconds": self._total_wait / self._acquired if self._acquired else 0.0,
+                "max_wait_seconds": self._max_wait,
+            }
@@ -0,0 +1,78 @@
+import functools
+import inspect
+import threading
+from typing import Callable, Hashable
+
+
+class _Call:
+    """One in-flight call that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto a single in-flight call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], any]) -> tuple[any, bool]:
+        """Run fn, or wait for the in-flight call with the same key. Returns (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Later callers start a fresh call, which the cache will usually answer
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+def _freeze(value: any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def single_flight(func: Callable) -> Callable:
+    """Decorate a fetcher so concurrent calls with the same arguments share one call and its result."""
+    group = SingleFlight()
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple((name, _freeze(value)) for name, value in bound.arguments.items())
+        result, shared = group.do(key, lambda: func(*args, **kwargs))
+        # Waiters get their own container so callers that sort or append do not affect each other
+        if shared and isinstance(result, (list, dict)):
+            return type(result)(result)
+        return result
+
+    wrapper.flight = group
+    return wrapper
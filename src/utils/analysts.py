@@ -1,85 +1,159 @@
 """Constants and utilities related to analysts configuration."""
 
-from agents.ben_graham import ben_graham_agent
-from agents.bill_ackman import bill_ackman_agent
-from agents.cathie_wood import cathie_wood_agent
-from agents.charlie_munger import charlie_munger_agent
+from agents.ben_graham import BEN_GRAHAM_LINE_ITEMS, ben_graham_agent
+from agents.bill_ackman import BILL_ACKMAN_LINE_ITEMS, bill_ackman_agent
+from agents.cathie_wood import CATHIE_WOOD_LINE_ITEMS, cathie_wood_agent
+from agents.charlie_munger import CHARLIE_MUNGER_LINE_ITEMS, charlie_munger_agent
 from agents.fundamentals import fundamentals_agent
-from agents.michael_burry import michael_burry_agent
-from agents.phil_fisher import phil_fisher_agent
-from agents.peter_lynch import peter_lynch_agent
+from agents.michael_burry import MICHAEL_BURRY_LINE_ITEMS, michael_burry_agent
+from agents.phil_fisher import PHIL_FISHER_LINE_ITEMS, phil_fisher_agent
+from agents.peter_lynch import PETER_LYNCH_LINE_ITEMS, peter_lynch_agent
 from agents.sentiment import sentiment_agent
-from agents.stanley_druckenmiller import stanley_druckenmiller_agent
+from agents.stanley_druckenmiller import STANLEY_DRUCKENMILLER_LINE_ITEMS, stanley_druckenmiller_agent
 from agents.technicals import technical_analyst_agent
-from agents.valuation import valuation_agent
-from agents.warren_buffett import warren_buffett_agent
+from agents.valuation import VALUATION_LINE_ITEMS, valuation_agent
+from agents.warren_buffett import WARREN_BUFFETT_LINE_ITEMS, warren_buffett_agent
 
 # Define analyst configuration - single source of truth
+# data_requirements declare what each analyst fetches per ticker, for the prefetch planner (see tools/prefetch.py).
+# Line item lists are the <AGENT>_LINE_ITEMS constants each agent passes to search_line_items, so they cannot drift.
 ANALYST_CONFIG = {
     "ben_graham": {
         "display_name": "Ben Graham",
         "agent_func": ben_graham_agent,
         "order": 0,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "annual", "limit": 10},
+            {"endpoint": "line_items", "line_items": BEN_GRAHAM_LINE_ITEMS, "period": "annual", "limit": 10},
+            {"endpoint": "market_cap"},
+        ],
     },
     "bill_ackman": {
         "display_name": "Bill Ackman",
         "agent_func": bill_ackman_agent,
         "order": 1,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "annual", "limit": 5},
+            {"endpoint": "line_items", "line_items": BILL_ACKMAN_LINE_ITEMS, "period": "annual", "limit": 5},
+            {"endpoint": "market_cap"},
+        ],
     },
     "cathie_wood": {
         "display_name": "Cathie Wood",
         "agent_func": cathie_wood_agent,
         "order": 2,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "annual", "limit": 5},
+            {"endpoint": "line_items", "line_items": CATHIE_WOOD_LINE_ITEMS, "period": "annual", "limit": 5},
+            {"endpoint": "market_cap"},
+        ],
     },
     "charlie_munger": {
         "display_name": "Charlie Munger",
         "agent_func": charlie_munger_agent,
         "order": 3,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "annual", "limit": 10},
+            {"endpoint": "line_items", "line_items": CHARLIE_MUNGER_LINE_ITEMS, "period": "annual", "limit": 10},
+            {"endpoint": "market_cap"},
+            {"endpoint": "insider_trades", "limit": 100},
+            {"endpoint": "company_news", "limit": 100},
+        ],
     },
     "michael_burry": {
         "display_name": "Michael Burry",
         "agent_func": michael_burry_agent,
         "order": 4,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "ttm", "limit": 5},
+            {"endpoint": "line_items", "line_items": MICHAEL_BURRY_LINE_ITEMS, "period": "ttm", "limit": 10},
+            {"endpoint": "market_cap"},
+            {"endpoint": "insider_trades", "lookback_days": 365},
+            {"endpoint": "company_news", "lookback_days": 365},
+        ],
     },
     "peter_lynch": {
         "display_name": "Peter Lynch",
         "agent_func": peter_lynch_agent,
         "order": 5,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "annual", "limit": 5},
+            {"endpoint": "line_items", "line_items": PETER_LYNCH_LINE_ITEMS, "period": "annual", "limit": 5},
+            {"endpoint": "market_cap"},
+            {"endpoint": "insider_trades", "limit": 50},
+            {"endpoint": "company_news", "limit": 50},
+            {"endpoint": "prices"},
+        ],
     },
     "phil_fisher": {
         "display_name": "Phil Fisher",
         "agent_func": phil_fisher_agent,
         "order": 6,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "annual", "limit": 5},
+            {"endpoint": "line_items", "line_items": PHIL_FISHER_LINE_ITEMS, "period": "annual", "limit": 5},
+            {"endpoint": "market_cap"},
+            {"endpoint": "insider_trades", "limit": 50},
+            {"endpoint": "company_news", "limit": 50},
+        ],
     },
     "stanley_druckenmiller": {
         "display_name": "Stanley Druckenmiller",
         "agent_func": stanley_druckenmiller_agent,
         "order": 7,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "annual", "limit": 5},
+            {"endpoint": "line_items", "line_items": STANLEY_DRUCKENMILLER_LINE_ITEMS, "period": "annual", "limit": 5},
+            {"endpoint": "market_cap"},
+            {"endpoint": "insider_trades", "limit": 50},
+            {"endpoint": "company_news", "limit": 50},
+            {"endpoint": "prices"},
+        ],
     },
     "warren_buffett": {
         "display_name": "Warren Buffett",
         "agent_func": warren_buffett_agent,
         "order": 8,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "ttm", "limit": 5},
+            {"endpoint": "line_items", "line_items": WARREN_BUFFETT_LINE_ITEMS, "period": "ttm", "limit": 10},
+            {"endpoint": "market_cap"},
+        ],
     },
     "technical_analyst": {
         "display_name": "Technical Analyst",
         "agent_func": technical_analyst_agent,
         "order": 9,
+        "data_requirements": [
+            {"endpoint": "prices"},
+        ],
     },
     "fundamentals_analyst": {
         "display_name": "Fundamentals Analyst",
         "agent_func": fundamentals_agent,
         "order": 10,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "ttm", "limit": 10},
+        ],
     },
     "sentiment_analyst": {
         "display_name": "Sentiment Analyst",
         "agent_func": sentiment_agent,
         "order": 11,
+        "data_requirements": [
+            {"endpoint": "insider_trades", "limit": 1000},
+            {"endpoint": "company_news", "limit": 100},
+        ],
     },
     "valuation_analyst": {
         "display_name": "Valuation Analyst",
         "agent_func": valuation_agent,
         "order": 12,
+        "data_requirements": [
+            {"endpoint": "financial_metrics", "period": "ttm", "limit": 8},
+            {"endpoint": "line_items", "line_items": VALUATION_LINE_ITEMS, "period": "ttm", "limit": 2},
+            {"endpoint": "market_cap"},
+        ],
     },
 }
 
@@ -90,3 +164,14 @@ ANALYST_ORDER = [(config["display_name"], key) for key, config in sorted(ANALYST
 def get_analyst_nodes():
     """Get the mapping of analyst keys to their (node_name, agent_func) tuples."""
     return {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
+
+
+# The risk manager always runs after the analysts and reads prices for the whole window
+RISK_MANAGER_DATA_REQUIREMENTS = [{"endpoint": "prices"}]
+
+
+def get_data_requirements(selected_analysts: list[str] | None = None) -> list[dict]:
+    """Get the data requirements of the selected analysts (all analysts if none are selected) plus the risk manager."""
+    keys = selected_analysts or list(ANALYST_CONFIG.keys())
+    requirements = [requirement for key in keys for requirement in ANALYST_CONFIG[key]["data_requirements"]]
+    return requirements + RISK_MANAGER_DATA_REQUIREMENTS
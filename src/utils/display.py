@@ -364,3 +364,55 @@ def format_backtest_row(
             f"{Fore.RED}{bearish_count}{Style.RESET_ALL}",
             f"{Fore.BLUE}{neutral_count}{Style.RESET_ALL}",
         ]
+
+
+def print_data_metrics(snapshot: dict) -> None:
+    """Print per-fetcher cache and upstream metrics, and cache memory use, from tools.metrics.get_metrics_snapshot()"""
+    rows = []
+    for endpoint, values in snapshot["endpoints"].items():
+        hit_rate = f"{values['hit_rate'] * 100:.1f}%" if values["hit_rate"] is not None else ""
+        upstream = values["upstream_latency"]
+        rows.append(
+            [
+                f"{Fore.CYAN}{endpoint}{Style.RESET_ALL}",
+                values["calls"],
+                f"{Fore.GREEN}{values['hits']}{Style.RESET_ALL}",
+                f"{Fore.YELLOW}{values['partial_hits']}{Style.RESET_ALL}",
+                f"{Fore.RED}{values['misses']}{Style.RESET_ALL}",
+                hit_rate,
+                f"{values['rows_returned']:,}",
+                values["upstream_requests"],
+                f"{Fore.RED}{values['upstream_errors']}{Style.RESET_ALL}" if values["upstream_errors"] else 0,
+                f"{upstream['avg'] * 1000:,.0f}" if upstream["avg"] is not None else "",
+                f"{upstream['p95'] * 1000:,.0f}" if upstream["p95"] is not None else "",
+            ]
+        )
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}DATA FETCH METRICS:{Style.RESET_ALL}")
+    print(
+        tabulate(
+            rows,
+            headers=["Fetcher", "Calls", "Hits", "Partial", "Misses", "Hit Rate", "Rows", "Requests", "Errors", "Avg ms", "P95 ms"],
+            tablefmt="grid",
+            colalign=("left", "right", "right", "right", "right", "right", "right", "right", "right", "right", "right"),
+        )
+    )
+
+    memory = snapshot["cache"].get("memory", {})
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}CACHE MEMORY:{Style.RESET_ALL}")
+    print(
+        tabulate(
+            [[namespace, values["entries"], f"{values['rows']:,}", f"{values['bytes'] / 1024 ** 2:,.1f}", values["evictions"]] for namespace, values in memory.items()],
+            headers=["Data", "Entries", "Rows", "MB", "Evictions"],
+            tablefmt="grid",
+            colalign=("left", "right", "right", "right", "right"),
+        )
+    )
+
+    if rate_limiter := snapshot.get("rate_limiter"):
+        print(
+            f"\n{Fore.WHITE}{Style.BRIGHT}RATE LIMITER:{Style.RESET_ALL} {rate_limiter['acquired']} requests, "
+            f"queue depth {rate_limiter['queue_depth']} (max {rate_limiter['max_queue_depth']}), "
+            f"wait avg {rate_limiter['avg_wait_seconds'] * 1000:,.0f} ms / max {rate_limiter['max_wait_seconds'] * 1000:,.0f} ms, "
+            f"{rate_limiter['throttled']} pauses after 429s"
+        )
@@ -3,6 +3,7 @@
 import json
 from typing import TypeVar, Type, Optional, Any
 from pydantic import BaseModel
+from tools.cassette import get_cassette
 from utils.progress import progress
 
 T = TypeVar('T', bound=BaseModel)
@@ -31,6 +32,35 @@ def call_llm(
     Returns:
         An instance of the specified Pydantic model
     """
+    cassette = get_cassette()
+    if cassette is None:
+        return _call_llm(prompt, model_name, model_provider, pydantic_model, agent_name, max_retries, default_factory)
+
+    request = {"model_name": model_name, "model_provider": model_provider, "output": pydantic_model.__name__, "prompt": _prompt_text(prompt)}
+    if cassette.replaying:
+        return pydantic_model.model_validate_json(cassette.replay("llm", request))
+    result = _call_llm(prompt, model_name, model_provider, pydantic_model, agent_name, max_retries, default_factory)
+    cassette.record("llm", request, result.model_dump_json())
+    return result
+
+
+def _prompt_text(prompt: Any) -> str:
+    """Render a prompt (string, message list or prompt value) as text, to key cassette recordings."""
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    return str(prompt)
+
+
+def _call_llm(
+    prompt: Any,
+    model_name: str,
+    model_provider: str,
+    pydantic_model: Type[T],
+    agent_name: Optional[str],
+    max_retries: int,
+    default_factory,
+) -> T:
+    """Call the LLM with retries. See call_llm."""
     from llm.models import get_model, get_model_info
     
     model_info = get_model_info(model_name)
@@ -0,0 +1,181 @@
+import sys
+
+from dotenv import load_dotenv
+from colorama import Fore, Style, init
+
+from data.cache import get_cache
+from tools import api
+from tools.async_api import DEFAULT_CONCURRENCY
+from tools.metrics import dump_metrics
+from tools.prefetch import backtest_price_start, plan_prefetch
+from utils.analysts import ANALYST_CONFIG, get_data_requirements
+from utils.display import print_data_metrics
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+# Load environment variables from .env file
+load_dotenv()
+
+init(autoreset=True)
+
+# Metrics are warmed for both periods even if no selected analyst reads one of them
+WARM_REQUIREMENTS = [
+    {"endpoint": "financial_metrics", "period": "annual", "limit": 10},
+    {"endpoint": "financial_metrics", "period": "ttm", "limit": 10},
+]
+
+
+def read_tickers(path: str) -> list[str]:
+    """Read tickers from a file, one per line or comma-separated. Blank lines and # comments are ignored."""
+    tickers = []
+    with open(path) as f:
+        for line in f:
+            for ticker in line.split("#", 1)[0].split(","):
+                if (ticker := ticker.strip().upper()) and ticker not in tickers:
+                    tickers.append(ticker)
+    return tickers
+
+
+class WarmProgress:
+    """Counts finished calls and tickers, and prints a progress line at most every `interval` seconds."""
+
+    def __init__(self, total_calls: int, total_tickers: int, interval: float):
+        self.total_calls = total_calls
+        self.total_tickers = total_tickers
+        self.interval = interval
+        self.calls = 0
+        self.tickers = 0
+        self.failures: list[tuple[list[str], str, BaseException]] = []
+        self.started = time.monotonic()
+        self._last_print = 0.0
+
+    def call_done(self, tickers_finished: int, error: tuple[list[str], str, BaseException] | None = None):
+        self.calls += 1
+        self.tickers += tickers_finished
+        if error:
+            self.failures.append(error)
+        now = time.monotonic()
+        if now - self._last_print >= self.interval or self.calls == self.total_calls:
+            self._last_print = now
+            self.print_line()
+
+    def print_line(self):
+        elapsed = time.monotonic() - self.started
+        rate = self.calls / elapsed if elapsed else 0.0
+        eta = (self.total_calls - self.calls) / rate if rate else 0.0
+        failures = f"{Fore.RED}{len(self.failures)} failed{Style.RESET_ALL}" if self.failures else "0 failed"
+        print(
+            f"[{self.calls:>{len(str(self.total_calls))}}/{self.total_calls} calls] {self.calls / self.total_calls:6.1%} | "
+            f"{self.tickers}/{self.total_tickers} tickers | {rate:,.1f} calls/s | {self.tickers / elapsed if elapsed else 0.0:,.1f} tickers/s | "
+            f"{failures} | {elapsed:,.0f}s elapsed, ~{eta:,.0f}s left",
+            flush=True,
+        )
+
+
+def warm_cache(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    selected_analysts: list[str] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    batch_size: int = 25,
+    progress_interval: float = 5.0,
+) -> WarmProgress:
+    """
+    Fetch everything the selected analysts (all if none) read for each ticker as of every date in [start_date, end_date].
+
+    Calls run in a thread pool with at most `concurrency` in flight; line items are fetched for batch_size
+    tickers per request. Failures are collected rather than raised, so one bad ticker does not stop the run.
+    """
+    # Prices from the same start as a backtest over [start_date, end_date] reads, so the backtest finds them all cached
+    calls = plan_prefetch(get_data_requirements(selected_analysts) + WARM_REQUIREMENTS, backtest_price_start(start_date, end_date), end_date, first_end_date=start_date)
+    ticker_calls = [call for call in calls if call[0] is not api.search_line_items_batch]
+    batch_calls = [call for call in calls if call[0] is api.search_line_items_batch]
+
+    # A ticker is done once its own calls and its batch's line item calls have finished
+    chunks = [tickers[i : i + batch_size] for i in range(0, len(tickers), batch_size)]
+    remaining = {ticker: len(ticker_calls) + len(batch_calls) for ticker in tickers}
+    progress = WarmProgress(len(chunks) * len(batch_calls) + len(tickers) * len(ticker_calls), len(tickers), progress_interval)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {}
+        # Submitted a chunk at a time, so tickers finish (and are persisted) steadily rather than all at the end
+        for chunk in chunks:
+            for fetcher, args, kwargs in batch_calls:
+                futures[pool.submit(fetcher, chunk, *args, batch_size=batch_size, **kwargs)] = (chunk, fetcher.__name__)
+            for ticker in chunk:
+                for fetcher, args, kwargs in ticker_calls:
+                    futures[pool.submit(fetcher, ticker, *args, **kwargs)] = ([ticker], fetcher.__name__)
+
+        for future in as_completed(futures):
+            call_tickers, name = futures.pop(future)
+            finished = 0
+            for ticker in call_tickers:
+                remaining[ticker] -= 1
+                finished += remaining[ticker] == 0
+            error = future.exception()
+            progress.call_done(finished, (call_tickers, name, error) if error else None)
+
+    return progress
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the financial data cache for a ticker universe, without running any agents")
+    parser.add_argument("--tickers-file", type=str, required=True, help="File of ticker symbols, one per line or comma-separated (# starts a comment)")
+    parser.add_argument("--end-date", type=str, default=datetime.now().strftime("%Y-%m-%d"), help="End date (YYYY-MM-DD). Defaults to today")
+    parser.add_argument("--start-date", type=str, help="Start date (YYYY-MM-DD). Defaults to 3 months before end date")
+    parser.add_argument("--analysts", type=str, help=f"Comma-separated analysts whose data to warm (default: all). Choices: {', '.join(ANALYST_CONFIG)}")
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("FINANCIAL_DATASETS_MAX_CONCURRENCY", DEFAULT_CONCURRENCY)), help="Fetches in flight at once")
+    parser.add_argument("--batch-size", type=int, default=25, help="Tickers per line item request (default: 25)")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress lines (default: 5)")
+    parser.add_argument("--show-metrics", action="store_true", help="Show cache hit rates and API latency per data fetcher")
+    args = parser.parse_args()
+
+    # Validate dates if provided
+    for date in (args.start_date, args.end_date):
+        if date:
+            try:
+                datetime.strptime(date, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"Date {date} must be in YYYY-MM-DD format")
+    start_date = args.start_date or (datetime.strptime(args.end_date, "%Y-%m-%d") - relativedelta(months=3)).strftime("%Y-%m-%d")
+
+    selected_analysts = [analyst.strip() for analyst in args.analysts.split(",")] if args.analysts else None
+    if unknown := [analyst for analyst in selected_analysts or [] if analyst not in ANALYST_CONFIG]:
+        print(f"{Fore.RED}Unknown analysts: {', '.join(unknown)}{Style.RESET_ALL}")
+        sys.exit(1)
+
+    cache = get_cache()
+    if not cache.store and not cache.archive:
+        print(f"{Fore.RED}No persistent cache configured: set FINANCIAL_DATA_CACHE_PATH (and optionally FINANCIAL_DATA_PRICE_ARCHIVE) so the warmed data outlives this process.{Style.RESET_ALL}")
+        sys.exit(1)
+
+    tickers = read_tickers(args.tickers_file)
+    if not tickers:
+        print(f"{Fore.RED}No tickers found in {args.tickers_file}{Style.RESET_ALL}")
+        sys.exit(1)
+    print(f"Warming {Fore.CYAN}{len(tickers)}{Style.RESET_ALL} tickers from {start_date} to {args.end_date} with {args.concurrency} fetches in flight\n")
+
+    progress = warm_cache(tickers, start_date, args.end_date, selected_analysts, concurrency=args.concurrency, batch_size=args.batch_size, progress_interval=args.progress_interval)
+
+    elapsed = time.monotonic() - progress.started
+    snapshot = dump_metrics()
+    upstream = sum(values["upstream_requests"] for values in snapshot["endpoints"].values())
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}WARM-UP COMPLETE:{Style.RESET_ALL} {progress.calls} calls for {len(tickers)} tickers in {elapsed:,.1f}s ({progress.calls / elapsed if elapsed else 0.0:,.1f} calls/s, {len(tickers) / elapsed if elapsed else 0.0:,.1f} tickers/s), {upstream} API requests")
+
+    if progress.failures:
+        failed_tickers = sorted({ticker for call_tickers, _, _ in progress.failures for ticker in call_tickers})
+        print(f"\n{Fore.RED}{len(progress.failures)} calls failed for {len(failed_tickers)} tickers:{Style.RESET_ALL}")
+        for call_tickers, name, error in progress.failures:
+            print(f"  {name} {','.join(call_tickers)}: {error}")
+        print(f"\nFailed tickers: {','.join(failed_tickers)}")
+
+    if args.show_metrics:
+        print_data_metrics(snapshot)
+
+    sys.exit(1 if progress.failures else 0)
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# Modules are imported the way src/main.py imports them, relative to src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data.cache import Cache  # noqa: E402
+from tools import api  # noqa: E402
+
+
+@pytest.fixture
+def cache(monkeypatch) -> Cache:
+    """A fresh in-memory cache, with no persistent store or archive, behind tools.api."""
+    cache = Cache(store=None, archive=None)
+    monkeypatch.setattr(api, "_cache", cache)
+    return cache
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+
+from data.archive import PriceArchive
+from data.cache import Cache
+from data.prices import PriceColumns
+
+
+def _columns(days: int) -> PriceColumns:
+    return PriceColumns.from_rows([{"time": f"2024-01-{day:02d}T05:00:00Z", "open": 1.0, "close": 2.0, "high": 3.0, "low": 0.5, "volume": 100} for day in range(1, days + 1)])
+
+
+def _versions(archive: PriceArchive) -> list[str]:
+    ticker_dir = archive._ticker_dir("X")
+    return sorted(entry for entry in os.listdir(ticker_dir) if os.path.isdir(os.path.join(ticker_dir, entry)))
+
+
+def test_write_replaces_only_the_previous_version(tmp_path):
+    archive = PriceArchive(str(tmp_path))
+    archive.write("X", _columns(5), [["2024-01-01", "2024-01-05"]])
+    first = _versions(archive)
+    # Another process's version, still being written, is left alone
+    os.makedirs(os.path.join(archive._ticker_dir("X"), "in-progress"))
+    archive.write("X", _columns(10), [["2024-01-01", "2024-01-10"]])
+    assert first[0] not in _versions(archive) and "in-progress" in _versions(archive)
+    columns, coverage = archive.load("X")
+    assert len(columns) == 10 and coverage == [["2024-01-01", "2024-01-10"]]
+
+
+def test_write_without_new_rows_updates_only_the_coverage(tmp_path):
+    archive = PriceArchive(str(tmp_path))
+    archive.write("X", _columns(5), [["2024-01-01", "2024-01-05"]])
+    versions = _versions(archive)
+    archive.write("X", _columns(5), [["2024-01-01", "2024-01-07"]])
+    assert _versions(archive) == versions
+    assert archive.load("X")[1] == [["2024-01-01", "2024-01-07"]]
+
+
+def test_archive_errors_do_not_fail_covering_a_window(tmp_path):
+    class FailingArchive(PriceArchive):
+        def write(self, ticker, columns, coverage):
+            raise OSError("disk full")
+
+    cache = Cache(store=None, archive=FailingArchive(str(tmp_path)))
+    cache._prices_cache["X"] = _columns(5)
+    cache._loaded.add(("prices", "X"))
+    cache.add_coverage("prices", "X", "2024-01-01", "2024-01-05")
+    assert cache.get_coverage("prices", "X").covers("2024-01-01", "2024-01-05")
+    assert cache.get_stats()["archive_errors"] == 1
+
+
+def test_price_frames_share_archived_columns_and_are_counted(tmp_path):
+    archive = PriceArchive(str(tmp_path))
+    archive.write("X", _columns(5), [["2024-01-01", "2024-01-05"]])
+    cache = Cache(store=None, archive=archive)
+    columns = cache.get_prices("X")
+    before = cache.get_stats()["memory"]["prices"]["bytes"]
+    cache.build_prices("X", columns, frame=True)
+    assert np.shares_memory(columns.frame["close"].to_numpy(), columns.close)
+    assert cache.get_stats()["memory"]["prices"]["bytes"] > before
+
+
+def test_price_frames_can_be_edited_without_touching_the_cache(tmp_path):
+    archive = PriceArchive(str(tmp_path))
+    archive.write("X", _columns(5), [["2024-01-01", "2024-01-05"]])
+    columns = Cache(store=None, archive=archive).get_prices("X")
+    frame = columns.to_frame("2024-01-02", "2024-01-04")
+    frame["close"] *= 2
+    frame.loc[frame.index[0], "volume"] = 0
+    assert list(frame["close"]) == [4.0, 4.0, 4.0]
+    assert list(columns.close) == [2.0] * 5 and list(columns.volume) == [100] * 5
+    assert list(columns.to_frame("2024-01-02", "2024-01-04")["close"]) == [2.0, 2.0, 2.0]
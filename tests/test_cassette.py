@@ -0,0 +1,82 @@
+import json
+
+import pytest
+import requests
+
+from tools import api
+from tools.cassette import Cassette, configure_cassette
+
+
+def _news(day: str, i: int) -> dict:
+    return {"ticker": "X", "title": f"{day} {i}", "author": "a", "source": "s", "date": f"{day}T{10 + i:02d}:00:00Z", "url": f"https://news/{day}/{i}", "sentiment": None}
+
+
+def _record(cassette: Cassette, path: str, params: dict | None, body: dict, json_body: dict | None = None):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    cassette.record_response({"method": "POST" if json_body else "GET", "path": path, "params": params, "json": json_body}, response)
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    yield str(tmp_path / "cassette.db")
+    configure_cassette(None)
+
+
+def test_replay_answers_smaller_limits_and_earlier_dates_from_a_recording(cache, cassette_path):
+    recording = Cassette(cassette_path, "record")
+    # Two articles a day, newest first, as a full page of a limit 40 call returns them
+    news = [_news(f"2024-02-{day:02d}", i) for day in range(29, 0, -1) for i in (1, 0)]
+    _record(recording, "/news/", {"ticker": "X", "end_date": "2024-02-29", "limit": 40}, {"news": news[:40]})
+    recording.close()
+
+    configure_cassette("replay", cassette_path)
+    assert [item.url for item in api.get_company_news("X", "2024-02-29", limit=30)] == [item["url"] for item in news[:30]]
+    assert [item.url for item in api.get_company_news("X", "2024-02-20", start_date="2024-02-12")] == [item["url"] for item in news if "2024-02-12" <= item["date"][:10] <= "2024-02-20"]
+    # The page may have stopped part way through its oldest day, so that day cannot be answered
+    with pytest.raises(Exception, match="No recorded http response"):
+        api.get_company_news("X", "2024-02-20", start_date="2024-02-10")
+
+
+def test_replay_joins_recorded_price_windows(cache, cassette_path):
+    recording = Cassette(cassette_path, "record")
+    for start, end in (("2024-01-01", "2024-01-31"), ("2024-02-01", "2024-02-29")):
+        days = [f"2024-{month:02d}-{day:02d}" for month, last in ((1, 31), (2, 29)) for day in range(1, last + 1)]
+        prices = [{"open": 1.0, "close": 2.0, "high": 3.0, "low": 0.5, "volume": 10, "time": f"{day}T05:00:00Z"} for day in days if start <= day <= end]
+        _record(recording, "/prices/", {"ticker": "X", "interval": "day", "interval_multiplier": 1, "start_date": start, "end_date": end}, {"ticker": "X", "prices": prices})
+    recording.close()
+
+    configure_cassette("replay", cassette_path)
+    prices = api.get_prices("X", "2024-01-20", "2024-02-10")
+    assert [price.time[:10] for price in prices] == [f"2024-01-{day}" for day in range(20, 32)] + [f"2024-02-{day:02d}" for day in range(1, 11)]
+
+
+def test_replay_answers_single_tickers_from_a_batch_line_item_search(cache, cassette_path):
+    recording = Cassette(cassette_path, "record")
+    rows = [{"ticker": ticker, "report_period": f"{year}-12-31", "period": "annual", "currency": "USD", "revenue": 1.0, "net_income": 2.0} for ticker in ("A", "B") for year in (2023, 2022, 2021)]
+    body = {"tickers": ["A", "B"], "line_items": ["revenue", "net_income"], "end_date": "2024-03-01", "period": "annual", "limit": 20}
+    _record(recording, "/financials/search/line-items", None, {"search_results": rows}, json_body=body)
+    recording.close()
+
+    configure_cassette("replay", cassette_path)
+    items = api.search_line_items("B", ["revenue"], "2024-03-01", period="annual", limit=2)
+    assert [(item.ticker, item.report_period, item.revenue) for item in items] == [("B", "2023-12-31", 1.0), ("B", "2022-12-31", 1.0)]
+    assert not hasattr(items[0], "net_income")
+
+
+def test_recordings_are_indexed_once_for_every_replay(cache, cassette_path, monkeypatch):
+    recording = Cassette(cassette_path, "record")
+    news = [_news(f"2024-02-{day:02d}", i) for day in range(29, 0, -1) for i in (1, 0)]
+    _record(recording, "/news/", {"ticker": "X", "end_date": "2024-02-29", "limit": 60}, {"news": news})
+    _record(recording, "/news/", {"ticker": "Y", "end_date": "2024-02-29", "limit": 60}, {"news": [dict(item, ticker="Y") for item in news]})
+    recording.close()
+    indexed = []
+    index_recording = Cassette._index_recording
+    monkeypatch.setattr(Cassette, "_index_recording", lambda self, *args: indexed.append(args[0]) or index_recording(self, *args))
+
+    configure_cassette("replay", cassette_path)
+    for end_date in ("2024-02-29", "2024-02-20", "2024-02-10"):
+        assert [item.url for item in api.get_company_news("X", end_date, limit=4)] == [item["url"] for item in news if item["date"][:10] <= end_date][:4]
+    assert [item.ticker for item in api.get_company_news("Y", "2024-02-10", limit=4)] == ["Y"] * 4
+    assert indexed == ["/news/", "/news/"]
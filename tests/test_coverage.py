@@ -0,0 +1,91 @@
+from data.coverage import HISTORY_START, DateIntervalSet, ReportPeriodSeries
+
+
+def test_add_merges_overlapping_and_adjacent_windows():
+    intervals = DateIntervalSet([["2024-01-10", "2024-01-20"], ["2024-02-01", "2024-02-10"]])
+    intervals.add("2024-01-21", "2024-01-25")
+    intervals.add("2024-02-05", "2024-02-15")
+    assert intervals.to_list() == [["2024-01-10", "2024-01-25"], ["2024-02-01", "2024-02-15"]]
+
+
+def test_gaps_returns_uncovered_sub_windows():
+    intervals = DateIntervalSet([["2024-01-10", "2024-01-20"], ["2024-02-01", "2024-02-10"]])
+    assert intervals.gaps("2024-01-01", "2024-02-20") == [("2024-01-01", "2024-01-09"), ("2024-01-21", "2024-01-31"), ("2024-02-11", "2024-02-20")]
+    assert intervals.gaps("2024-01-12", "2024-01-18") == []
+    assert intervals.covers("2024-02-01", "2024-02-10")
+
+
+def test_containing():
+    intervals = DateIntervalSet([["2024-01-10", "2024-01-20"]])
+    assert intervals.containing("2024-01-10") == ("2024-01-10", "2024-01-20")
+    assert intervals.containing("2024-01-20T16:00:00Z") == ("2024-01-10", "2024-01-20")
+    assert intervals.containing("2024-01-21") is None
+    assert intervals.containing("2024-01-09") is None
+
+
+def test_preceding():
+    intervals = DateIntervalSet([["2024-01-10", "2024-01-20"], ["2024-02-01", "2024-02-10"]])
+    assert intervals.preceding("2024-01-25") == ("2024-01-10", "2024-01-20")
+    assert intervals.preceding("2024-02-05") == ("2024-01-10", "2024-01-20")
+    assert intervals.preceding("2024-02-11") == ("2024-02-01", "2024-02-10")
+    assert intervals.preceding("2024-01-15") is None
+    assert intervals.preceding("2024-01-01") is None
+
+
+def _quarterly_series(report_periods: list[str], end_date: str, exhausted: bool = False) -> ReportPeriodSeries:
+    series = ReportPeriodSeries("quarterly")
+    series.merge_rows([{"report_period": report_period} for report_period in report_periods])
+    series.record_fetch(end_date, report_periods, exhausted)
+    return series
+
+
+def test_plan_answers_from_a_complete_window():
+    series = _quarterly_series(["2023-03-31", "2023-06-30", "2023-09-30", "2023-12-31"], "2024-01-15")
+    assert series.plan("2024-01-15", 4) is None
+    assert series.plan("2023-12-31", 3) is None
+    assert series.periods_as_of("2023-12-31", 3) == ["2023-12-31", "2023-09-30", "2023-06-30"]
+
+
+def test_plan_fetches_only_older_periods_when_the_window_is_short():
+    series = _quarterly_series(["2023-09-30", "2023-12-31"], "2024-01-15")
+    assert series.plan("2024-01-15", 4) == ("2023-09-29", 2)
+
+
+def test_plan_answers_short_windows_reaching_the_start_of_history():
+    series = _quarterly_series(["2023-09-30", "2023-12-31"], "2024-01-15", exhausted=True)
+    assert series.complete_from == HISTORY_START
+    assert series.plan("2024-01-15", 10) is None
+
+
+def test_plan_covers_end_dates_before_the_next_report_can_close():
+    series = _quarterly_series(["2023-09-30", "2023-12-31"], "2024-01-15", exhausted=True)
+    # No quarterly report can close within 84 days of the newest one
+    assert series.plan("2024-03-01", 2) is None
+
+
+def test_record_fetch_extends_a_window_it_overlaps():
+    series = _quarterly_series(["2023-03-31", "2023-06-30", "2023-09-30", "2023-12-31"], "2024-01-15")
+    series.merge_rows([{"report_period": "2023-12-31"}, {"report_period": "2024-03-31"}])
+    series.record_fetch("2024-06-30", ["2023-12-31", "2024-03-31"], exhausted=False)
+    assert (series.complete_from, series.complete_to) == ("2023-03-31", "2024-06-30")
+    assert series.plan("2024-06-30", 5) is None
+
+
+def test_plan_after_an_empty_history_asks_only_for_periods_closed_since():
+    series = ReportPeriodSeries("quarterly")
+    series.record_fetch("2024-01-15", [], exhausted=True)
+    assert series.plan("2024-01-10", 10) is None
+    assert series.plan("2024-03-01", 10) == ("2024-03-01", 1)
+
+
+def test_plan_past_the_window_asks_only_for_periods_that_can_have_closed():
+    series = _quarterly_series(["2023-03-31", "2023-06-30", "2023-09-30", "2023-12-31"], "2024-01-15")
+    # 182 days after the newest period, at most two more quarters can have closed, plus one to overlap it
+    assert series.plan("2024-06-30", 10) == ("2024-06-30", 3)
+    assert series.plan("2024-06-30", 2) == ("2024-06-30", 2)
+
+
+def test_plan_past_a_window_without_cached_periods_asks_for_the_full_limit():
+    series = ReportPeriodSeries("quarterly")
+    series.record_fetch("2024-01-15", ["2023-12-31"], exhausted=False)
+    assert series.plan("2024-06-30", 10) == ("2024-06-30", 10)
@@ -0,0 +1,182 @@
+import datetime
+
+import pytest
+
+from data.cache import Cache
+from data.memory import estimate_size
+from data.models import CompanyNews, InsiderTrade
+from data.store import SQLiteStore
+from tools import api
+
+
+class FakeNews:
+    """An upstream news endpoint with `per_day` articles a day, counting the requests made to it."""
+
+    def __init__(self, start: str, end: str, per_day: int = 3):
+        self.rows = []
+        day = datetime.date.fromisoformat(start)
+        while day <= datetime.date.fromisoformat(end):
+            for i in range(per_day):
+                self.rows.append(CompanyNews(ticker="X", title=f"{day} {i}", author="a", source="s", date=f"{day}T{10 + i:02d}:00:00Z", url=f"https://news/{day}/{i}"))
+            day += datetime.timedelta(days=1)
+        self.requests = []
+
+    def newest(self, start_date: str | None, end_date: str, limit: int) -> list[CompanyNews]:
+        rows = [row for row in self.rows if (not start_date or row.date[:10] >= start_date) and row.date[:10] <= end_date]
+        return sorted(rows, key=lambda row: row.date, reverse=True)[:limit]
+
+    def fetch_page(self, ticker: str, start_date: str | None, end_date: str, limit: int) -> list[CompanyNews]:
+        self.requests.append((start_date, end_date, limit))
+        return self.newest(start_date, end_date, limit)
+
+    def fetch(self, ticker: str, start_date: str | None, end_date: str, limit: int) -> list[CompanyNews]:
+        # Like the real fetchers, pages backwards only when a start_date is given
+        rows = self.fetch_page(ticker, start_date, end_date, limit)
+        while start_date and len(rows) % limit == 0 and rows:
+            if not (page := self.fetch_page(ticker, start_date, min(row.date for row in rows)[:10], limit)) or set(page) <= set(rows):
+                break
+            rows += [row for row in page if row not in rows]
+        return rows
+
+    def expected(self, end_date: str, limit: int) -> list[str]:
+        return [row.url for row in self.newest(None, end_date, limit)]
+
+
+def _get(upstream: FakeNews, end_date: str, start_date: str | None = None, limit: int = 50) -> list[CompanyNews]:
+    rows = api._get_dated_rows("company_news", "X", "date", end_date, start_date, limit, upstream.fetch, upstream.fetch_page)
+    return sorted(rows, key=lambda row: row.date, reverse=True)
+
+
+@pytest.mark.parametrize("per_day", [1, 3, 7])
+def test_repeat_limit_calls_are_cache_hits(cache, per_day):
+    upstream = FakeNews("2023-01-01", "2024-03-01", per_day=per_day)
+    for _ in range(3):
+        assert [row.url for row in _get(upstream, "2024-03-01")] == upstream.expected("2024-03-01", 50)
+    assert len(upstream.requests) == 1
+
+
+def test_limit_calls_for_earlier_end_dates_reuse_the_window(cache):
+    upstream = FakeNews("2023-01-01", "2024-03-01")
+    _get(upstream, "2024-03-01", limit=60)
+    assert [row.url for row in _get(upstream, "2024-02-25", limit=40)] == upstream.expected("2024-02-25", 40)
+    assert len(upstream.requests) == 1
+    # Reaching past the cached window refetches
+    assert [row.url for row in _get(upstream, "2024-02-25", limit=50)] == upstream.expected("2024-02-25", 50)
+    assert len(upstream.requests) == 2
+
+
+def test_short_history_is_covered_back_to_the_start(cache):
+    upstream = FakeNews("2024-02-20", "2024-03-01")
+    assert len(_get(upstream, "2024-03-01", limit=100)) == 33
+    assert len(_get(upstream, "2024-02-25", limit=100)) == 18
+    assert len(upstream.requests) == 1
+
+
+def test_date_range_calls_fetch_only_uncovered_gaps(cache):
+    upstream = FakeNews("2023-01-01", "2024-03-01")
+    assert len(_get(upstream, "2024-01-31", start_date="2024-01-01")) == 93
+    upstream.requests.clear()
+    assert len(_get(upstream, "2024-02-10", start_date="2024-01-15")) == 81
+    assert [(start, end) for start, end, _ in upstream.requests] == [("2024-02-01", "2024-02-10")]
+
+
+def test_empty_windows_are_covered_and_only_newer_days_fetched(cache):
+    upstream = FakeNews("2024-01-01", "2024-02-04", per_day=0)
+    for day in ("2024-02-01", "2024-02-02", "2024-02-03", "2024-02-04"):
+        assert _get(upstream, day) == []
+    assert [start for start, _, _ in upstream.requests] == [None, "2024-02-02", "2024-02-03", "2024-02-04"]
+    assert cache.get_coverage("company_news", "X").to_list() == [["1900-01-01", "2024-02-04"]]
+    upstream.requests.clear()
+    assert _get(upstream, "2024-01-15", start_date="2024-01-01") == []
+    assert _get(upstream, "2024-02-03") == []
+    assert upstream.requests == []
+
+
+def test_the_current_day_is_covered_until_it_expires(cache, monkeypatch):
+    today = datetime.date.today()
+    start, yesterday = (today - datetime.timedelta(days=10)).isoformat(), (today - datetime.timedelta(days=1)).isoformat()
+    upstream = FakeNews(start, today.isoformat())
+    for _ in range(3):
+        assert [row.url for row in _get(upstream, today.isoformat(), limit=5)] == upstream.expected(today.isoformat(), 5)
+        assert len(_get(upstream, today.isoformat(), start_date=start)) == 33
+    assert len(upstream.requests) == 2
+    # Only yesterday and earlier are covered for good
+    assert cache._stored_coverage("company_news", "X").containing(yesterday) is not None
+    assert cache._stored_coverage("company_news", "X").containing(today.isoformat()) is None
+
+    monkeypatch.setenv("FINANCIAL_DATA_CURRENT_DAY_TTL", "0")
+    cache._current_day.clear()
+    _get(upstream, today.isoformat(), start_date=start)
+    _get(upstream, today.isoformat(), start_date=start)
+    assert upstream.requests[2:] == [(today.isoformat(), today.isoformat(), 50), (today.isoformat(), today.isoformat(), 50)]
+
+
+def test_a_full_page_of_newer_rows_is_served_apart_from_the_older_window(cache):
+    upstream = FakeNews("2024-01-01", "2024-02-29")
+    _get(upstream, "2024-01-31", limit=5)
+    # Forty days of newer articles do not fit in one page, so the window does not join the older one
+    assert [row.url for row in _get(upstream, "2024-02-29", limit=5)] == upstream.expected("2024-02-29", 5)
+    assert [row.url for row in _get(upstream, "2024-02-29", limit=5)] == upstream.expected("2024-02-29", 5)
+    assert len(upstream.requests) == 2
+    assert cache.get_coverage("company_news", "X").containing("2024-02-29") == ("2024-02-29", "2024-02-29")
+
+
+def test_evicting_a_ticker_drops_its_coverage_so_it_is_refetched(cache, monkeypatch):
+    monkeypatch.setenv("FINANCIAL_DATA_MEMORY_ROWS_COMPANY_NEWS", "40")
+    upstream = FakeNews("2024-01-01", "2024-03-01")
+
+    def get(ticker: str) -> list[CompanyNews]:
+        return api._get_dated_rows("company_news", ticker, "date", "2024-03-01", None, 30, upstream.fetch, upstream.fetch_page)
+
+    assert len(get("A")) == 30
+    assert len(get("A")) == 30
+    assert len(upstream.requests) == 1
+    # A second ticker takes the namespace over its budget, so the least recently used one goes, coverage and all
+    assert len(get("B")) == 30
+    assert cache.get_stats()["memory"]["company_news"]["evictions"] == 1
+    assert "A" not in cache._company_news_cache
+    assert cache.get_coverage("company_news", "A").to_list() == []
+    assert len(get("A")) == 30
+    assert len(upstream.requests) == 3
+
+
+def test_negative_entries_are_bounded_and_counted(cache):
+    for day in range(1, 29):
+        cache.set_negative("company_news", "X", f"2024-02-{day:02d}", f"2024-02-{day:02d}", error="boom")
+    cache.set_negative("company_news", "X", "2024-02-01", "2024-02-28", error="boom")
+    assert cache.get_stats()["negative_entries"] == 1
+    assert cache.get_stats()["memory"]["company_news"]["bytes"] > 0
+    for day in range(1, 29):
+        for month in range(1, 3):
+            cache.set_negative("company_news", "X", f"2023-{month:02d}-{day:02d}", f"2023-{month:02d}-{day:02d}", error="boom")
+    assert cache.get_stats()["negative_entries"] <= 32
+
+
+def test_empty_windows_are_persisted(monkeypatch, tmp_path):
+    upstream = FakeNews("2024-01-01", "2024-02-04", per_day=0)
+    monkeypatch.setattr(api, "_cache", Cache(store=SQLiteStore(str(tmp_path / "data.db")), archive=None))
+    assert _get(upstream, "2024-02-01", start_date="2024-01-01") == []
+    # A new process reads the empty window back from the store instead of asking again
+    monkeypatch.setattr(api, "_cache", Cache(store=SQLiteStore(str(tmp_path / "data.db")), archive=None))
+    assert _get(upstream, "2024-01-31", start_date="2024-01-10") == []
+    assert len(upstream.requests) == 1
+
+
+def test_insider_activity_up_to_today_is_answered_from_the_rollup(cache, monkeypatch):
+    today = datetime.date.today()
+    start = (today - datetime.timedelta(days=10)).isoformat()
+    fields = dict(issuer=None, name="n", title=None, is_board_director=None, transaction_date=None, transaction_price_per_share=None, shares_owned_before_transaction=None, shares_owned_after_transaction=None, security_title=None)
+    trades = [InsiderTrade(ticker="X", filing_date=(today - datetime.timedelta(days=i)).isoformat(), transaction_shares=10.0 if i % 2 else -5.0, transaction_value=100.0, **fields) for i in range(10)]
+    requests = []
+
+    def fetch(ticker, start_date, end_date, limit):
+        requests.append((start_date, end_date))
+        return [trade for trade in trades if start_date <= trade.filing_date <= end_date]
+
+    monkeypatch.setattr(api, "_fetch_insider_trades", fetch)
+    for _ in range(3):
+        activity = api.get_insider_activity("X", start, today.isoformat())
+        assert (activity.trades, activity.buys, activity.sells) == (10, 5, 5)
+    assert len(requests) == 1
+    # The rollup is counted with the trades it was built from
+    assert cache.get_stats()["memory"]["insider_trades"]["bytes"] == estimate_size(cache.get_insider_trades("X"))[0] + cache.get_insider_rollup("X").nbytes
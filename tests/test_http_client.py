@@ -0,0 +1,81 @@
+import pytest
+import requests
+
+from tools import http_client
+from tools.http_client import FinancialDatasetsClient
+
+
+def _response(status_code: int, headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Delays the client sleeps for, without sleeping."""
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    # Full jitter always picks the largest delay, so backoff is deterministic
+    monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+    return sleeps
+
+
+def _client(responses: list) -> tuple[FinancialDatasetsClient, list[str]]:
+    client = FinancialDatasetsClient(base_url="http://upstream", max_retries=3, backoff_base=0.5, backoff_max=30.0)
+    urls = []
+
+    def request(method, url, **kwargs):
+        urls.append(url)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client.session.request = request
+    return client, urls
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
+def test_retryable_statuses_are_retried(sleeps, status_code):
+    client, urls = _client([_response(status_code), _response(200)])
+    assert client.get("/prices/").status_code == 200
+    assert len(urls) == 2 and sleeps == [0.5]
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 404])
+def test_client_errors_are_not_retried(sleeps, status_code):
+    client, urls = _client([_response(status_code)])
+    assert client.get("/prices/").status_code == status_code
+    assert len(urls) == 1 and sleeps == []
+
+
+def test_retry_after_in_seconds_replaces_the_backoff(sleeps):
+    client, _ = _client([_response(503, {"Retry-After": "7"}), _response(503, {"Retry-After": "120"}), _response(200)])
+    assert client.get("/prices/").status_code == 200
+    # Capped at backoff_max
+    assert sleeps == [7.0, 30.0]
+
+
+def test_retry_after_as_an_http_date(sleeps, monkeypatch):
+    monkeypatch.setattr(http_client.time, "time", lambda: 1_700_000_000.0)
+    client, _ = _client([_response(503, {"Retry-After": "Tue, 14 Nov 2023 22:13:25 GMT"}), _response(200)])
+    assert client.get("/prices/").status_code == 200
+    assert sleeps == [5.0]
+
+
+def test_gives_up_after_the_maximum_attempts(sleeps):
+    client, urls = _client([_response(503) for _ in range(4)])
+    assert client.get("/prices/").status_code == 503
+    assert len(urls) == 4
+    assert sleeps == [0.5, 1.0, 2.0]
+
+
+def test_connection_errors_are_retried_then_raised(sleeps):
+    client, urls = _client([requests.ConnectionError("reset"), _response(200)])
+    assert client.get("/prices/").status_code == 200
+    client, urls = _client([requests.Timeout("slow") for _ in range(4)])
+    with pytest.raises(requests.Timeout):
+        client.get("/prices/")
+    assert len(urls) == 4
@@ -0,0 +1,62 @@
+import pytest
+
+from data.models import LineItem
+from tools import api
+
+REPORT_PERIODS = ["2023-12-31", "2022-12-31", "2021-12-31"]
+
+
+class FakeLineItems:
+    """An upstream line item search that fails for some tickers, counting the requests made to it."""
+
+    def __init__(self, failing: set[str]):
+        self.failing = failing
+        self.requests = []
+
+    def fetch(self, tickers: list[str], line_items: list[str], end_date: str, period: str, limit: int) -> list[LineItem]:
+        self.requests.append((tuple(tickers), tuple(line_items)))
+        if self.failing & set(tickers):
+            raise Exception(f"Error fetching data: {', '.join(tickers)} - 500 - boom")
+        return [
+            LineItem(ticker=ticker, report_period=report_period, period=period, currency="USD", **{field: 1.0 for field in line_items})
+            for ticker in tickers
+            for report_period in REPORT_PERIODS
+            if report_period <= end_date
+        ][:limit]
+
+
+@pytest.fixture
+def upstream(cache, monkeypatch) -> FakeLineItems:
+    upstream = FakeLineItems(failing={"B"})
+    monkeypatch.setattr(api, "_fetch_line_items", upstream.fetch)
+    return upstream
+
+
+def test_a_failed_batch_does_not_stop_the_remaining_batches(upstream):
+    with pytest.raises(Exception, match="boom"):
+        api.search_line_items_batch(["A", "B", "C"], ["revenue"], "2024-03-01", period="annual", limit=3, batch_size=1)
+    assert upstream.requests == [(("A",), ("revenue",)), (("B",), ("revenue",)), (("C",), ("revenue",))]
+    # The tickers that were fetched are answered from the cache, and the failure is remembered for its ticker only
+    upstream.requests.clear()
+    assert len(api.search_line_items("C", ["revenue"], "2024-03-01", period="annual", limit=3)) == 3
+    with pytest.raises(Exception, match="boom"):
+        api.search_line_items("B", ["revenue"], "2024-03-01", period="annual", limit=3)
+    assert upstream.requests == []
+
+
+def test_a_remembered_failure_leaves_the_ticker_out_of_the_batch(upstream):
+    with pytest.raises(Exception, match="boom"):
+        api.search_line_items("B", ["revenue"], "2024-03-01", period="annual", limit=3)
+    upstream.requests.clear()
+    with pytest.raises(Exception, match="boom"):
+        api.search_line_items_batch(["A", "B", "C"], ["revenue"], "2024-03-01", period="annual", limit=3)
+    assert upstream.requests == [(("A", "C"), ("revenue",))]
+
+
+def test_a_failed_fill_of_missing_fields_is_remembered(upstream):
+    assert len(api.search_line_items("A", ["revenue"], "2024-03-01", period="annual", limit=3)) == 3
+    upstream.failing.add("A")
+    for _ in range(3):
+        with pytest.raises(Exception, match="boom"):
+            api.search_line_items("A", ["revenue", "net_income"], "2024-03-01", period="annual", limit=3)
+    assert upstream.requests == [(("A",), ("revenue",)), (("A",), ("net_income",))]
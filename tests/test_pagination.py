@@ -0,0 +1,55 @@
+import datetime
+
+from data.cache import COMPANY_NEWS_KEY
+from data.models import CompanyNews
+from tools.pagination import fetch_windows, split_windows
+
+
+class PagedNews:
+    """An upstream news endpoint returning one page, newest first, per window, with counts[i] articles on day i."""
+
+    def __init__(self, start: str, counts: list[int]):
+        self.rows = []
+        for offset, count in enumerate(counts):
+            day = datetime.date.fromisoformat(start) + datetime.timedelta(days=offset)
+            for i in range(count):
+                self.rows.append(CompanyNews(ticker="X", title=f"{day} {i}", author="a", source="s", date=f"{day}T{10 + i:02d}:00:00Z", url=f"https://news/{day}/{i}"))
+        self.requests = []
+
+    def fetch_page(self, start_date: str, end_date: str, limit: int) -> list[CompanyNews]:
+        self.requests.append((start_date, end_date))
+        rows = [row for row in self.rows if start_date <= row.date[:10] <= end_date]
+        return sorted(rows, key=lambda row: row.date, reverse=True)[:limit]
+
+    def between(self, start_date: str, end_date: str) -> list[str]:
+        return sorted(row.url for row in self.rows if start_date <= row.date[:10] <= end_date)
+
+
+def _fetch(upstream: PagedNews, start_date: str, end_date: str, limit: int, window_days: int) -> list[str]:
+    rows = fetch_windows(lambda window_start, window_end: upstream.fetch_page(window_start, window_end, limit), "date", COMPANY_NEWS_KEY, start_date, end_date, limit, window_days, concurrency=2)
+    return sorted(row.url for row in rows)
+
+
+def test_split_windows_covers_the_range_newest_first():
+    assert split_windows("2024-01-01", "2024-01-10", 4) == [("2024-01-07", "2024-01-10"), ("2024-01-03", "2024-01-06"), ("2024-01-01", "2024-01-02")]
+
+
+def test_a_full_page_splits_the_rest_of_its_window_in_half():
+    # Ten quiet days, then ten with 2 articles a day, so the newest window's page stops at its sixth day
+    upstream = PagedNews("2024-01-01", [1] * 10 + [2] * 10)
+    assert _fetch(upstream, "2024-01-01", "2024-01-20", limit=12, window_days=10) == upstream.between("2024-01-01", "2024-01-20")
+    # The unread part of the newest window, up to and including the oldest day on its page, is fetched in halves
+    assert sorted(upstream.requests) == [("2024-01-01", "2024-01-10"), ("2024-01-11", "2024-01-12"), ("2024-01-11", "2024-01-20"), ("2024-01-13", "2024-01-15")]
+
+
+def test_rows_on_window_boundaries_are_neither_dropped_nor_duplicated():
+    # Full pages stop part way through a day, and the busy days straddle the initial window edges.
+    # No day holds more than a page, which no window can narrow down.
+    counts = [3, 1, 5, 4, 0, 2, 6, 1, 3, 5, 2, 4]
+    upstream = PagedNews("2024-01-01", counts)
+    for limit in (6, 7, 9, 13):
+        for window_days in (1, 2, 3, 5):
+            upstream.requests.clear()
+            urls = _fetch(upstream, "2024-01-02", "2024-01-11", limit, window_days)
+            assert urls == upstream.between("2024-01-02", "2024-01-11"), (limit, window_days)
+            assert all("2024-01-02" <= start <= end <= "2024-01-11" for start, end in upstream.requests)
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from tools import http_client, metrics, rate_limiter
+from tools.rate_limiter import TokenBucketRateLimiter, priority_for
+
+
+class FakeClock:
+    """
+    A monotonic clock that only moves when told to.
+
+    With auto set, a timed wait on the limiter's condition moves the clock forward by its timeout instead of
+    sleeping, so a single caller runs through refills and pauses instantly. Otherwise waits poll in real time
+    while the test moves the clock with advance().
+    """
+
+    def __init__(self, auto: bool):
+        self.now = 1000.0
+        self.auto = auto
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(request, monkeypatch) -> FakeClock:
+    clock = FakeClock(auto=getattr(request, "param", True))
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def _limiter(clock: FakeClock, rate: float, burst: int) -> TokenBucketRateLimiter:
+    limiter = TokenBucketRateLimiter(rate=rate, burst=burst)
+
+    class FakeCondition(threading.Condition):
+        def wait(self, timeout=None):
+            if timeout is not None and clock.auto:
+                clock.advance(timeout)
+                return False
+            return super().wait(0.005)
+
+    limiter._cond = FakeCondition()
+    return limiter
+
+
+def test_tokens_refill_at_the_rate_up_to_the_burst(clock):
+    limiter = _limiter(clock, rate=2, burst=3)
+    assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # The bucket is empty, so the next caller waits for one token at 2 per second
+    assert limiter.acquire() == pytest.approx(0.5)
+    # Idle time refills no more than the burst
+    clock.advance(60)
+    assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire() == pytest.approx(0.5)
+
+
+def test_pause_after_a_429_holds_back_every_request(clock):
+    limiter = _limiter(clock, rate=10, burst=5)
+    limiter.acquire()
+    limiter.pause(4.0)
+    # The bucket is drained as well, so the first request after the pause still waits for a token
+    assert limiter.acquire() == pytest.approx(4.1)
+    # A shorter pause does not cut an existing one short
+    limiter.pause(10.0)
+    limiter.pause(1.0)
+    assert limiter.acquire() == pytest.approx(10.1)
+    stats = limiter.stats()
+    assert stats["throttled"] == 3 and stats["acquired"] == 3
+    assert stats["max_wait_seconds"] == pytest.approx(10.1)
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.parametrize("clock", [False], indirect=True)
+def test_queued_requests_are_served_by_priority_then_arrival(clock):
+    limiter = _limiter(clock, rate=1, burst=1)
+    limiter.acquire()
+    served = []
+    paths = ["/news/", "/insider-trades/", "/prices/", "/financial-metrics/", "/news/", "/prices/"]
+
+    def request(i: int, path: str):
+        limiter.acquire(priority_for(path))
+        served.append(i)
+
+    threads = []
+    for i, path in enumerate(paths):
+        threads.append(threading.Thread(target=request, args=(i, path)))
+        threads[-1].start()
+        # Queue them in a known arrival order
+        while limiter.stats()["queue_depth"] < i + 1:
+            threading.Event().wait(0.001)
+    assert limiter.stats()["max_queue_depth"] == len(paths)
+
+    # Release one token at a time
+    for released in range(1, len(paths) + 1):
+        clock.advance(1)
+        while len(served) < released:
+            threading.Event().wait(0.001)
+    for thread in threads:
+        thread.join(5)
+    assert served == [2, 5, 3, 1, 0, 4]
+
+
+def test_rate_limit_stats_are_in_the_metrics_snapshot(clock, monkeypatch):
+    client = http_client.FinancialDatasetsClient(rate_limiter=_limiter(clock, rate=1, burst=1))
+    monkeypatch.setattr(http_client, "_client", client)
+    client.rate_limiter.acquire()
+    client.rate_limiter.acquire()
+    snapshot = metrics.get_metrics_snapshot()
+    assert snapshot["rate_limiter"]["acquired"] == 2
+    assert "financial_data_rate_limit_wait_seconds_total 1.0" in metrics.to_prometheus(snapshot)
@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.single_flight import single_flight
+
+CALLERS = 8
+
+
+def _fetcher(outcomes: list):
+    """A fetcher that blocks until released, so every caller arrives while the first call is in flight."""
+    release = threading.Event()
+    calls = []
+
+    @single_flight
+    def fetch(ticker: str, limit: int = 10) -> list[str]:
+        calls.append((ticker, limit))
+        release.wait(5)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return fetch, release, calls
+
+
+def _run_concurrently(fetch, release, *args, **kwargs) -> list:
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        futures = [pool.submit(fetch, *args, **kwargs) for _ in range(CALLERS)]
+        # Wait until every caller is either the leader or waiting on it
+        while fetch.flight.coalesced < CALLERS - 1:
+            threading.Event().wait(0.001)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_callers_share_one_call():
+    fetch, release, calls = _fetcher([["a", "b"]])
+    results = _run_concurrently(fetch, release, "X", limit=10)
+    assert calls == [("X", 10)]
+    assert all(result == ["a", "b"] for result in results)
+    # Each caller gets its own list
+    assert len({id(result) for result in results}) == CALLERS
+
+
+def test_the_leaders_error_reaches_every_waiter_and_the_key_is_released():
+    fetch, release, calls = _fetcher([Exception("boom"), ["a"]])
+    results = _run_concurrently(fetch, release, "X")
+    assert len(calls) == 1
+    assert all(isinstance(result, Exception) and str(result) == "boom" for result in results)
+    # A retry after the failure starts a fresh call
+    assert fetch("X") == ["a"]
+    assert len(calls) == 2
+
+
+def test_different_arguments_are_not_coalesced():
+    fetch, release, calls = _fetcher([["a"], ["b"]])
+    release.set()
+    assert fetch("X") == ["a"]
+    assert fetch("X", 5) == ["b"]
+    assert calls == [("X", 10), ("X", 5)]